@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos codecs do atas.json (json, orjson, msgspec).
+
+Grava e lê arquivos de 10k e 100k atas com cada codec instalado e confere
+que todos produzem as mesmas atas.
+
+Uso:
+    python benchmarks/bench_codecs.py [--tamanhos 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_load import gerar_dados, medir
+from models.ata import Ata
+from utils.json_codec import CODECS
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos codecs do atas.json")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"Codecs instalados: {', '.join(CODECS)}\n")
+    print(f"{'atas':>8}  {'codec':<9}{'gravar (s)':>12}{'ler (s)':>10}{'arquivo (MB)':>14}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tamanho in args.tamanhos:
+            atas = [Ata.from_dict(d, validar=False) for d in gerar_dados(tamanho)]
+            caminho = os.path.join(diretorio, "atas.json")
+            for nome, classe in CODECS.items():
+                codec = classe()
+
+                def gravar():
+                    with open(caminho, "wb") as f:
+                        f.write(codec.codificar(atas))
+
+                def ler():
+                    with open(caminho, "rb") as f:
+                        return codec.decodificar(f.read())
+
+                tempo_gravar = medir(gravar)
+                tempo_ler = medir(ler)
+                assert ler() == atas, f"{nome}: leitura difere do original"
+                megabytes = os.path.getsize(caminho) / 1e6
+                print(f"{tamanho:>8}  {nome:<9}{tempo_gravar:>12.3f}{tempo_ler:>10.3f}{megabytes:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark de digitação no formulário de atas (modo web).
+
+Digita número da ata, documento SEI e telefone tecla a tecla no ``AtaForm``
+aberto sobre a lista de atas, numa página Flet real sem cliente
+(``utils/ui_probe.py``), e compara a máscara aplicada no servidor a cada
+tecla (comportamento anterior) com a máscara local do ``MaskedInput``.
+
+A latência estimada soma, por campo, uma ida e volta ao servidor por evento
+(``--rtt``) ao tempo de processamento medido no servidor.
+
+Uso:
+    python benchmarks/bench_form_typing.py [--rtt 80] [--atas 300]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from forms.ata_form import AtaForm
+from services.sqlite_ata_service import SQLiteAtaService
+from ui.main_view import build_grouped_data_tables
+from utils.ui_probe import SondaPagina
+from utils.validators import MaskUtils
+
+DIGITACAO = {
+    "numero_ata": ("numero_ata_field", "00012024", MaskUtils.aplicar_mascara_numero_ata),
+    "sei": ("documento_sei_field", "12345123456202412", MaskUtils.aplicar_mascara_sei),
+    "telefone": (None, "61999998888", MaskUtils.aplicar_mascara_telefone),
+}
+
+def abrir_formulario(quantidade_atas: int):
+    """Página com a lista de atas ao fundo e o formulário aberto"""
+    sonda = SondaPagina()
+    servico = SQLiteAtaService(":memory:")
+    base = servico.listar_todas()
+    atas = [base[i % len(base)] for i in range(quantidade_atas)]
+    nada = lambda *_: None
+    sonda.page.add(build_grouped_data_tables(atas, nada, nada, nada))
+    form = AtaForm(sonda.page, on_save=nada, on_cancel=nada)
+    servico.close()
+    return sonda, form
+
+def mascara_no_servidor(sonda, formatar):
+    """Handler equivalente ao anterior: formata e atualiza a página inteira"""
+    def on_change(e):
+        e.control.value = formatar(e.control.value)
+        sonda.page.update()
+    return on_change
+
+def medir_modo(modo: str, quantidade_atas: int, rtt_ms: float):
+    sonda, form = abrir_formulario(quantidade_atas)
+    linhas = []
+    for nome, (atributo, texto, formatar) in DIGITACAO.items():
+        field = getattr(form, atributo) if atributo else form.telefones[0][0]
+        field.value = ""
+        if modo == "servidor":
+            field.on_change = mascara_no_servidor(sonda, formatar)
+            field.on_blur = None
+        eventos = [0]
+
+        def digitar():
+            eventos[0] = sonda.digitar(field, texto)
+            if field.on_blur:
+                eventos[0] += 1
+                sonda.disparar(field, "blur")
+
+        custo = sonda.medir(nome, digitar)
+        latencia = eventos[0] * rtt_ms + custo.duracao_ms
+        linhas.append((nome, eventos[0], custo.controles_diff, custo.comandos,
+                       custo.duracao_ms, latencia, field.value))
+    return linhas
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de digitação no formulário de atas")
+    parser.add_argument("--rtt", type=float, default=80.0, help="Ida e volta cliente-servidor (ms)")
+    parser.add_argument("--atas", type=int, default=300, help="Atas na lista atrás do formulário")
+    args = parser.parse_args()
+
+    print(f"{'modo':<10}{'campo':<12}{'eventos':>8}{'diff':>8}{'cmds':>6}"
+          f"{'servidor (ms)':>15}{'latência (ms)':>15}  valor")
+    for modo in ("servidor", "local"):
+        for nome, eventos, diff, comandos, duracao, latencia, valor in medir_modo(modo, args.atas, args.rtt):
+            print(f"{modo:<10}{nome:<12}{eventos:>8}{diff:>8}{comandos:>6}"
+                  f"{duracao:>15.1f}{latencia:>15.1f}  {valor}")
+
+if __name__ == "__main__":
+    main()
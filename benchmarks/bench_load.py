@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carregamento de atas (hidratação a partir do armazenamento).
+
+Grava uma carteira sintética num SQLite e num atas.json temporários e mede
+o carregamento completo com e sem revalidação: ``Ata.from_trusted`` (caminho
+usado pelos serviços) contra o construtor validado.
+
+Uso:
+    python benchmarks/bench_load.py [--atas 100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import models.ata as modelo
+from models.ata import Ata
+from services.ata_service import AtaService
+from services.sqlite_ata_service import SQLiteAtaService
+
+def gerar_dados(quantidade: int):
+    hoje = date.today()
+    return [
+        {
+            "numero_ata": f"{i % 10000:04d}/{2000 + i // 10000:04d}",
+            "documento_sei": f"{i % 100000:05d}.{i % 1000000:06d}/2024-{i % 100:02d}",
+            "data_vigencia": (hoje + timedelta(days=i % 1500 - 365)).isoformat(),
+            "objeto": f"Objeto {i}",
+            "itens": [
+                {"descricao": f"Item {j}", "quantidade": j + 1, "valor": 10.0 * (j + 1)}
+                for j in range(3)
+            ],
+            "fornecedor": f"Fornecedor {i % 500}",
+            "telefones_fornecedor": ["(61) 99999-0000"],
+            "emails_fornecedor": [f"contato{i % 500}@fornecedor.com.br"],
+        }
+        for i in range(quantidade)
+    ]
+
+def medir(funcao, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+class Validando:
+    """Troca temporariamente ``from_trusted`` pelo construtor validado (comparação)"""
+
+    def __enter__(self):
+        self.ata, self.item = modelo.Ata.from_trusted, modelo.Item.from_trusted
+        modelo.Ata.from_trusted = classmethod(lambda cls, *a: cls(*a))
+        modelo.Item.from_trusted = classmethod(lambda cls, *a: cls(*a))
+
+    def __exit__(self, *exc):
+        modelo.Ata.from_trusted, modelo.Item.from_trusted = self.ata, self.item
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carregamento de atas")
+    parser.add_argument("--atas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    dados = gerar_dados(args.atas)
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = os.path.join(diretorio, "atas.db")
+        sqlite = SQLiteAtaService(banco)
+        sqlite.importar_atas(dados, substituir=True)
+        arquivo = os.path.join(diretorio, "atas.json")
+        with open(arquivo, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        json_service = AtaService(arquivo)
+
+        casos = {
+            "sqlite listar_todas": sqlite.listar_todas,
+            "json load_data": json_service.load_data,
+            "from_dict": lambda: [Ata.from_dict(d, validar=False) for d in dados],
+        }
+        print(f"{args.atas} atas\n")
+        print(f"{'caso':<22}{'validando (s)':>15}{'confiável (s)':>15}{'speed-up':>10}")
+        for nome, funcao in casos.items():
+            if nome == "from_dict":
+                validando = medir(lambda: [Ata.from_dict(d) for d in dados])
+            else:
+                with Validando():
+                    validando = medir(funcao)
+            confiavel = medir(funcao)
+            print(f"{nome:<22}{validando:>15.3f}{confiavel:>15.3f}{validando / confiavel:>10.2f}")
+        sqlite.close()
+
+if __name__ == "__main__":
+    main()
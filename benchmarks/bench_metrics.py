@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo da instrumentação (utils/metrics.py).
+
+Mede, por chamada, uma função vazia e ``SQLiteAtaService.buscar_por_numero``
+sem decorador, com as métricas desligadas e com as métricas ligadas.
+
+Uso:
+    python benchmarks/bench_metrics.py [--chamadas 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.sqlite_ata_service import SQLiteAtaService
+from utils.metrics import Metricas
+
+def por_chamada(funcao, chamadas: int) -> float:
+    """Melhor de 5 execuções, em nanossegundos por chamada"""
+    return min(timeit.repeat(funcao, number=chamadas, repeat=5)) / chamadas * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do custo da instrumentação")
+    parser.add_argument("--chamadas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    desligadas, ligadas = Metricas(), Metricas("1")
+    vazia = lambda: None
+    servico = SQLiteAtaService(":memory:")
+    numero = servico.listar_resumos()[0].numero_ata
+    # O método da classe já é instrumentado; __wrapped__ é a versão original
+    original = SQLiteAtaService.buscar_por_numero.__wrapped__
+
+    casos = {
+        "função vazia": vazia,
+        "buscar_por_numero": lambda: original(servico, numero),
+    }
+    print(f"{'operação':<22}{'sem decorador':>15}{'desligadas':>13}{'ligadas':>10}   (ns/chamada)")
+    for nome, funcao in casos.items():
+        base = por_chamada(funcao, args.chamadas)
+        desligada = por_chamada(desligadas.instrumentado(nome)(funcao), args.chamadas)
+        ligada = por_chamada(ligadas.instrumentado(nome)(funcao), args.chamadas)
+        print(f"{nome:<22}{base:>15.0f}{desligada:>13.0f}{ligada:>10.0f}")
+    servico.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark do processamento paralelo (relatório + criticidade).
+
+Uso:
+    python benchmarks/bench_parallel.py [--atas 200000] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.alert_rules import MotorRegras
+from services.parallel import AtaCompacta, ProcessadorParalelo, _acumular_lote, _avaliar_lote
+
+def gerar_atas(quantidade: int, hoje: date, semente: int = 42):
+    """Carteira sintética com vencimentos entre -1 e +3 anos"""
+    rnd = random.Random(semente)
+    fornecedores = [f"Fornecedor {i:04d} Ltda" for i in range(500)]
+    return [
+        AtaCompacta(
+            f"{i % 10000:04d}/{2020 + i // 10000}",
+            hoje + timedelta(days=rnd.randint(-365, 3 * 365)),
+            rnd.choice(fornecedores),
+            f"Objeto {i}",
+            round(rnd.uniform(1_000, 2_000_000), 2),
+        )
+        for i in range(quantidade)
+    ]
+
+def medir(funcao, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--atas", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--lote", type=int, default=5000)
+    args = parser.parse_args()
+
+    hoje = date.today()
+    motor = MotorRegras()
+    atas = gerar_atas(args.atas, hoje)
+    print(f"{args.atas} atas, {os.cpu_count()} CPUs\n")
+
+    def serial():
+        _acumular_lote(atas, hoje).contexto()
+        _avaliar_lote(atas, motor, hoje, 0, ("ALTA", "CRÍTICA"))
+
+    base = medir(serial)
+    print(f"{'modo':<14}{'tempo (s)':>12}{'speed-up':>10}")
+    print(f"{'serial':<14}{base:>12.3f}{1.0:>10.2f}")
+
+    for workers in args.workers:
+        processador = ProcessadorParalelo(max_workers=workers, tamanho_lote=args.lote, limiar=0)
+
+        def paralelo():
+            processador.acumular_relatorio(atas, hoje).contexto()
+            processador.avaliar_criticidade(atas, motor, hoje)
+
+        paralelo()  # aquece o pool
+        tempo = medir(paralelo)
+        processador.close()
+        print(f"{f'{workers} worker(s)':<14}{tempo:>12.3f}{base / tempo:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Teste de carga: sessões de interface e agendador simultâneos sobre um banco.
+
+Cada sessão simulada usa os serviços compartilhados do processo como o
+``AtaApp`` no modo web: digita buscas (``MotorBusca`` sobre resumos), abre
+atas, consulta o painel, cria, edita e exclui atas e refaz a busca quando
+recebe eventos de dados. Uma thread de agendador executa a verificação de
+alertas do dia e o relatório semanal em intervalo fixo, com a avaliação
+incremental das atas alteradas ativa. Com ``--processos`` várias réplicas
+disputam o mesmo arquivo SQLite.
+
+Uso:
+    python benchmarks/bench_sessions.py [--atas 20000] [--sessoes 8] [--duracao 10]
+                                        [--processos 1] [--db atas.db] [--saida carga.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services.search import ConsultaAtas, MotorBusca
+from services.shared import encerrar_servicos, obter_servicos
+from services.sqlite_ata_service import SQLiteAtaService
+from utils.dados_sinteticos import ITENS, OBJETOS, popular
+
+# Peso de cada ação no sorteio das sessões
+ACOES = {"buscar": 40, "abrir": 20, "painel": 15, "editar": 10, "criar": 8, "excluir": 7}
+TERMOS = [palavra.lower() for palavra in OBJETOS + ITENS] + ["papelaria", "brasil 00", "ltda"]
+
+class Registro:
+    """Latências e erros por operação (compartilhado entre threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.erros: Dict[str, Counter] = defaultdict(Counter)
+
+    def medir(self, operacao: str, funcao: Callable[[], Any]):
+        inicio = time.perf_counter()
+        try:
+            funcao()
+        except Exception as e:
+            with self._lock:
+                self.erros[operacao][f"{type(e).__name__}: {e}"] += 1
+            return
+        duracao = time.perf_counter() - inicio
+        with self._lock:
+            self.latencias[operacao].append(duracao)
+
+    def exportar(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "latencias": {op: list(valores) for op, valores in self.latencias.items()},
+                "erros": {op: dict(contagem) for op, contagem in self.erros.items()},
+            }
+
+class SessaoSimulada:
+    """Usuário da tela de atas: ações sorteadas com pausa entre elas"""
+
+    def __init__(self, servicos, registro: Registro, indice: int, semente: int, pensar: float):
+        self.servico = servicos.ata_service
+        self.registro = registro
+        self.rng = random.Random(semente)
+        self.pensar = pensar
+        # Numeração própria para as atas criadas (não colide com a carteira gerada)
+        self.ano_criacao = 1000 + indice
+        self.proxima = 1
+        self.criadas: List[str] = []
+        self.termo = ""
+        self.alvo = ""
+        self.resultado: list = []
+        self.motor = MotorBusca(self.servico.listar_resumos, lambda: (self.servico.versao_dados, date.today()))
+        self.id_sessao = servicos.conectar_sessao(self._on_dados_alterados)
+
+    def _on_dados_alterados(self, eventos):
+        # Como a tela de atas aberta: refaz a busca atual com os dados novos
+        self.registro.medir("atualizar_tela", self._executar_busca)
+
+    def _executar_busca(self):
+        self.resultado = self.motor.buscar(ConsultaAtas(self.termo))
+
+    def buscar(self):
+        # Uma tecla por ação: estende o termo até completá-lo e então recomeça
+        if self.termo == self.alvo:
+            self.alvo, self.termo = self.rng.choice(TERMOS), ""
+        self.termo = self.alvo[:len(self.termo) + 1]
+        self._executar_busca()
+
+    def abrir(self):
+        if self.resultado:
+            # Acessar os itens hidrata a ata, como a tela de detalhe
+            len(self.rng.choice(self.resultado).itens)
+
+    def painel(self):
+        self.servico.get_resumo_painel()
+
+    def editar(self):
+        if not self.resultado:
+            return
+        ata = self.servico.buscar_por_numero(self.rng.choice(self.resultado).numero_ata)
+        if ata:
+            self.servico.editar_ata(ata.numero_ata, dict(ata.to_dict(), objeto=f"{ata.objeto.split(' #')[0]} #{self.rng.randrange(1000)}"))
+
+    def criar(self):
+        base = self.resultado[0].to_dict() if self.resultado else None
+        if base is None:
+            return
+        numero = f"{self.proxima:04d}/{self.ano_criacao}"
+        self.proxima += 1
+        self.servico.criar_ata(dict(base, numero_ata=numero))
+        self.criadas.append(numero)
+
+    def excluir(self):
+        if self.criadas:
+            self.servico.excluir_ata(self.criadas.pop(self.rng.randrange(len(self.criadas))))
+
+    def executar(self, ate: float):
+        nomes, pesos = list(ACOES), list(ACOES.values())
+        self.registro.medir("buscar", self._executar_busca)
+        while time.perf_counter() < ate:
+            acao = self.rng.choices(nomes, pesos)[0]
+            self.registro.medir(acao, getattr(self, acao))
+            time.sleep(self.pensar * 2 * self.rng.random())
+
+def _agendador(servicos, registro: Registro, ate: float, intervalo: float):
+    """Verificação diária e relatório semanal alternados, como o dono do lease"""
+    scheduler = servicos.scheduler
+    rodada = 0
+    while time.perf_counter() < ate:
+        if rodada % 2 == 0:
+            registro.medir("agendador.alertas_do_dia", scheduler.executar_verificacao_manual)
+            # A partir daqui as atas alteradas são avaliadas pelos eventos
+            scheduler.ultima_verificacao_diaria = date.today()
+        else:
+            registro.medir("agendador.relatorio_semanal", lambda: scheduler.gerar_relatorio_manual("semanal"))
+        rodada += 1
+        time.sleep(max(0.0, min(intervalo, ate - time.perf_counter())))
+
+def executar_processo(db_file: str, indice: int, sessoes: int, duracao: float, pensar: float,
+                      intervalo_agendador: float, semente: int) -> Dict[str, Any]:
+    """Roda as sessões (e, no processo 0, o agendador) e retorna as medições"""
+    registro = Registro()
+    with contextlib.redirect_stdout(io.StringIO()):
+        servicos = obter_servicos(db_file)
+        if indice == 0:
+            servicos.iniciar_tarefas()
+        simuladas = [
+            SessaoSimulada(servicos, registro, indice * 100 + i, semente + indice * 100 + i, pensar)
+            for i in range(sessoes)
+        ]
+        ate = time.perf_counter() + duracao
+        threads = [threading.Thread(target=s.executar, args=(ate,)) for s in simuladas]
+        if indice == 0:
+            threads.append(threading.Thread(target=_agendador, args=(servicos, registro, ate, intervalo_agendador)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for sessao in simuladas:
+            servicos.desconectar_sessao(sessao.id_sessao)
+        # Remove as atas criadas pelas sessões e ainda não excluídas
+        for sessao in simuladas:
+            for numero in sessao.criadas:
+                servicos.ata_service.excluir_ata(numero)
+        encerrar_servicos()
+    return registro.exportar()
+
+def _executar_processo(parametros):
+    return executar_processo(*parametros)
+
+def _percentil(ordenados: List[float], fracao: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
+
+def resumir(medicoes: List[Dict[str, Any]], duracao: float) -> Dict[str, Any]:
+    """Mescla as medições dos processos em percentis por operação"""
+    latencias: Dict[str, List[float]] = defaultdict(list)
+    erros: Dict[str, Counter] = defaultdict(Counter)
+    for medicao in medicoes:
+        for operacao, valores in medicao["latencias"].items():
+            latencias[operacao].extend(valores)
+        for operacao, contagem in medicao["erros"].items():
+            erros[operacao].update(contagem)
+    operacoes = {}
+    for operacao in sorted(set(latencias) | set(erros)):
+        valores = sorted(latencias.get(operacao, []))
+        operacoes[operacao] = {
+            "execucoes": len(valores),
+            "erros": sum(erros[operacao].values()),
+            "p50_ms": _percentil(valores, 0.50) * 1000 if valores else None,
+            "p95_ms": _percentil(valores, 0.95) * 1000 if valores else None,
+            "p99_ms": _percentil(valores, 0.99) * 1000 if valores else None,
+            "max_ms": valores[-1] * 1000 if valores else None,
+            "exemplos_erro": [mensagem for mensagem, _ in erros[operacao].most_common(3)],
+        }
+    total = sum(op["execucoes"] for op in operacoes.values())
+    return {"operacoes": operacoes, "operacoes_por_segundo": total / duracao}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões e agendador simultâneos")
+    parser.add_argument("--db", help="Banco existente (padrão: banco temporário gerado)")
+    parser.add_argument("--atas", type=int, default=20_000, help="Carteira gerada quando o banco está vazio")
+    parser.add_argument("--sessoes", type=int, default=8, help="Sessões por processo")
+    parser.add_argument("--processos", type=int, default=1, help="Réplicas sobre o mesmo banco")
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--pensar", type=float, default=0.05, help="Pausa média entre ações (s)")
+    parser.add_argument("--intervalo-agendador", type=float, default=2.0)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", help="Grava o resumo em JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db_file = args.db or os.path.join(diretorio, "atas.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Banco vazio (sem as atas de exemplo): gera a carteira pela importação em lote
+            servico = SQLiteAtaService(db_file, dados_exemplo=False)
+            if not servico.listar_resumos():
+                popular(servico, args.atas, args.semente)
+            total = len(servico.listar_resumos())
+            servico.close()
+
+        print(f"{total} atas, {args.processos} processo(s) x {args.sessoes} sessão(ões), {args.duracao:.0f} s\n")
+        parametros = [
+            (db_file, indice, args.sessoes, args.duracao, args.pensar, args.intervalo_agendador, args.semente)
+            for indice in range(args.processos)
+        ]
+        if args.processos == 1:
+            medicoes = [_executar_processo(parametros[0])]
+        else:
+            with multiprocessing.Pool(args.processos) as pool:
+                medicoes = pool.map(_executar_processo, parametros)
+
+    resumo = resumir(medicoes, args.duracao)
+    print(f"{'operação':<28}{'n':>7}{'erros':>7}{'p50 (ms)':>11}{'p95 (ms)':>11}{'p99 (ms)':>11}{'máx (ms)':>11}")
+    formatar = lambda v: f"{v:>11.1f}" if v is not None else f"{'-':>11}"
+    for operacao, dados in resumo["operacoes"].items():
+        print(f"{operacao:<28}{dados['execucoes']:>7}{dados['erros']:>7}"
+              f"{formatar(dados['p50_ms'])}{formatar(dados['p95_ms'])}"
+              f"{formatar(dados['p99_ms'])}{formatar(dados['max_ms'])}")
+        for mensagem in dados["exemplos_erro"]:
+            print(f"    ❌ {mensagem}")
+    print(f"\n{resumo['operacoes_por_segundo']:.1f} operações/s")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(dict(resumo, atas=total, processos=args.processos, sessoes=args.sessoes,
+                           duracao=args.duracao), f, indent=2, ensure_ascii=False)
+    return 1 if any(dados["erros"] for dados in resumo["operacoes"].values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark do snapshot colunar (agregados do dashboard na inicialização).
+
+Compara, sobre um SQLite com N atas, o cálculo dos agregados do painel
+hidratando todas as atas (caminho anterior) com a abertura do snapshot
+mapeado em memória por um serviço recém-criado.
+
+Uso:
+    python benchmarks/bench_snapshot.py [--atas 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_load import gerar_dados, medir
+from services.sqlite_ata_service import SQLiteAtaService
+
+def resumo_hidratando(servico: SQLiteAtaService):
+    atas = servico.listar_todas()
+    stats = {"vigente": 0, "a_vencer": 0, "vencida": 0}
+    mensal = {mes: 0 for mes in range(1, 13)}
+    ano = date.today().year
+    for ata in atas:
+        stats[ata.status] += 1
+        if ata.data_vigencia.year == ano:
+            mensal[ata.data_vigencia.month] += 1
+    vencendo = [ata for ata in atas if 0 <= ata.dias_restantes <= 90]
+    return stats, sum(ata.valor_total for ata in atas), len(vencendo), mensal
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do snapshot colunar")
+    parser.add_argument("--atas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = os.path.join(diretorio, "atas.db")
+        servico = SQLiteAtaService(banco)
+        servico.importar_atas(gerar_dados(args.atas), substituir=True)
+
+        inicio = time.perf_counter()
+        servico.snapshot()
+        reconstrucao = time.perf_counter() - inicio
+
+        def resumo_snapshot():
+            # Serviço novo a cada execução: mede a abertura a frio do arquivo
+            novo = SQLiteAtaService(banco)
+            try:
+                return novo.get_resumo_painel()
+            finally:
+                novo.close()
+
+        hidratando = medir(lambda: resumo_hidratando(servico))
+        mapeado = medir(resumo_snapshot)
+        tamanho = os.path.getsize(servico.snapshot_file) / 1e6
+        servico.close()
+
+    print(f"{args.atas} atas (snapshot: {tamanho:.1f} MB, reconstrução após escrita: {reconstrucao:.3f} s)\n")
+    print(f"{'agregados do painel':<28}{'tempo (s)':>10}")
+    print(f"{'hidratando todas as atas':<28}{hidratando:>10.3f}")
+    print(f"{'snapshot mapeado':<28}{mapeado:>10.3f}")
+    print(f"\nSpeed-up: {hidratando / mapeado:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização da GUI (tempo até o primeiro quadro).
+
+Executa ``src/main_gui.py`` algumas vezes com o perfil de inicialização
+ativo, compara a mediana de cada marco com o orçamento em
+``benchmarks/startup_budget.json`` e acrescenta o resultado ao histórico
+``benchmarks/startup_history.csv`` (um registro por execução/versão).
+
+Uso:
+    python benchmarks/bench_startup.py [--execucoes 5] [--somente-importacoes]
+
+Com ``--somente-importacoes`` mede apenas a importação de ``main_gui``
+(não abre janela; útil em CI sem display).
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(RAIZ, 'src')
+ORCAMENTO = os.path.join(os.path.dirname(__file__), 'startup_budget.json')
+HISTORICO = os.path.join(os.path.dirname(__file__), 'startup_history.csv')
+
+def executar(somente_importacoes: bool, timeout: float) -> dict:
+    """Executa uma inicialização e retorna os marcos (ms)"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        destino = os.path.join(diretorio, 'perfil.json')
+        env = dict(os.environ, ATA_REGIS_PERFIL_INICIALIZACAO=destino,
+                   ATA_REGIS_SAIR_APOS_INICIALIZACAO="1", PYTHONPATH=SRC)
+        if somente_importacoes:
+            comando = [sys.executable, "-c",
+                       "import main_gui; from utils.startup_profile import PERFIL; PERFIL.concluir()"]
+        else:
+            comando = [sys.executable, os.path.join(SRC, "main_gui.py")]
+        subprocess.run(comando, cwd=diretorio, env=env, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL)
+        with open(destino, encoding='utf-8') as f:
+            return json.load(f)["marcas"]
+
+def versao_atual() -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da GUI")
+    parser.add_argument("--execucoes", type=int, default=5)
+    parser.add_argument("--somente-importacoes", action="store_true")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--sem-historico", action="store_true", help="Não grava no histórico")
+    args = parser.parse_args()
+
+    # Primeira execução aquece caches de disco e bytecode
+    executar(args.somente_importacoes, args.timeout)
+    amostras = [executar(args.somente_importacoes, args.timeout) for _ in range(args.execucoes)]
+    medianas = {
+        marco: statistics.median(a[marco] for a in amostras)
+        for marco in amostras[0]
+    }
+
+    with open(ORCAMENTO, encoding='utf-8') as f:
+        orcamento = json.load(f)["marcos_ms"]
+
+    estourou = False
+    print(f"{'marco':<24}{'mediana (ms)':>14}{'orçamento':>12}")
+    for marco, valor in medianas.items():
+        limite = orcamento.get(marco)
+        status = ""
+        if limite is not None and valor > limite:
+            status, estourou = "  ❌ acima do orçamento", True
+        limite_txt = f"{limite:.0f}" if limite is not None else "-"
+        print(f"{marco:<24}{valor:>14.1f}{limite_txt:>12}{status}")
+
+    if not args.sem_historico:
+        novo = not os.path.exists(HISTORICO)
+        with open(HISTORICO, "a", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            if novo:
+                writer.writerow(["data", "versao", "modo", "marco", "mediana_ms"])
+            modo = "importacoes" if args.somente_importacoes else "gui"
+            agora = datetime.now().isoformat(timespec="seconds")
+            versao = versao_atual()
+            for marco, valor in medianas.items():
+                writer.writerow([agora, versao, modo, marco, f"{valor:.1f}"])
+
+    return 1 if estourou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
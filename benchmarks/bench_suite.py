@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks: serviços, alertas/relatórios e construtores da interface.
+
+Cada caso é registrado com ``@caso`` e recebe um ``Contexto`` com a carteira
+sintética do tamanho em teste (``utils.dados_sinteticos``); a preparação é
+feita fora da medição e a função retornada é cronometrada (estilo asv).
+Os resultados são gravados em ``benchmarks/resultados/<versão>.json`` e
+podem ser comparados com uma execução anterior.
+
+Uso:
+    python benchmarks/bench_suite.py [--tamanhos 100 1000 10000 100000] [--filtro sqlite]
+                                     [--comparar benchmarks/resultados/base.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+from models.ata import Ata
+from services.alert_service import AlertService
+from services.ata_service import AtaService
+from services.report_service import ReportService
+from services.sqlite_ata_service import SQLiteAtaService
+from ui.main_view import build_grouped_data_tables, build_stats_panel
+from utils.dados_sinteticos import gerar_atas
+from utils.email_service import EmailService
+
+RESULTADOS = os.path.join(os.path.dirname(__file__), 'resultados')
+TAMANHOS = [100, 1_000, 10_000, 100_000]
+
+class Contexto:
+    """Dados e serviços de um tamanho de carteira, criados sob demanda"""
+
+    def __init__(self, tamanho: int, diretorio: str):
+        self.tamanho = tamanho
+        self.diretorio = diretorio
+        self.hoje = date.today()
+
+    @cached_property
+    def dados(self) -> List[Dict[str, Any]]:
+        return gerar_atas(self.tamanho, hoje=self.hoje)
+
+    @cached_property
+    def atas(self) -> List[Ata]:
+        return [Ata.from_dict(d) for d in self.dados]
+
+    @cached_property
+    def sqlite(self) -> SQLiteAtaService:
+        servico = SQLiteAtaService(os.path.join(self.diretorio, f"atas_{self.tamanho}.db"))
+        servico.importar_atas(self.dados, substituir=True)
+        return servico
+
+    @cached_property
+    def json(self) -> AtaService:
+        servico = AtaService(os.path.join(self.diretorio, f"atas_{self.tamanho}.json"))
+        servico.atas = list(self.atas)
+        servico.save_data()
+        return servico
+
+    def nova_ata(self) -> Dict[str, Any]:
+        """Ata fora da carteira para os ciclos de criação/edição/exclusão"""
+        return dict(self.dados[0], numero_ata="9999/1999")
+
+    def close(self):
+        if "sqlite" in self.__dict__:
+            self.sqlite.close()
+
+CASOS: Dict[str, Callable[[Contexto], Callable[[], Any]]] = {}
+# Tamanho máximo de cada caso fora do modo ``--completo``
+LIMITES: Dict[str, int] = {}
+
+def caso(nome: str, tamanho_maximo: Optional[int] = None):
+    """Registra um caso: a função prepara o contexto e retorna o que será medido"""
+    def registrar(preparar):
+        CASOS[nome] = preparar
+        if tamanho_maximo is not None:
+            LIMITES[nome] = tamanho_maximo
+        return preparar
+    return registrar
+
+def _ciclo_crud(servico: Callable[[Contexto], Any]) -> Callable[[Contexto], Callable[[], Any]]:
+    def ciclo(ctx: Contexto):
+        alvo = servico(ctx)
+        nova = ctx.nova_ata()
+        editada = dict(nova, objeto="Objeto editado")
+
+        def executar():
+            alvo.criar_ata(nova)
+            alvo.editar_ata(nova["numero_ata"], editada)
+            alvo.excluir_ata(nova["numero_ata"])
+        return executar
+    return ciclo
+
+# --------- Serviços ---------
+caso("sqlite.crud")(_ciclo_crud(lambda ctx: ctx.sqlite))
+caso("json.crud")(_ciclo_crud(lambda ctx: ctx.json))
+
+@caso("sqlite.importar_atas")
+def sqlite_importar_atas(ctx: Contexto):
+    dados = ctx.dados
+    caminho = os.path.join(ctx.diretorio, "importacao.db")
+
+    def executar():
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        servico = SQLiteAtaService(caminho)
+        servico.importar_atas(dados, substituir=True)
+        servico.close()
+    return executar
+
+@caso("sqlite.listar_todas")
+def sqlite_listar_todas(ctx: Contexto):
+    return ctx.sqlite.listar_todas
+
+@caso("sqlite.listar_resumos")
+def sqlite_listar_resumos(ctx: Contexto):
+    return ctx.sqlite.listar_resumos
+
+@caso("sqlite.buscar_por_texto")
+def sqlite_buscar_por_texto(ctx: Contexto):
+    return lambda: ctx.sqlite.buscar_por_texto("papelaria")
+
+@caso("sqlite.get_estatisticas")
+def sqlite_get_estatisticas(ctx: Contexto):
+    # Snapshot já válido: mede o caminho de leitura (não a reconstrução)
+    ctx.sqlite.snapshot()
+    return ctx.sqlite.get_estatisticas
+
+@caso("sqlite.get_atas_vencimento_proximo")
+def sqlite_get_atas_vencimento_proximo(ctx: Contexto):
+    ctx.sqlite.snapshot()
+    return ctx.sqlite.get_atas_vencimento_proximo
+
+@caso("json.load_data")
+def json_load_data(ctx: Contexto):
+    return ctx.json.load_data
+
+@caso("json.save_data")
+def json_save_data(ctx: Contexto):
+    return ctx.json.save_data
+
+@caso("json.buscar_por_texto")
+def json_buscar_por_texto(ctx: Contexto):
+    return lambda: ctx.json.buscar_por_texto("papelaria")
+
+@caso("json.get_estatisticas")
+def json_get_estatisticas(ctx: Contexto):
+    return ctx.json.get_estatisticas
+
+# --------- Alertas e relatórios ---------
+@caso("alertas.verificar_alertas_automaticos")
+def alertas_verificar_alertas_automaticos(ctx: Contexto):
+    atas = ctx.atas
+
+    def executar():
+        # Histórico novo a cada execução: todos os alertas do dia são enviados
+        alertas = AlertService(EmailService(), ":memory:", modo_digest=True)
+        alertas.verificar_alertas_automaticos(atas, ctx.hoje)
+        alertas.close()
+    return executar
+
+@caso("alertas.verificar_alertas_do_dia")
+def alertas_verificar_alertas_do_dia(ctx: Contexto):
+    servico = ctx.sqlite
+
+    def executar():
+        alertas = AlertService(EmailService(), ":memory:", modo_digest=True)
+        alertas.verificar_alertas_do_dia(servico, ctx.hoje)
+        alertas.close()
+    return executar
+
+@caso("relatorios.mensal_html")
+def relatorios_mensal_html(ctx: Contexto):
+    alertas = AlertService(EmailService(), ":memory:")
+    atas = ctx.atas
+    return lambda: alertas.renderizar_relatorio_mensal(atas, io.StringIO(), formato="html", hoje=ctx.hoje)
+
+@caso("relatorios.arquivo_csv")
+def relatorios_arquivo_csv(ctx: Contexto):
+    relatorios = ReportService(":memory:", diretorio=ctx.diretorio)
+    servico = ctx.sqlite
+    return lambda: relatorios.gerar(servico, formato="csv", hoje=ctx.hoje)
+
+# --------- Construtores da interface (árvore de controles, sem página) ---------
+# Com 100k atas a tabela completa leva ~100 s e ~4 GB: só roda com --completo
+@caso("ui.build_grouped_data_tables", tamanho_maximo=10_000)
+def ui_build_grouped_data_tables(ctx: Contexto):
+    resumos = ctx.sqlite.listar_resumos()
+    nada = lambda *_: None
+    return lambda: build_grouped_data_tables(resumos, nada, nada, nada)
+
+@caso("ui.build_stats_panel")
+def ui_build_stats_panel(ctx: Contexto):
+    ctx.sqlite.snapshot()
+    return lambda: build_stats_panel(ctx.sqlite)
+
+def medir(funcao: Callable[[], Any], repeticoes: int, tempo_maximo: float) -> Dict[str, Any]:
+    """Executa até ``repeticoes`` vezes (ao menos uma), parando após ``tempo_maximo`` segundos"""
+    tempos: List[float] = []
+    inicio_total = time.perf_counter()
+    while len(tempos) < repeticoes:
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+        if time.perf_counter() - inicio_total > tempo_maximo:
+            break
+    return {"min": min(tempos), "mediana": statistics.median(tempos), "execucoes": len(tempos)}
+
+def executar(tamanhos: List[int], filtro: Optional[str] = None, repeticoes: int = 5,
+             tempo_maximo: float = 5.0, completo: bool = False,
+             saida=sys.stdout) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Roda os casos selecionados e retorna {caso: {tamanho: medição}}"""
+    nomes = [nome for nome in CASOS if not filtro or filtro in nome]
+    resultados: Dict[str, Dict[str, Dict[str, Any]]] = {nome: {} for nome in nomes}
+    for tamanho in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            ctx = Contexto(tamanho, diretorio)
+            try:
+                for nome in nomes:
+                    if not completo and tamanho > LIMITES.get(nome, tamanho):
+                        continue
+                    # Os serviços imprimem cada operação (emails simulados, alertas)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        funcao = CASOS[nome](ctx)
+                        medicao = medir(funcao, repeticoes, tempo_maximo)
+                    resultados[nome][str(tamanho)] = medicao
+                    print(f"{nome:<42}{tamanho:>8}{medicao['min'] * 1000:>12.2f} ms", file=saida)
+            finally:
+                ctx.close()
+    return resultados
+
+def versao_atual() -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+def comparar(atual: Dict[str, Any], base: Dict[str, Any], limite: float) -> List[str]:
+    """Casos cujo tempo mínimo piorou mais que ``limite`` (razão) em relação à base"""
+    regressoes = []
+    for nome, por_tamanho in atual.items():
+        for tamanho, medicao in por_tamanho.items():
+            anterior = base.get(nome, {}).get(tamanho)
+            if not anterior:
+                continue
+            razao = medicao["min"] / anterior["min"]
+            # Diferenças abaixo de 1 ms são ruído de medição
+            if razao > limite and medicao["min"] - anterior["min"] > 0.001:
+                regressoes.append(
+                    f"{nome} [{tamanho}]: {anterior['min'] * 1000:.2f} -> {medicao['min'] * 1000:.2f} ms "
+                    f"({razao:.2f}x)"
+                )
+    return regressoes
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do ATA-REGIS")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS)
+    parser.add_argument("--filtro", help="Executa só os casos cujo nome contém o texto")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tempo-maximo", type=float, default=5.0,
+                        help="Segundos por caso antes de parar as repetições")
+    parser.add_argument("--completo", action="store_true",
+                        help="Ignora o tamanho máximo dos casos mais pesados")
+    parser.add_argument("--saida", help="Arquivo de resultados (padrão: resultados/<versão>.json)")
+    parser.add_argument("--comparar", help="Resultados anteriores para detectar regressões")
+    parser.add_argument("--limite", type=float, default=1.25, help="Razão que caracteriza regressão")
+    args = parser.parse_args()
+
+    print(f"{'caso':<42}{'atas':>8}{'mínimo':>15}")
+    resultados = executar(args.tamanhos, args.filtro, args.repeticoes, args.tempo_maximo, args.completo)
+
+    versao = versao_atual()
+    saida = args.saida or os.path.join(RESULTADOS, f"{versao}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump({
+            "versao": versao,
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "resultados": resultados,
+        }, f, indent=2)
+    print(f"\nResultados gravados em {os.path.relpath(saida, RAIZ)}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(resultados, base["resultados"], args.limite)
+        print(f"\nComparação com {base.get('versao', args.comparar)}:")
+        for regressao in regressoes:
+            print(f"  ❌ {regressao}")
+        if not regressoes:
+            print("  ✅ Nenhuma regressão acima do limite")
+        return 1 if regressoes else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Verifica chamadas a ``page.update()`` em handlers de formulário.
+
+``page.update()`` sem argumentos refaz o diff da página inteira (inclusive o
+que está atrás do diálogo). Em handlers que alteram um único controle deve-se
+usar ``controle.update()``; a página só precisa ser atualizada quando o
+próprio diálogo é aberto, fechado ou trocado.
+
+Uso:
+    python scripts/check_page_updates.py [arquivos...]   (padrão: src/forms/*.py)
+"""
+
+import ast
+import glob
+import os
+import sys
+from typing import List
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Atribuições que justificam atualizar a página inteira
+ATRIBUTOS_DE_PAGINA = {"dialog", "open"}
+
+def _e_page_update(no: ast.AST) -> bool:
+    return (
+        isinstance(no, ast.Call)
+        and not no.args
+        and isinstance(no.func, ast.Attribute)
+        and no.func.attr == "update"
+        and isinstance(no.func.value, ast.Attribute)
+        and no.func.value.attr == "page"
+    )
+
+def _altera_pagina(funcao: ast.AST) -> bool:
+    for no in ast.walk(funcao):
+        if isinstance(no, ast.Assign):
+            for alvo in no.targets:
+                if isinstance(alvo, ast.Attribute) and alvo.attr in ATRIBUTOS_DE_PAGINA:
+                    return True
+    return False
+
+def verificar(caminho: str) -> List[str]:
+    """Retorna as chamadas ``page.update()`` sem alteração de diálogo na mesma função"""
+    with open(caminho, encoding="utf-8") as f:
+        arvore = ast.parse(f.read(), caminho)
+    problemas = []
+    for funcao in ast.walk(arvore):
+        if not isinstance(funcao, (ast.FunctionDef, ast.AsyncFunctionDef)) or _altera_pagina(funcao):
+            continue
+        for no in ast.walk(funcao):
+            if _e_page_update(no):
+                relativo = os.path.relpath(caminho, RAIZ)
+                problemas.append(
+                    f"{relativo}:{no.lineno} {funcao.name}: page.update() atualiza a página inteira; "
+                    f"use controle.update()"
+                )
+    return problemas
+
+def main(argv: List[str]) -> int:
+    caminhos = argv or sorted(glob.glob(os.path.join(RAIZ, "src", "forms", "*.py")))
+    problemas = [p for caminho in caminhos for p in verificar(caminho)]
+    for problema in problemas:
+        print(problema)
+    return 1 if problemas else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1 @@
+"""Ponto de entrada sem interface gráfica (``python -m ata_regis``)."""
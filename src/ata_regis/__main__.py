@@ -0,0 +1,5 @@
+import sys
+
+from ata_regis.cli import main
+
+sys.exit(main())
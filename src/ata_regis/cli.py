@@ -0,0 +1,279 @@
+"""
+Interface de linha de comando (sem GUI) do ATA-REGIS.
+
+Executa o agendador, os alertas e os relatórios diretamente sobre o banco
+SQLite, sem importar ``flet``:
+
+    python -m ata_regis [--db atas.db] [--workers 4] daemon
+    python -m ata_regis check-alerts [--data AAAA-MM-DD]
+    python -m ata_regis report --monthly [--formato html|csv|pdf|texto] [--enviar]
+    python -m ata_regis report --weekly
+    python -m ata_regis import atas.json [--substituir]
+    python -m ata_regis export atas.json [--formato json|csv]
+    python -m ata_regis generate 100000 [--semente 0] [--itens 1 8] [--json atas.json]
+"""
+
+import argparse
+import csv
+import json
+import os
+import signal
+import sys
+import threading
+from datetime import date
+from typing import List, Optional
+
+# Os módulos do projeto (models, services, utils) ficam em src/
+_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from services.sqlite_ata_service import SQLiteAtaService
+from services.alert_service import AlertService
+from services.parallel import criar_processador
+from services.report_service import ReportService, FORMATOS_RELATORIO
+from utils.email_service import EmailService
+from utils.email_queue import criar_fila_email
+
+class Contexto:
+    """Serviços compartilhados pelos comandos, criados sobre o mesmo banco"""
+
+    def __init__(self, db_file: str, workers: Optional[int] = None):
+        # Sem as atas de exemplo: um banco novo de servidor não deve receber (nem alertar) atas fictícias
+        self.ata_service = SQLiteAtaService(db_file, dados_exemplo=False)
+        # Pool de processos para alertas e relatórios de carteiras grandes (None = serial)
+        self.processador = criar_processador(workers)
+        self.email_outbox, self.email_worker = criar_fila_email(db_file)
+        self.email_service = EmailService(self.email_outbox)
+        self.alert_service = AlertService(self.email_service, db_file, modo_digest=True,
+                                          processador=self.processador)
+
+    def entregar_emails(self):
+        """Envia de imediato o que foi enfileirado (comandos de execução única)"""
+        if self.email_worker:
+            enviadas = self.email_worker.processar_pendentes()
+            print(f"📧 {enviadas} email(s) enviado(s) via SMTP")
+
+    def report_service(self, diretorio: str = "relatorios") -> ReportService:
+        return ReportService(self.ata_service.db_file, diretorio, processador=self.processador)
+
+    def close(self):
+        self.alert_service.close()
+        if self.email_outbox:
+            self.email_outbox.close()
+        if self.processador:
+            self.processador.close()
+        self.ata_service.close()
+
+def cmd_daemon(ctx: Contexto, args: argparse.Namespace) -> int:
+    """Executa agendador e fila de emails até receber SIGINT/SIGTERM"""
+    from utils.metrics import METRICAS
+    from utils.scheduler import TaskScheduler
+
+    scheduler = TaskScheduler(ctx.ata_service, ctx.alert_service, ctx.report_service(), dono=args.dono)
+    parar = threading.Event()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sinal, lambda *_: parar.set())
+
+    scheduler.start()
+    if ctx.email_worker:
+        ctx.email_worker.start()
+    METRICAS.iniciar_exportacao()
+    print(f"🟢 Daemon em execução (banco: {ctx.ata_service.db_file}, dono: {scheduler.dono})")
+    if METRICAS.destino:
+        print(f"📈 Métricas exportadas em {METRICAS.destino} a cada {METRICAS.intervalo:.0f} s")
+    try:
+        while not parar.wait(1):
+            pass
+    finally:
+        scheduler.stop()
+        if ctx.email_worker:
+            ctx.email_worker.stop()
+        METRICAS.parar_exportacao()
+    return 0
+
+def cmd_check_alerts(ctx: Contexto, args: argparse.Namespace) -> int:
+    """Verifica os alertas do dia uma única vez"""
+    resultado = ctx.alert_service.verificar_alertas_do_dia(ctx.ata_service, args.data)
+    ctx.entregar_emails()
+    print(f"Alertas enviados: {resultado['alertas_enviados']}")
+    print(f"Mensagens enviadas: {resultado['mensagens_enviadas']}")
+    for alerta in resultado["atas_alertadas"]:
+        print(f"   - {alerta['numero_ata']}: {alerta['tipo_alerta']} ({alerta['dias_restantes']} dias)")
+    for erro in resultado["erros"]:
+        print(f"❌ {erro}")
+    return 1 if resultado["erros"] else 0
+
+def cmd_report(ctx: Contexto, args: argparse.Namespace) -> int:
+    """Gera o relatório semanal (email) ou mensal (arquivo e, opcionalmente, email)"""
+    if args.weekly:
+        ok = ctx.alert_service.enviar_relatorio_semanal(ctx.ata_service.listar_todas())
+        ctx.entregar_emails()
+        return 0 if ok else 1
+
+    report_service = ctx.report_service(args.saida)
+    try:
+        relatorio = report_service.gerar(ctx.ata_service, args.formato, medir_memoria=args.medir_memoria)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        report_service.close()
+    print(f"📄 {relatorio.caminho}")
+    print(f"   {relatorio.total_atas} atas em {relatorio.duracao_ms:.0f} ms "
+          f"(pico de memória {relatorio.pico_memoria_kb:.0f} KB)")
+    if args.enviar:
+        if not ctx.alert_service.enviar_relatorio_mensal(contexto=relatorio.contexto):
+            return 1
+        ctx.entregar_emails()
+    return 0
+
+def cmd_import(ctx: Contexto, args: argparse.Namespace) -> int:
+    """Importa atas de um arquivo JSON (mesmo formato de atas.json)"""
+    try:
+        with open(args.arquivo, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Erro ao ler {args.arquivo}: {e}")
+        return 1
+    if not isinstance(dados, list):
+        print("❌ O arquivo deve conter uma lista de atas")
+        return 1
+    resultado = ctx.ata_service.importar_atas(dados, substituir=args.substituir)
+    print(f"Importadas: {resultado['importadas']}")
+    print(f"Substituídas: {resultado['substituidas']}")
+    print(f"Ignoradas (já existentes): {resultado['ignoradas']}")
+    for erro in resultado["erros"]:
+        print(f"❌ {erro}")
+    return 1 if resultado["erros"] else 0
+
+def cmd_export(ctx: Contexto, args: argparse.Namespace) -> int:
+    """Exporta todas as atas para JSON ou CSV, lendo o banco em lotes"""
+    formato = args.formato or ("csv" if args.arquivo.lower().endswith(".csv") else "json")
+    total = 0
+    with open(args.arquivo, "w", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["numero_ata", "documento_sei", "data_vigencia", "objeto",
+                             "fornecedor", "valor_total", "telefones", "emails"])
+            for lote in ctx.ata_service.iterar_em_lotes():
+                writer.writerows(
+                    (ata.numero_ata, ata.documento_sei, ata.data_vigencia.isoformat(), ata.objeto,
+                     ata.fornecedor, f"{ata.valor_total:.2f}",
+                     ", ".join(ata.telefones_fornecedor), ", ".join(ata.emails_fornecedor))
+                    for ata in lote
+                )
+                total += len(lote)
+        else:
+            f.write("[")
+            for lote in ctx.ata_service.iterar_em_lotes():
+                for ata in lote:
+                    f.write(",\n  " if total else "\n  ")
+                    f.write(json.dumps(ata.to_dict(), ensure_ascii=False))
+                    total += 1
+            f.write("\n]\n" if total else "]\n")
+    print(f"{total} ata(s) exportada(s) para {args.arquivo}")
+    return 0
+
+def cmd_generate(ctx: Optional[Contexto], args: argparse.Namespace) -> int:
+    """Gera uma carteira sintética determinística no banco (ou num atas.json)"""
+    from utils.dados_sinteticos import Distribuicao, popular
+
+    try:
+        distribuicao = Distribuicao(
+            itens=tuple(args.itens),
+            fornecedores=args.fornecedores,
+            concentracao=args.concentracao,
+            vigencia_dias=tuple(args.vigencia),
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    # Destino sem as atas de exemplo: um arquivo/banco novo fica só com a carteira gerada
+    if args.json:
+        from services.ata_service import AtaService
+        destino, servico = args.json, AtaService(args.json, dados_exemplo=False)
+        resultado = popular(servico, args.quantidade, args.semente, args.data, distribuicao)
+    else:
+        destino, servico = args.db, SQLiteAtaService(args.db, dados_exemplo=False)
+        try:
+            resultado = popular(servico, args.quantidade, args.semente, args.data, distribuicao)
+        finally:
+            servico.close()
+    print(f"{resultado['importadas']} ata(s) gerada(s) em {destino} "
+          f"({resultado['substituidas']} substituída(s), semente {args.semente})")
+    for erro in resultado["erros"]:
+        print(f"❌ {erro}")
+    return 1 if resultado["erros"] else 0
+
+def data_iso(valor: str) -> date:
+    """Tipo do argparse para datas AAAA-MM-DD (erro de uso em vez de traceback)"""
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {valor!r} (use AAAA-MM-DD)")
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ata_regis", description="ATA-REGIS - alertas e relatórios sem interface gráfica"
+    )
+    parser.add_argument("--db", default=os.environ.get("ATA_REGIS_DB", "atas.db"),
+                        help="Arquivo do banco SQLite (padrão: atas.db ou $ATA_REGIS_DB)")
+    parser.add_argument("--workers", type=int,
+                        help="Processos para alertas e relatórios (padrão: $ATA_REGIS_WORKERS; 0/1 = serial)")
+    parser.set_defaults(contexto=True)
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    daemon = sub.add_parser("daemon", help="Executa o agendador e a fila de emails em primeiro plano")
+    daemon.add_argument("--dono", help="Identificador desta instância na posse do agendador")
+    daemon.set_defaults(func=cmd_daemon)
+
+    check = sub.add_parser("check-alerts", help="Verifica e envia os alertas do dia")
+    check.add_argument("--data", type=data_iso, help="Data de referência (AAAA-MM-DD); padrão: hoje")
+    check.set_defaults(func=cmd_check_alerts)
+
+    report = sub.add_parser("report", help="Gera relatório semanal ou mensal")
+    tipo = report.add_mutually_exclusive_group(required=True)
+    tipo.add_argument("--monthly", action="store_true", help="Relatório mensal em arquivo")
+    tipo.add_argument("--weekly", action="store_true", help="Relatório semanal por email")
+    report.add_argument("--formato", choices=FORMATOS_RELATORIO, default="html")
+    report.add_argument("--saida", default="relatorios", help="Diretório dos arquivos gerados")
+    report.add_argument("--enviar", action="store_true", help="Envia também o relatório mensal por email")
+    report.add_argument("--medir-memoria", action="store_true",
+                        help="Mede o pico do relatório com tracemalloc (mais lento)")
+    report.set_defaults(func=cmd_report)
+
+    importar = sub.add_parser("import", help="Importa atas de um arquivo JSON")
+    importar.add_argument("arquivo")
+    importar.add_argument("--substituir", action="store_true", help="Substitui atas já existentes")
+    importar.set_defaults(func=cmd_import)
+
+    exportar = sub.add_parser("export", help="Exporta as atas para JSON ou CSV")
+    exportar.add_argument("arquivo")
+    exportar.add_argument("--formato", choices=("json", "csv"))
+    exportar.set_defaults(func=cmd_export)
+
+    gerar = sub.add_parser("generate", help="Gera uma carteira sintética (testes de carga)")
+    gerar.add_argument("quantidade", type=int)
+    gerar.add_argument("--semente", type=int, default=0, help="Mesma semente => mesmas atas")
+    gerar.add_argument("--itens", type=int, nargs=2, default=[1, 8], metavar=("MIN", "MAX"),
+                       help="Itens por ata")
+    gerar.add_argument("--fornecedores", type=int, default=500)
+    gerar.add_argument("--concentracao", type=float, default=0.0,
+                       help="0 = uniforme; maior = poucos fornecedores concentram as atas")
+    gerar.add_argument("--vigencia", type=int, nargs=2, default=[-730, 1095], metavar=("MIN", "MAX"),
+                       help="Vigência em dias a partir de hoje")
+    gerar.add_argument("--data", type=data_iso, help="Data de referência (AAAA-MM-DD); padrão: hoje")
+    gerar.add_argument("--json", help="Grava num atas.json em vez do banco")
+    gerar.set_defaults(func=cmd_generate, contexto=False)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+    # Comandos que abrem o próprio destino não criam (nem semeiam) o banco padrão
+    ctx = Contexto(args.db, args.workers) if args.contexto else None
+    try:
+        return args.func(ctx, args)
+    finally:
+        if ctx:
+            ctx.close()
@@ -1,5 +1,5 @@
 from .button import PrimaryButton, SecondaryButton, IconAction
-from .input import TextInput, SelectInput
+from .input import TextInput, SelectInput, MaskedInput, aplicar_mascara
 from .table import Table, TableHeader, TableRow, TableCell
 from .badge import StatusBadge
 from .dashboard import AlertBanner, MetricCard, DonutStatus, MonthlyBarChart
@@ -10,6 +10,8 @@ __all__ = [
     "IconAction",
     "TextInput",
     "SelectInput",
+    "MaskedInput",
+    "aplicar_mascara",
     "Table",
     "TableHeader",
     "TableRow",
@@ -1,3 +1,3 @@
-from .fields import TextInput, SelectInput
+from .fields import TextInput, SelectInput, MaskedInput, aplicar_mascara
 
-__all__ = ["TextInput", "SelectInput"]
+__all__ = ["TextInput", "SelectInput", "MaskedInput", "aplicar_mascara"]
@@ -1,13 +1,25 @@
 """Input field components."""
 
+import re
 from typing import Callable, Optional, Any
 import flet as ft
 
 from theme.tokens import TOKENS as T
+from utils.validators import MaskUtils
 from . import style
 
 S = T.spacing
 
+# Máscara -> (formatador, tamanho máximo já formatado)
+MASCARAS = {
+    "numero_ata": (MaskUtils.aplicar_mascara_numero_ata, 9),
+    "sei": (MaskUtils.aplicar_mascara_sei, 20),
+    "telefone": (MaskUtils.aplicar_mascara_telefone, 15),
+}
+
+# Filtro aplicado no cliente: só dígitos e separadores das máscaras
+_CARACTERES_MASCARA = r"[0-9./()\- ]"
+
 
 def TextInput(
     label: Optional[str] = None,
@@ -28,6 +40,51 @@ def TextInput(
     )
 
 
+def aplicar_mascara(field: ft.TextField) -> bool:
+    """Formata o valor de um ``MaskedInput``; retorna True se o valor mudou"""
+    formatar, _ = MASCARAS[field.data]
+    valor = field.value or ""
+    formatado = formatar(valor) if re.search(r"\d", valor) else ""
+    if formatado == valor:
+        return False
+    field.value = formatado
+    return True
+
+
+def MaskedInput(
+    mascara: str,
+    label: Optional[str] = None,
+    *,
+    on_blur: Optional[Callable[[ft.ControlEvent], None]] = None,
+    **kwargs: Any,
+) -> ft.TextField:
+    """Text input with a mask applied on blur/submit.
+
+    Typing is filtered on the client (digits and mask separators, limited
+    length), so no event reaches the server per keystroke; the value is
+    formatted once when the field loses focus or is submitted.
+    """
+    _, tamanho = MASCARAS[mascara]
+
+    def formatar(e: ft.ControlEvent) -> None:
+        if aplicar_mascara(e.control):
+            e.control.update()
+        if on_blur:
+            on_blur(e)
+
+    kwargs.setdefault("keyboard_type", ft.KeyboardType.NUMBER)
+    field = TextInput(
+        label,
+        input_filter=ft.InputFilter(regex_string=_CARACTERES_MASCARA, allow=True, replacement_string=""),
+        max_length=tamanho,
+        on_blur=formatar,
+        on_submit=formatar,
+        **kwargs,
+    )
+    field.data = mascara
+    return field
+
+
 def SelectInput(
     options: list[ft.dropdown.Option],
     *,
@@ -6,20 +6,24 @@ from theme.tokens import TOKENS as T
 from theme import colors as C
 
 S, R, SH = T.spacing, T.radius, T.shadows
-from components import PrimaryButton, SecondaryButton, TextInput, IconAction
+from components import PrimaryButton, SecondaryButton, TextInput, MaskedInput, IconAction, aplicar_mascara
 from ui.tokens import build_section
 from models.ata import Ata, Item
-from utils.validators import Validators, Formatters, MaskUtils
+from utils.validators import Validators, Formatters
+from utils.validation import ESQUEMA_ATA, VerificadorUnicidade, validar_campo
 
 class AtaForm:
     """Formulário para criação e edição de atas"""
     
     def __init__(self, page: ft.Page, on_save: Callable[[Dict[str, Any]], None], 
-                 on_cancel: Callable[[], None], ata: Optional[Ata] = None):
+                 on_cancel: Callable[[], None], ata: Optional[Ata] = None,
+                 verificador: Optional[VerificadorUnicidade] = None):
         self.page = page
         self.on_save = on_save
         self.on_cancel = on_cancel
         self.ata = ata
+        # Verifica em background se o número digitado já existe
+        self.verificador = verificador
         self.is_edit_mode = ata is not None
         
         # Campos do formulário
@@ -45,18 +49,21 @@ class AtaForm:
         titulo = "Editar Ata" if self.is_edit_mode else "Nova Ata"
         
         # Campos básicos
-        self.numero_ata_field = TextInput(
+        # Máscaras são aplicadas ao sair do campo (sem ida ao servidor por tecla)
+        self.numero_ata_field = MaskedInput(
+            "numero_ata",
             label="Número da Ata",
             hint_text="0000/0000",
-            on_change=self.on_numero_ata_change,
+            on_blur=self.on_numero_ata_blur,
             expand=True,
             border_radius=R.RADIUS_FULL,
         )
 
-        self.documento_sei_field = TextInput(
+        self.documento_sei_field = MaskedInput(
+            "sei",
             label="Documento SEI",
             hint_text="00000.000000/0000-00",
-            on_change=self.on_documento_sei_change,
+            on_blur=self._validar_ao_sair("documento_sei"),
             expand=True,
             border_radius=R.RADIUS_FULL,
         )
@@ -253,6 +260,44 @@ class AtaForm:
         self.dialog.open = True
         self.page.update()
     
+    def _atualizar(self, control: ft.Control):
+        """Envia só o controle alterado (antes de abrir o diálogo não há o que enviar)"""
+        if control.page:
+            control.update()
+    
+    def _mostrar_erro(self, field: ft.TextField, erro: Optional[str]):
+        if field.error_text != erro:
+            field.error_text = erro
+            self._atualizar(field)
+    
+    def _validar_ao_sair(self, nome: str):
+        """Handler de blur que valida o campo pelo esquema e mostra o erro no próprio campo"""
+        lista = ESQUEMA_ATA[nome].lista
+        
+        def handler(e):
+            valor = (e.control.value or "").strip()
+            erro = validar_campo(nome, [valor] if lista else valor) if valor else None
+            self._mostrar_erro(e.control, erro)
+        
+        return handler
+    
+    def _numero_alterado(self, numero: str) -> bool:
+        return not (self.is_edit_mode and numero == self.ata.numero_ata)
+    
+    def on_numero_ata_blur(self, e):
+        """Valida o formato e agenda a verificação de unicidade do número"""
+        numero = (e.control.value or "").strip()
+        erro = validar_campo("numero_ata", numero) if numero else None
+        self._mostrar_erro(e.control, erro)
+        if numero and not erro and self.verificador and self._numero_alterado(numero):
+            self.verificador.verificar_async(numero, self._on_numero_verificado)
+    
+    def _on_numero_verificado(self, numero: str, unico: bool):
+        if numero != (self.numero_ata_field.value or "").strip():
+            return  # o usuário já alterou o campo
+        if not unico:
+            self._mostrar_erro(self.numero_ata_field, f"Já existe uma ata com o número {numero}")
+    
     def populate_fields(self):
         """Preenche os campos com dados da ata existente"""
         if not self.ata:
@@ -278,11 +323,12 @@ class AtaForm:
     
     def add_telefone(self, valor: str = ""):
         """Adiciona campo de telefone"""
-        telefone_field = TextInput(
+        telefone_field = MaskedInput(
+            "telefone",
             label=f"Telefone {len(self.telefones) + 1}",
             hint_text="(XX) XXXXX-XXXX",
             value=valor,
-            on_change=self.on_telefone_change,
+            on_blur=self._validar_ao_sair("telefones_fornecedor"),
             border_radius=R.RADIUS_FULL,
             expand=True,
             col={"xs": 10, "md": 11},
@@ -306,14 +352,14 @@ class AtaForm:
         remove_btn.on_click = lambda e, field=telefone_field, r=row: self.remove_telefone(field, r)
         self.telefones.append((telefone_field, row))
         self.telefones_container.controls.append(row)
-        self.page.update()
+        self._atualizar(self.telefones_container)
     
     def remove_telefone(self, field, row):
         """Remove campo de telefone"""
         self.telefones = [(f, r) for f, r in self.telefones if f != field]
         if row in self.telefones_container.controls:
             self.telefones_container.controls.remove(row)
-        self.page.update()
+        self._atualizar(self.telefones_container)
     
     def add_email(self, valor: str = ""):
         """Adiciona campo de e-mail"""
@@ -321,6 +367,7 @@ class AtaForm:
             label=f"E-mail {len(self.emails) + 1}",
             hint_text="email@exemplo.com",
             value=valor,
+            on_blur=self._validar_ao_sair("emails_fornecedor"),
             border_radius=R.RADIUS_FULL,
             expand=True,
             col={"xs": 10, "md": 11},
@@ -344,14 +391,14 @@ class AtaForm:
         remove_btn.on_click = lambda e, field=email_field, r=row: self.remove_email(field, r)
         self.emails.append((email_field, row))
         self.emails_container.controls.append(row)
-        self.page.update()
+        self._atualizar(self.emails_container)
     
     def remove_email(self, field, row):
         """Remove campo de e-mail"""
         self.emails = [(f, r) for f, r in self.emails if f != field]
         if row in self.emails_container.controls:
             self.emails_container.controls.remove(row)
-        self.page.update()
+        self._atualizar(self.emails_container)
     
     def add_item(self, item: Optional[Item] = None):
         """Adiciona campos de item"""
@@ -407,45 +454,43 @@ class AtaForm:
 
         self.itens.append((descricao_field, quantidade_field, valor_field, row))
         self.itens_container.controls.append(row)
-        self.page.update()
+        self._atualizar(self.itens_container)
     
     def remove_item(self, descricao_field, row):
         """Remove campos de item"""
         self.itens = [(d, q, v, r) for d, q, v, r in self.itens if d != descricao_field]
         if row in self.itens_container.controls:
             self.itens_container.controls.remove(row)
-        self.page.update()
-    
-    def on_numero_ata_change(self, e):
-        """Aplica máscara ao número da ata"""
-        e.control.value = MaskUtils.aplicar_mascara_numero_ata(e.control.value)
-        self.page.update()
+        self._atualizar(self.itens_container)
     
-    def on_documento_sei_change(self, e):
-        """Aplica máscara ao documento SEI"""
-        e.control.value = MaskUtils.aplicar_mascara_sei(e.control.value)
-        self.page.update()
-    
-    def on_telefone_change(self, e):
-        """Aplica máscara ao telefone"""
-        e.control.value = MaskUtils.aplicar_mascara_telefone(e.control.value)
-        self.page.update()
+    def aplicar_mascaras(self):
+        """Formata os campos mascarados (caso o usuário salve sem sair do campo)"""
+        campos = [self.numero_ata_field, self.documento_sei_field, *(f for f, _ in self.telefones)]
+        for field in campos:
+            aplicar_mascara(field)
     
     def validate_form(self) -> List[str]:
         """Valida o formulário e retorna lista de erros"""
         erros = []
         
-        # Valida número da ata
-        if not self.numero_ata_field.value:
+        # Valida número da ata (formato pelo esquema e unicidade pelo índice do serviço)
+        numero = self.numero_ata_field.value
+        if not numero:
             erros.append("Número da ata é obrigatório")
-        elif not Validators.validar_numero_ata(self.numero_ata_field.value):
-            erros.append("Número da ata deve seguir o formato XXXX/AAAA")
+        else:
+            erro = validar_campo("numero_ata", numero)
+            if erro:
+                erros.append(erro)
+            elif self.verificador and self._numero_alterado(numero) and not self.verificador.unico(numero):
+                erros.append(f"Já existe uma ata com o número {numero}")
         
         # Valida documento SEI
         if not self.documento_sei_field.value:
             erros.append("Documento SEI é obrigatório")
-        elif not Validators.validar_documento_sei(self.documento_sei_field.value):
-            erros.append("Documento SEI deve seguir o formato 00000.000000/0000-00")
+        else:
+            erro = validar_campo("documento_sei", self.documento_sei_field.value)
+            if erro:
+                erros.append(erro)
         
         # Valida data de vigência
         if not self.data_vigencia_field.value:
@@ -465,10 +510,11 @@ class AtaForm:
         telefones_validos = []
         for telefone_field, _ in self.telefones:
             if telefone_field.value and telefone_field.value.strip():
-                if Validators.validar_telefone(telefone_field.value):
-                    telefones_validos.append(telefone_field.value)
+                erro = validar_campo("telefones_fornecedor", [telefone_field.value])
+                if erro:
+                    erros.append(erro)
                 else:
-                    erros.append(f"Telefone {telefone_field.value} não é válido")
+                    telefones_validos.append(telefone_field.value)
         
         if not telefones_validos:
             erros.append("Pelo menos um telefone é obrigatório")
@@ -477,10 +523,11 @@ class AtaForm:
         emails_validos = []
         for email_field, _ in self.emails:
             if email_field.value and email_field.value.strip():
-                if Validators.validar_email(email_field.value):
-                    emails_validos.append(email_field.value)
+                erro = validar_campo("emails_fornecedor", [email_field.value])
+                if erro:
+                    erros.append(erro)
                 else:
-                    erros.append(f"E-mail {email_field.value} não é válido")
+                    emails_validos.append(email_field.value)
         
         if not emails_validos:
             erros.append("Pelo menos um e-mail é obrigatório")
@@ -510,6 +557,7 @@ class AtaForm:
     
     def save_ata(self, e):
         """Salva a ata"""
+        self.aplicar_mascaras()
         erros = self.validate_form()
         
         if erros:
@@ -1,47 +1,89 @@
-import flet as ft
 import sys
 import os
 import json
+import threading
+from datetime import date
 
 # Adiciona o diretório src ao path para importações
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.sqlite_ata_service import SQLiteAtaService
-from services.alert_service import AlertService
-from utils.email_service import EmailService
-from utils.scheduler import TaskScheduler
-from forms.ata_form import AtaForm
+from utils.startup_profile import PERFIL
+
+import flet as ft
+PERFIL.marcar("import_flet")
+
+from services.shared import obter_servicos
+from utils.metrics import METRICAS, instrumentado
+from utils.validation import VerificadorUnicidade
+from services.search import ConsultaAtas, MotorBusca, PipelineBusca, ordenar_atas
+# Formulário, detalhe e barra de filtros são importados sob demanda
 from ui.main_view import (
     build_header,
     build_grouped_data_tables,
     build_atas_vencimento,
     build_stats_panel as ui_build_stats_panel,
+    build_desempenho_panel,
 )
-from ui.atas_filter_bar import AtasFilterBar
 from ui.sidebar import Sidebar
-from ui import build_ata_detail_view
 from theme.tokens import TOKENS as T
 from theme import colors as C
 from ui.responsive import get_breakpoint
+PERFIL.marcar("import_modulos")
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+# Fonte Inter remota, usada quando não há cópia em assets/fonts (make fonts)
+FONTE_INTER_URL = "https://fonts.gstatic.com/s/inter/v7/Inter-Regular.ttf"
 
 class AtaApp:
     def __init__(self, page: ft.Page):
         self.page = page
-        self.ata_service = SQLiteAtaService()
-        self.email_service = EmailService()
-        self.alert_service = AlertService(self.email_service)
-        self.scheduler = TaskScheduler(self.ata_service, self.alert_service)
+        PERFIL.marcar("app_inicio")
+        # Serviços e agendador são do processo: no modo web todas as sessões os compartilham
+        self.servicos = obter_servicos()
+        self.ata_service = self.servicos.ata_service
+        self.email_service = self.servicos.email_service
+        self.alert_service = self.servicos.alert_service
+        self.scheduler = self.servicos.scheduler
         saved_filters = self.page.client_storage.get("filtros_status")
         self.filtros_status: set[str] = set(json.loads(saved_filters)) if saved_filters else set()
         self.texto_busca = ""
         self.sort_key = "mais_recente"
+        # Consultas da tela de atas rodam em background; resultados obsoletos são descartados
+        self.busca = PipelineBusca(self._executar_consulta, self._exibir_resultado_busca)
+        # Status dependem da data: o cache vale para a versão dos dados e o dia.
+        # A tabela usa resumos; itens e contatos são lidos ao abrir uma ata
+        self.motor_busca = MotorBusca(self.ata_service.listar_resumos, lambda: self._versao_view(1))
+        # Unicidade do número da ata verificada enquanto o formulário é preenchido
+        self.verificador_numero = VerificadorUnicidade(
+            self.ata_service.validar_numero_ata_unico, lambda: self.ata_service.versao_dados
+        )
         self.current_tab = 0
+        # Views já construídas por aba e a versão dos dados usada em cada uma
+        self._views: dict[int, ft.Control] = {}
+        self._versoes_views: dict[int, object] = {}
         self.breakpoint = get_breakpoint(page.width)
+        # Mudanças nos dados (de qualquer sessão ou do agendador) atualizam a tela em lote
+        self.sessao = self.servicos.conectar_sessao(self.on_dados_alterados)
+        self.page.on_close = self.on_sessao_encerrada
+        PERFIL.marcar("servicos")
         self.setup_page()
         self.build_ui()
+        PERFIL.marcar("primeiro_quadro")
+        
+        # Conteúdo da aba inicial e tarefas em background ficam para depois do primeiro quadro
+        threading.Thread(target=self._concluir_inicializacao, daemon=True).start()
+    
+    def _concluir_inicializacao(self):
+        """Monta a aba inicial e inicia agendador e fila de emails"""
+        self.update_body()
+        PERFIL.marcar("conteudo_inicial")
         
-        # Inicia o agendador de tarefas
-        self.scheduler.start()
+        # Inicia o agendador de tarefas e a fila de emails (só na primeira sessão do processo)
+        self.servicos.iniciar_tarefas()
+        PERFIL.marcar("tarefas_background")
+        PERFIL.concluir()
+        if os.environ.get("ATA_REGIS_SAIR_APOS_INICIALIZACAO") == "1":
+            self.page.window_destroy()
     
     def setup_page(self):
         """Configurações da página"""
@@ -52,7 +94,12 @@ class AtaApp:
         # Remove outer page padding to ensure consistent gutter handled by body container
         self.page.padding = 0
         self.page.bgcolor = C.BG_APP
-        self.page.fonts = {T.typography.FONT_SANS: "https://fonts.gstatic.com/s/inter/v7/Inter-Regular.ttf"}
+        # Fonte empacotada localmente evita o download antes do primeiro quadro;
+        # sem o arquivo, a Inter é baixada como antes
+        if os.path.exists(os.path.join(ASSETS_DIR, "fonts", "Inter-Regular.ttf")):
+            self.page.fonts = {T.typography.FONT_SANS: "/fonts/Inter-Regular.ttf"}
+        else:
+            self.page.fonts = {T.typography.FONT_SANS: FONTE_INTER_URL}
         self.page.theme = ft.Theme(color_scheme_seed="blue", font_family=T.typography.FONT_SANS)
         self.page.on_resize = self.on_page_resize
     
@@ -101,7 +148,12 @@ class AtaApp:
             padding=ft.padding.only(top=T.spacing.SPACE_4, bottom=T.spacing.SPACE_4),
             expand=True,
         )
-        self.update_body()
+        # Indicador de carregamento até a aba inicial ser montada
+        self.body_container.content = ft.Container(
+            content=ft.ProgressRing(),
+            alignment=ft.alignment.center,
+            expand=True,
+        )
         layout = ft.Row([
             self.sidebar,
             self.body_container,
@@ -129,11 +181,15 @@ class AtaApp:
             self.enviar_alerta,
         )
 
+    @instrumentado("ui.dashboard")
     def build_dashboard_view(self):
         self.stats_container = ui_build_stats_panel(self.ata_service)
         return ft.Column([self.stats_container], spacing=0, expand=True)
 
+    @instrumentado("ui.atas")
     def build_atas_view(self):
+        from ui.atas_filter_bar import AtasFilterBar
+        
         self.filter_bar = AtasFilterBar(
             on_search_change=self.on_search_change,
             on_filters_change=self.on_filters_change,
@@ -143,9 +199,11 @@ class AtaApp:
             sort=self.sort_key,
         )
         self.grouped_tables = ft.Container()
-        self.apply_filters()
+        consulta = self.consulta_atual()
+        self._exibir_tabelas(self.busca.executar_agora(consulta), consulta)
         return ft.Column([self.filter_bar, self.grouped_tables], spacing=0, expand=True)
 
+    @instrumentado("ui.vencimentos")
     def build_vencimentos_view(self):
         self.atas_vencimento_container = build_atas_vencimento(
             self.ata_service.get_atas_vencimento_proximo(),
@@ -154,8 +212,10 @@ class AtaApp:
         )
         return ft.Column([self.atas_vencimento_container], spacing=0, expand=True)
 
+    @instrumentado("ui.configuracoes")
     def build_config_view(self):
         """Retorna painel de configurações com ações utilitárias"""
+        self.desempenho_container = ft.Container(content=self._build_desempenho())
         return ft.Column(
             [
                 ft.ListTile(title=ft.Text("Verificar Alertas"), on_click=self.verificar_alertas_manual),
@@ -169,25 +229,70 @@ class AtaApp:
                 ),
                 ft.ListTile(title=ft.Text("Testar Email"), on_click=self.testar_email),
                 ft.ListTile(title=ft.Text("Status Sistema"), on_click=self.mostrar_status_sistema),
+                self.desempenho_container,
             ],
             spacing=T.spacing.SPACE_4,
             expand=True,
+            scroll=ft.ScrollMode.AUTO,
         )
 
+    def _build_desempenho(self):
+        return build_desempenho_panel(METRICAS.resumo(), METRICAS.ativo, self.atualizar_desempenho)
+
+    def atualizar_desempenho(self, e=None):
+        """Refaz a tabela de desempenho com as métricas atuais do processo"""
+        self.desempenho_container.content = self._build_desempenho()
+        if e is not None:
+            self.page.update()
+
+    def _versao_view(self, tab: int):
+        """Chave de validade da view: versão dos dados e dia (status dependem da data)"""
+        if tab == 3:
+            return None  # Configurações não dependem dos dados
+        return (self.ata_service.versao_dados, date.today())
+
     def update_body(self):
-        if self.current_tab == 0:
-            content = self.build_dashboard_view()
-        elif self.current_tab == 1:
-            content = self.build_atas_view()
-        elif self.current_tab == 2:
-            content = self.build_vencimentos_view()
-        else:
-            content = self.build_config_view()
+        """Exibe a view da aba atual, reconstruindo-a só se os dados mudaram"""
+        tab = self.current_tab
+        versao = self._versao_view(tab)
+        content = self._views.get(tab)
+        if content is None or self._versoes_views.get(tab) != versao:
+            if tab == 0:
+                content = self.build_dashboard_view()
+            elif tab == 1:
+                content = self.build_atas_view()
+            elif tab == 2:
+                content = self.build_vencimentos_view()
+            else:
+                content = self.build_config_view()
+            self._views[tab] = content
+            self._versoes_views[tab] = versao
         self.body_container.content = content
         self.page.update()
 
+    def invalidar_views(self):
+        """Descarta as views em cache (ex.: mudança de breakpoint)"""
+        self._views.clear()
+        self._versoes_views.clear()
+
+    def on_dados_alterados(self, eventos):
+        """Atualiza só a view visível; as demais são refeitas ao abrir a aba"""
+        if self.current_tab == 1 and 1 in self._views:
+            # Mantém busca, filtros e rolagem: troca apenas as tabelas
+            self._versoes_views[1] = self._versao_view(1)
+            self.apply_filters()
+        else:
+            self.update_body()
+
+    def on_sessao_encerrada(self, e):
+        self.busca.close()
+        self.servicos.desconectar_sessao(self.sessao)
+
     def navigate_to(self, index: int):
         self.current_tab = index
+        if index == 3 and 3 in self._views:
+            # A view de Configurações fica em cache; só as métricas mudam
+            self.atualizar_desempenho()
         self.update_body()
 
     def on_page_resize(self, e):
@@ -195,29 +300,17 @@ class AtaApp:
         new_bp = get_breakpoint(self.page.width)
         if new_bp != self.breakpoint:
             self.breakpoint = new_bp
+            self.invalidar_views()
             self.refresh_ui()
     
-    def get_atas_filtradas(self):
-        """Retorna as atas filtradas baseado nos filtros ativos e busca"""
-        atas = self.ata_service.listar_todas()
-
-        if self.filtros_status and "todos" not in self.filtros_status:
-            atas = [ata for ata in atas if ata.status in self.filtros_status]
-
-        if self.texto_busca:
-            texto = self.texto_busca.lower()
-            atas = [
-                ata
-                for ata in atas
-                if (
-                    texto in ata.numero_ata.lower()
-                    or texto in ata.objeto.lower()
-                    or texto in ata.fornecedor.lower()
-                    or texto in ata.documento_sei.lower()
-                )
-            ]
+    def consulta_atual(self) -> ConsultaAtas:
+        return ConsultaAtas(self.texto_busca, frozenset(self.filtros_status), self.sort_key)
 
-        return atas
+    @instrumentado("ui.busca", linhas=len)
+    def _executar_consulta(self, consulta: ConsultaAtas, cancelado):
+        """Filtra e ordena as atas (executado fora da thread da interface)"""
+        atas = self.motor_busca.buscar(consulta, cancelado)
+        return ordenar_atas(atas, consulta.ordenacao)
 
     def on_filters_change(self, ativos: list[str]):
         """Atualiza filtros selecionados."""
@@ -236,29 +329,29 @@ class AtaApp:
         self.apply_filters()
 
     def apply_filters(self):
-        """Aplica busca, filtros e ordenação e atualiza a tabela"""
-        atas = self.get_atas_filtradas()
-        atas = self.sort_atas(atas)
-        new_table = build_grouped_data_tables(
+        """Agenda a busca com os filtros atuais; a tabela é trocada quando ela terminar"""
+        self.busca.submeter(self.consulta_atual())
+
+    def _exibir_resultado_busca(self, geracao: int, consulta: ConsultaAtas, atas):
+        tabelas = self._montar_tabelas(atas, consulta)
+        # Uma busca mais nova pode ter começado enquanto as tabelas eram montadas
+        if self.busca.atual(geracao):
+            self.grouped_tables.content = tabelas
+            self.page.update()
+
+    @instrumentado("ui.tabelas")
+    def _montar_tabelas(self, atas, consulta: ConsultaAtas):
+        return build_grouped_data_tables(
             atas,
             self.visualizar_ata,
             self.editar_ata,
             self.excluir_ata,
-            filtros=list(self.filtros_status) if self.filtros_status else None,
-        )
-        self.grouped_tables.content = new_table.content
-        self.page.update()
+            filtros=list(consulta.filtros) if consulta.filtros else None,
+        ).content
 
-    def sort_atas(self, atas):
-        if self.sort_key == "mais_recente":
-            return sorted(atas, key=lambda x: x.data_vigencia, reverse=True)
-        if self.sort_key == "mais_antiga":
-            return sorted(atas, key=lambda x: x.data_vigencia)
-        if self.sort_key == "valor_maior":
-            return sorted(atas, key=lambda x: x.valor_total, reverse=True)
-        if self.sort_key == "valor_menor":
-            return sorted(atas, key=lambda x: x.valor_total)
-        return atas
+    def _exibir_tabelas(self, atas, consulta: ConsultaAtas):
+        self.grouped_tables.content = self._montar_tabelas(atas, consulta)
+        self.page.update()
     
     def refresh_ui(self):
         """Atualiza a interface"""
@@ -267,14 +360,19 @@ class AtaApp:
     
     def nova_ata_click(self, e):
         """Abre o formulário para nova ata"""
+        from forms.ata_form import AtaForm
+        
         AtaForm(
             page=self.page,
             on_save=self.salvar_nova_ata,
-            on_cancel=self.fechar_formulario
+            on_cancel=self.fechar_formulario,
+            verificador=self.verificador_numero,
         )
     
     def visualizar_ata(self, ata):
         """Visualiza uma ata usando o layout moderno"""
+        from ui.ata_detail_view import build_ata_detail_view
+        
         detail_view = build_ata_detail_view(
             ata,
             on_back=lambda e: self.close_dialog(),
@@ -291,11 +389,14 @@ class AtaApp:
     
     def editar_ata(self, ata):
         """Edita uma ata"""
+        from forms.ata_form import AtaForm
+        
         AtaForm(
             page=self.page,
             on_save=lambda data: self.salvar_edicao_ata(ata.numero_ata, data),
             on_cancel=self.fechar_formulario,
-            ata=ata
+            ata=ata,
+            verificador=self.verificador_numero,
         )
     
     def excluir_ata(self, ata):
@@ -315,7 +416,6 @@ class AtaApp:
         """Confirma a exclusão de uma ata"""
         if self.ata_service.excluir_ata(numero_ata):
             self.close_dialog()
-            self.refresh_ui()
             self.show_success_message("Ata excluída com sucesso!")
         else:
             self.show_error_message("Erro ao excluir ata.")
@@ -342,7 +442,6 @@ class AtaApp:
         """Salva uma nova ata"""
         try:
             self.ata_service.criar_ata(ata_data)
-            self.refresh_ui()
             self.show_success_message("Ata criada com sucesso!")
         except Exception as e:
             self.show_error_message(f"Erro ao criar ata: {str(e)}")
@@ -351,7 +450,6 @@ class AtaApp:
         """Salva a edição de uma ata"""
         try:
             self.ata_service.editar_ata(numero_ata, ata_data)
-            self.refresh_ui()
             self.show_success_message("Ata atualizada com sucesso!")
         except Exception as e:
             self.show_error_message(f"Erro ao atualizar ata: {str(e)}")
@@ -392,6 +490,7 @@ class AtaApp:
 
 • Alertas enviados: {resultado['alertas_enviados']}
 • Atas alertadas: {len(resultado['atas_alertadas'])}
+• Mensagens enviadas: {resultado['mensagens_enviadas']}
 
 """
         
@@ -419,6 +518,8 @@ class AtaApp:
         """Gera relatório manual"""
         if self.scheduler.gerar_relatorio_manual(tipo):
             message = f"Relatório {tipo} gerado com sucesso!\nVerifique o console para detalhes."
+            if tipo == "mensal":
+                message += f"\nArquivos salvos em: {self.scheduler.report_service.diretorio}/"
         else:
             message = f"Erro ao gerar relatório {tipo}."
         
@@ -454,11 +555,12 @@ class AtaApp:
 
 🔄 Agendador: {"Ativo" if status['running'] else "Inativo"}
 🧵 Thread: {"Ativa" if status['thread_alive'] else "Inativa"}
+👥 Sessões conectadas: {self.servicos.sessoes_ativas}
 📧 Alertas (7 dias): {len(historico)}
 🕐 Última verificação: {status['ultima_verificacao']}
 
 📊 Estatísticas:
-• Total de atas: {len(self.ata_service.listar_todas())}
+• Total de atas: {sum(self.ata_service.get_estatisticas().values())}
 • Atas próximas vencimento: {len(self.ata_service.get_atas_vencimento_proximo())}
 
 O sistema está monitorando automaticamente as atas e enviará alertas conforme necessário.
@@ -472,10 +574,6 @@ O sistema está monitorando automaticamente as atas e enviará alertas conforme
         self.page.dialog.open = True
         self.page.update()
     
-    def __del__(self):
-        """Destrutor - para o agendador ao fechar a aplicação"""
-        if hasattr(self, 'scheduler'):
-            self.scheduler.stop()
 
 
 def main(page: ft.Page):
@@ -483,5 +581,10 @@ def main(page: ft.Page):
 
 
 if __name__ == "__main__":
-    ft.app(target=main)
+    # ATA_REGIS_WEB=1 serve a aplicação no navegador (várias sessões por processo)
+    if os.environ.get("ATA_REGIS_WEB") == "1":
+        ft.app(target=main, assets_dir=ASSETS_DIR, view=ft.AppView.WEB_BROWSER,
+               port=int(os.environ.get("ATA_REGIS_PORTA", "8550")))
+    else:
+        ft.app(target=main, assets_dir=ASSETS_DIR)
 
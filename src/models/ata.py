@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from datetime import date, datetime
-import re
+
+from utils.validation import primeiro_erro
 
 @dataclass
 class Item:
@@ -40,6 +41,15 @@ class Item:
             quantidade=data["quantidade"],
             valor=data["valor"]
         )
+    
+    @classmethod
+    def from_trusted(cls, descricao: str, quantidade: int, valor: float) -> 'Item':
+        """Cria item já validado na gravação (ex.: lido do banco), sem revalidar"""
+        item = object.__new__(cls)
+        item.descricao = descricao
+        item.quantidade = quantidade
+        item.valor = valor
+        return item
 
 @dataclass
 class Ata:
@@ -58,62 +68,12 @@ class Ata:
         self.validate()
     
     def validate(self):
-        """Valida todos os campos da ata"""
-        self._validate_numero_ata()
-        self._validate_documento_sei()
-        self._validate_data_vigencia()
-        self._validate_objeto()
-        self._validate_fornecedor()
-        self._validate_telefones()
-        self._validate_emails()
+        """Valida todos os campos da ata (regras em ``utils.validation.ESQUEMA_ATA``)"""
+        erro = primeiro_erro(self)
+        if erro:
+            raise ValueError(erro)
         self._validate_itens()
     
-    def _validate_numero_ata(self):
-        """Valida o formato do número da ata (XXXX/AAAA)"""
-        if not re.match(r'^\d{4}/\d{4}$', self.numero_ata):
-            raise ValueError("Número da ata deve seguir o formato XXXX/AAAA")
-    
-    def _validate_documento_sei(self):
-        """Valida o formato do documento SEI (00000.000000/0000-00)"""
-        if not re.match(r'^\d{5}\.\d{6}/\d{4}-\d{2}$', self.documento_sei):
-            raise ValueError("Documento SEI deve seguir o formato 00000.000000/0000-00")
-    
-    def _validate_data_vigencia(self):
-        """Valida a data de vigência"""
-        if not isinstance(self.data_vigencia, date):
-            raise ValueError("Data de vigência deve ser do tipo date")
-        
-        # Converte string para date se necessário
-        if isinstance(self.data_vigencia, str):
-            try:
-                self.data_vigencia = datetime.strptime(self.data_vigencia, "%Y-%m-%d").date()
-            except ValueError:
-                raise ValueError("Data de vigência deve estar no formato YYYY-MM-DD")
-    
-    def _validate_objeto(self):
-        """Valida o objeto da ata"""
-        if not self.objeto.strip():
-            raise ValueError("Objeto não pode estar vazio")
-    
-    def _validate_fornecedor(self):
-        """Valida o fornecedor"""
-        if not self.fornecedor.strip():
-            raise ValueError("Fornecedor não pode estar vazio")
-    
-    def _validate_telefones(self):
-        """Valida os telefones do fornecedor"""
-        telefone_pattern = r'^\(\d{2}\)\s?\d{4,5}-\d{4}$'
-        for telefone in self.telefones_fornecedor:
-            if not re.match(telefone_pattern, telefone):
-                raise ValueError(f"Telefone {telefone} deve seguir o formato (XX) XXXXX-XXXX")
-    
-    def _validate_emails(self):
-        """Valida os emails do fornecedor"""
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        for email in self.emails_fornecedor:
-            if not re.match(email_pattern, email):
-                raise ValueError(f"Email {email} não é válido")
-    
     def _validate_itens(self):
         """Valida os itens da ata"""
         if not self.itens:
@@ -161,8 +121,39 @@ class Ata:
         }
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Ata':
-        """Cria instância a partir de dicionário"""
+    def from_trusted(cls, numero_ata: str, documento_sei: str, data_vigencia: date, objeto: str,
+                     itens: List[Item], fornecedor: str, telefones_fornecedor: List[str],
+                     emails_fornecedor: List[str]) -> 'Ata':
+        """Cria ata já validada na gravação (banco ou arquivo salvo), sem revalidar.
+        
+        Entrada do usuário e importações devem usar o construtor ou ``from_dict``.
+        """
+        ata = object.__new__(cls)
+        ata.numero_ata = numero_ata
+        ata.documento_sei = documento_sei
+        ata.data_vigencia = data_vigencia
+        ata.objeto = objeto
+        ata.itens = itens
+        ata.fornecedor = fornecedor
+        ata.telefones_fornecedor = telefones_fornecedor
+        ata.emails_fornecedor = emails_fornecedor
+        return ata
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], validar: bool = True) -> 'Ata':
+        """Cria instância a partir de dicionário (``validar=False`` para dados já gravados)"""
+        if not validar:
+            data_vigencia = data["data_vigencia"]
+            return cls.from_trusted(
+                data["numero_ata"],
+                data["documento_sei"],
+                date.fromisoformat(data_vigencia) if isinstance(data_vigencia, str) else data_vigencia,
+                data["objeto"],
+                [Item.from_trusted(i["descricao"], i["quantidade"], i["valor"]) for i in data.get("itens", [])],
+                data.get("fornecedor", ""),
+                data.get("telefones_fornecedor", []),
+                data.get("emails_fornecedor", []),
+            )
         # Converte string de data para objeto date
         if isinstance(data["data_vigencia"], str):
             data_vigencia = datetime.strptime(data["data_vigencia"], "%Y-%m-%d").date()
@@ -187,3 +178,55 @@ class Ata:
         """Representação em string"""
         return f"Ata {self.numero_ata} - {self.objeto} ({self.status})"
 
+class AtaSummary:
+    """Projeção leve da ata para listas e tabelas.
+
+    Traz só os campos exibidos/pesquisados e o valor total já somado; itens e
+    contatos são carregados por ``carregar(numero_ata)`` no primeiro acesso
+    (ex.: ao abrir o detalhe ou o formulário de edição).
+    """
+
+    __slots__ = ("numero_ata", "documento_sei", "data_vigencia", "objeto", "fornecedor",
+                 "valor_total", "_carregar", "_ata")
+
+    def __init__(self, numero_ata: str, documento_sei: str, data_vigencia: date, objeto: str,
+                 fornecedor: str, valor_total: float, carregar: Callable[[str], Optional[Ata]]):
+        self.numero_ata = numero_ata
+        self.documento_sei = documento_sei
+        self.data_vigencia = data_vigencia
+        self.objeto = objeto
+        self.fornecedor = fornecedor
+        self.valor_total = valor_total
+        self._carregar = carregar
+        self._ata: Optional[Ata] = None
+
+    # Mesmas regras da ata completa (dependem só da data de vigência)
+    status = Ata.status
+    dias_restantes = Ata.dias_restantes
+
+    def completa(self) -> Ata:
+        """Ata completa, carregada uma única vez"""
+        if self._ata is None:
+            ata = self._carregar(self.numero_ata)
+            if ata is None:
+                raise LookupError(f"Ata {self.numero_ata} não encontrada")
+            self._ata = ata
+        return self._ata
+
+    @property
+    def itens(self) -> List[Item]:
+        return self.completa().itens
+
+    @property
+    def telefones_fornecedor(self) -> List[str]:
+        return self.completa().telefones_fornecedor
+
+    @property
+    def emails_fornecedor(self) -> List[str]:
+        return self.completa().emails_fornecedor
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.completa().to_dict()
+
+    def __str__(self) -> str:
+        return f"Ata {self.numero_ata} - {self.objeto} ({self.status})"
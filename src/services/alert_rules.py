@@ -0,0 +1,212 @@
+import json
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from models.ata import Ata
+
+@dataclass(frozen=True)
+class RegraAlerta:
+    """Regra de alerta: dispara quando os dias restantes estão em ``dias``"""
+    tipo: str
+    dias: Tuple[int, ...]
+    valor_min: Optional[float] = None
+    valor_max: Optional[float] = None
+    fornecedores: Tuple[str, ...] = ()
+    termos_objeto: Tuple[str, ...] = ()
+    destinatarios: Tuple[str, ...] = ()
+
+    def aplica(self, ata: Ata, valor: Optional[float] = None) -> bool:
+        """Verifica os filtros de valor, fornecedor e objeto da regra"""
+        if self.valor_min is not None or self.valor_max is not None:
+            if valor is None:
+                valor = ata.valor_total
+            if self.valor_min is not None and valor < self.valor_min:
+                return False
+            if self.valor_max is not None and valor > self.valor_max:
+                return False
+        if self.fornecedores and ata.fornecedor.lower() not in self.fornecedores:
+            return False
+        if self.termos_objeto:
+            objeto = ata.objeto.lower()
+            if not any(termo in objeto for termo in self.termos_objeto):
+                return False
+        return True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RegraAlerta':
+        """Cria regra a partir de dicionário (configuração)"""
+        dias = data["dias"]
+        if isinstance(dias, int):
+            dias = [dias]
+        elif isinstance(dias, dict):
+            # Intervalo inclusivo: {"de": -30, "ate": -1}
+            dias = range(dias["de"], dias["ate"] + 1)
+        return cls(
+            tipo=data["tipo"],
+            dias=tuple(dias),
+            valor_min=data.get("valor_min"),
+            valor_max=data.get("valor_max"),
+            fornecedores=tuple(f.lower() for f in data.get("fornecedores", [])),
+            termos_objeto=tuple(t.lower() for t in data.get("termos_objeto", [])),
+            destinatarios=tuple(data.get("destinatarios", [])),
+        )
+
+@dataclass(frozen=True)
+class FaixaCriticidade:
+    """Faixa de criticidade: vale para dias restantes até ``dias_max`` (inclusive)"""
+    nivel: str
+    dias_max: Optional[int]
+    motivo: str = "Vencimento em {dias} dias"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FaixaCriticidade':
+        """Cria faixa a partir de dicionário (configuração)"""
+        return cls(
+            nivel=data["nivel"],
+            dias_max=data.get("dias_max"),
+            motivo=data.get("motivo", "Vencimento em {dias} dias"),
+        )
+
+@dataclass(frozen=True)
+class AjusteValor:
+    """Eleva a criticidade de atas com valor acima de ``valor_min``"""
+    valor_min: float
+    niveis: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AjusteValor':
+        """Cria ajuste a partir de dicionário (configuração)"""
+        return cls(
+            valor_min=data["valor_min"],
+            niveis=tuple(data["niveis"].items()),
+        )
+
+# Regras padrão (D-90 até o vencimento e até 30 dias após)
+REGRAS_ALERTA_PADRAO: Tuple[RegraAlerta, ...] = (
+    RegraAlerta("D-90", (90,)),
+    RegraAlerta("D-60", (60,)),
+    RegraAlerta("D-30", (30,)),
+    RegraAlerta("D-15", (15,)),
+    RegraAlerta("D-7", (7,)),
+    RegraAlerta("D-1", (1,)),
+    RegraAlerta("VENCIMENTO", (0,)),
+    RegraAlerta("POS-VENCIMENTO", tuple(range(-30, 0))),
+)
+
+FAIXAS_CRITICIDADE_PADRAO: Tuple[FaixaCriticidade, ...] = (
+    FaixaCriticidade("CRÍTICA", -1, "Ata vencida há {dias_vencida} dias"),
+    FaixaCriticidade("CRÍTICA", 7),
+    FaixaCriticidade("ALTA", 15),
+    FaixaCriticidade("MÉDIA", 30),
+    FaixaCriticidade("BAIXA", 60),
+    FaixaCriticidade("NORMAL", None, "Ata vigente"),
+)
+
+# Atas acima de 1 milhão sobem um nível
+AJUSTES_VALOR_PADRAO: Tuple[AjusteValor, ...] = (
+    AjusteValor(1000000, (("MÉDIA", "ALTA"), ("BAIXA", "MÉDIA"))),
+)
+
+class MotorRegras:
+    """Compila regras de alerta e criticidade em tabelas indexadas por dias restantes"""
+
+    def __init__(self, regras: Iterable[RegraAlerta] = REGRAS_ALERTA_PADRAO,
+                 faixas: Iterable[FaixaCriticidade] = FAIXAS_CRITICIDADE_PADRAO,
+                 ajustes: Iterable[AjusteValor] = AJUSTES_VALOR_PADRAO):
+        self.regras = tuple(regras)
+        self.faixas = tuple(faixas)
+        self.ajustes = tuple(ajustes)
+        self._compilar()
+
+    def _compilar(self):
+        """Monta as tabelas de consulta a partir das regras"""
+        # dias restantes -> regras candidatas, na ordem de prioridade
+        por_dias: Dict[int, List[RegraAlerta]] = {}
+        for regra in self.regras:
+            for dias in regra.dias:
+                por_dias.setdefault(dias, []).append(regra)
+        self._regras_por_dias: Dict[int, Tuple[RegraAlerta, ...]] = {
+            dias: tuple(regras) for dias, regras in por_dias.items()
+        }
+
+        # Faixas de criticidade: tabela densa entre o menor e o maior limite
+        faixas = sorted(
+            self.faixas, key=lambda f: f.dias_max if f.dias_max is not None else float("inf")
+        )
+        if not faixas or faixas[-1].dias_max is not None:
+            raise ValueError("As faixas de criticidade devem terminar com uma faixa sem limite (dias_max nulo)")
+        self._faixa_final = faixas[-1]
+        limitadas = faixas[:-1]
+        self._faixa_inicial = limitadas[0] if limitadas else self._faixa_final
+        self._dias_inicio = limitadas[0].dias_max if limitadas else 0
+        self._dias_fim = limitadas[-1].dias_max if limitadas else -1
+        tabela: List[FaixaCriticidade] = []
+        indice = 0
+        for dias in range(self._dias_inicio, self._dias_fim + 1):
+            while limitadas[indice].dias_max < dias:
+                indice += 1
+            tabela.append(limitadas[indice])
+        self._tabela_faixas = tabela
+
+        # Ajustes de valor: limites ordenados para busca binária
+        ajustes = sorted(self.ajustes, key=lambda a: a.valor_min)
+        self._limites_valor = [a.valor_min for a in ajustes]
+        self._mapas_valor = [dict(a.niveis) for a in ajustes]
+
+    @property
+    def dias(self) -> List[int]:
+        """Dias restantes que possuem ao menos uma regra de alerta"""
+        return sorted(self._regras_por_dias)
+
+    def avaliar_alerta(self, ata: Ata, dias_restantes: int) -> Optional[RegraAlerta]:
+        """Retorna a primeira regra aplicável à ata ou None"""
+        candidatas = self._regras_por_dias.get(dias_restantes)
+        if not candidatas:
+            return None
+        valor = None
+        for regra in candidatas:
+            if regra.valor_min is not None or regra.valor_max is not None:
+                if valor is None:
+                    valor = ata.valor_total
+            if regra.aplica(ata, valor):
+                return regra
+        return None
+
+    def avaliar_criticidade(self, dias_restantes: int, valor: float) -> Tuple[str, str]:
+        """Retorna (nível, motivo) para os dias restantes e valor informados"""
+        if dias_restantes < self._dias_inicio:
+            faixa = self._faixa_inicial
+        elif dias_restantes > self._dias_fim:
+            faixa = self._faixa_final
+        else:
+            faixa = self._tabela_faixas[dias_restantes - self._dias_inicio]
+        nivel = faixa.nivel
+
+        # Maior faixa de valor ultrapassada (valor estritamente maior que o limite)
+        posicao = bisect_left(self._limites_valor, valor)
+        if posicao:
+            nivel = self._mapas_valor[posicao - 1].get(nivel, nivel)
+
+        motivo = faixa.motivo.format(dias=dias_restantes, dias_vencida=abs(dias_restantes))
+        return nivel, motivo
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'MotorRegras':
+        """Cria motor a partir de configuração; seções ausentes usam o padrão"""
+        regras = REGRAS_ALERTA_PADRAO
+        faixas = FAIXAS_CRITICIDADE_PADRAO
+        ajustes = AJUSTES_VALOR_PADRAO
+        if "alertas" in config:
+            regras = [RegraAlerta.from_dict(r) for r in config["alertas"]]
+        if "criticidade" in config:
+            faixas = [FaixaCriticidade.from_dict(f) for f in config["criticidade"]]
+        if "ajustes_valor" in config:
+            ajustes = [AjusteValor.from_dict(a) for a in config["ajustes_valor"]]
+        return cls(regras, faixas, ajustes)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'MotorRegras':
+        """Carrega motor de regras de um arquivo JSON"""
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
@@ -1,96 +1,142 @@
+import sqlite3
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Any
+from io import StringIO
+from typing import List, Dict, Any, Optional, Tuple, TextIO
 
 from models.ata import Ata
+from services.alert_rules import MotorRegras, RegraAlerta
+from services.parallel import ProcessadorParalelo
+from services.report_service import AcumuladorRelatorio, renderizar_relatorio
+from utils.db import conectar
 from utils.email_service import EmailService
+from utils.metrics import instrumentado
 
 class AlertService:
     """Serviço para gerenciar alertas automáticos"""
     
-    def __init__(self, email_service: EmailService):
+    def __init__(self, email_service: EmailService, db_file: str,
+                 motor_regras: Optional[MotorRegras] = None, modo_digest: bool = False,
+                 processador: Optional[ProcessadorParalelo] = None):
         self.email_service = email_service
-        self.alert_history = []  # Histórico de alertas enviados
+        self.motor_regras = motor_regras or MotorRegras()
+        # Agrupa os alertas do dia em uma mensagem por destinatários e tipo
+        self.modo_digest = modo_digest
+        # Avaliação de criticidade em vários processos para carteiras grandes
+        self.processador = processador
+        self.db_file = db_file
+        self.conn = conectar(self.db_file)
+        self.conn.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        """Cria a tabela de histórico de alertas se não existir."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS alertas_historico (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    numero_ata TEXT NOT NULL,
+                    tipo_alerta TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    UNIQUE(numero_ata, tipo_alerta, data)
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alertas_historico_data ON alertas_historico(data)"
+            )
     
-    def verificar_alertas_automaticos(self, atas: List[Ata]) -> Dict[str, Any]:
+    def datas_alvo(self, hoje: Optional[date] = None) -> List[date]:
+        """Retorna as datas de vigência que podem disparar alerta no dia de referência"""
+        if hoje is None:
+            hoje = date.today()
+        return [hoje + timedelta(days=dias) for dias in self.motor_regras.dias]
+
+    @instrumentado("alertas.verificar_do_dia", linhas=lambda r: r["alertas_enviados"])
+    def verificar_alertas_do_dia(self, ata_service, hoje: Optional[date] = None) -> Dict[str, Any]:
+        """Busca apenas as atas com vencimento nas datas-alvo e verifica seus alertas"""
+        if hoje is None:
+            hoje = date.today()
+        atas = ata_service.buscar_por_datas_vigencia(self.datas_alvo(hoje))
+        return self.verificar_alertas_automaticos(atas, hoje)
+
+    @instrumentado("alertas.verificar_atas", linhas=lambda r: r["alertas_enviados"])
+    def verificar_alertas_automaticos(self, atas: List[Ata], hoje: Optional[date] = None) -> Dict[str, Any]:
         """Verifica e envia alertas automáticos baseado nas regras de negócio"""
         resultado = {
             "alertas_enviados": 0,
+            "mensagens_enviadas": 0,
             "atas_alertadas": [],
             "erros": []
         }
         
-        hoje = date.today()
+        if hoje is None:
+            hoje = date.today()
         
+        # Alertas disparados hoje
+        disparados: List[Tuple[Ata, RegraAlerta, int]] = []
         for ata in atas:
-            dias_restantes = ata.dias_restantes
+            dias_restantes = (ata.data_vigencia - hoje).days
             
             # Regras de alerta automático
-            deve_alertar = False
-            tipo_alerta = ""
-            
-            # Alerta D-90 (90 dias antes do vencimento)
-            if dias_restantes == 90:
-                deve_alertar = True
-                tipo_alerta = "D-90"
-            
-            # Alerta D-60 (60 dias antes do vencimento)
-            elif dias_restantes == 60:
-                deve_alertar = True
-                tipo_alerta = "D-60"
-            
-            # Alerta D-30 (30 dias antes do vencimento)
-            elif dias_restantes == 30:
-                deve_alertar = True
-                tipo_alerta = "D-30"
-            
-            # Alerta D-15 (15 dias antes do vencimento)
-            elif dias_restantes == 15:
-                deve_alertar = True
-                tipo_alerta = "D-15"
-            
-            # Alerta D-7 (7 dias antes do vencimento)
-            elif dias_restantes == 7:
-                deve_alertar = True
-                tipo_alerta = "D-7"
-            
-            # Alerta D-1 (1 dia antes do vencimento)
-            elif dias_restantes == 1:
-                deve_alertar = True
-                tipo_alerta = "D-1"
+            regra = self.motor_regras.avaliar_alerta(ata, dias_restantes)
+            if regra:
+                disparados.append((ata, regra, dias_restantes))
+        
+        # Reserva no histórico antes de enviar: o que outra instância (GUI ou
+        # daemon no mesmo banco) já reservou hoje não é enviado de novo
+        pendentes = self._reservar_alertas(disparados, hoje)
+        
+        if self.modo_digest:
+            # Uma mensagem por grupo (destinatários, tipo de alerta)
+            grupos: Dict[Tuple[Tuple[str, ...], str], List[Tuple[Ata, RegraAlerta, int]]] = {}
+            for pendente in pendentes:
+                regra = pendente[1]
+                grupos.setdefault((regra.destinatarios, regra.tipo), []).append(pendente)
+            for (destinatarios, tipo_alerta), grupo in grupos.items():
+                self._enviar_grupo(grupo, list(destinatarios) or None, tipo_alerta, hoje, resultado)
+        else:
+            for ata, regra, dias_restantes in pendentes:
+                self._enviar_grupo(
+                    [(ata, regra, dias_restantes)], list(regra.destinatarios) or None, regra.tipo, hoje, resultado
+                )
+        
+        return resultado
+    
+    def _enviar_grupo(self, grupo: List[Tuple[Ata, RegraAlerta, int]], destinatarios: Optional[List[str]],
+                      tipo_alerta: str, hoje: date, resultado: Dict[str, Any]):
+        """Envia uma mensagem para o grupo de atas e registra cada ata no histórico"""
+        atas = [ata for ata, _, _ in grupo]
+        numeros = ", ".join(ata.numero_ata for ata in atas)
+        try:
+            if len(atas) == 1:
+                enviado = self.email_service.enviar_alerta_vencimento(atas[0], destinatarios, hoje=hoje)
+            else:
+                enviado = self.email_service.enviar_alerta_multiplas_atas(
+                    atas, destinatarios, tipo_alerta, hoje=hoje
+                )
             
-            # Alerta de vencimento (no dia do vencimento)
-            elif dias_restantes == 0:
-                deve_alertar = True
-                tipo_alerta = "VENCIMENTO"
+            if not enviado:
+                self._liberar_alertas(atas, tipo_alerta, hoje)
+                resultado["erros"].append(f"Erro ao enviar alerta para ata(s) {numeros}")
+                return
             
-            # Alerta pós-vencimento (atas vencidas)
-            elif dias_restantes < 0 and dias_restantes >= -30:  # Até 30 dias após vencimento
-                deve_alertar = True
-                tipo_alerta = "POS-VENCIMENTO"
+            resultado["mensagens_enviadas"] += 1
+            for ata, _, dias_restantes in grupo:
+                resultado["alertas_enviados"] += 1
+                resultado["atas_alertadas"].append({
+                    "numero_ata": ata.numero_ata,
+                    "tipo_alerta": tipo_alerta,
+                    "dias_restantes": dias_restantes
+                })
             
-            if deve_alertar:
-                # Verifica se já foi enviado alerta para esta ata hoje
-                if not self._ja_alertado_hoje(ata.numero_ata, tipo_alerta):
-                    try:
-                        if self.email_service.enviar_alerta_vencimento(ata):
-                            resultado["alertas_enviados"] += 1
-                            resultado["atas_alertadas"].append({
-                                "numero_ata": ata.numero_ata,
-                                "tipo_alerta": tipo_alerta,
-                                "dias_restantes": dias_restantes
-                            })
-                            
-                            # Registra no histórico
-                            self._registrar_alerta(ata.numero_ata, tipo_alerta)
-                            
-                            print(f"✅ Alerta {tipo_alerta} enviado para ata {ata.numero_ata}")
-                        else:
-                            resultado["erros"].append(f"Erro ao enviar alerta para ata {ata.numero_ata}")
-                    except Exception as e:
-                        resultado["erros"].append(f"Erro ao processar ata {ata.numero_ata}: {str(e)}")
-        
-        return resultado
+            print(f"✅ Alerta {tipo_alerta} enviado para ata(s) {numeros}")
+        except Exception as e:
+            self._liberar_alertas(atas, tipo_alerta, hoje)
+            resultado["erros"].append(f"Erro ao processar ata(s) {numeros}: {str(e)}")
     
+    @instrumentado("alertas.relatorio_semanal")
     def enviar_relatorio_semanal(self, atas: List[Ata]) -> bool:
         """Envia relatório semanal das atas"""
         try:
@@ -107,87 +153,50 @@ class AlertService:
             print(f"Erro ao enviar relatório semanal: {e}")
             return False
     
-    def enviar_relatorio_mensal(self, atas: List[Ata]) -> bool:
-        """Envia relatório mensal detalhado"""
+    @instrumentado("alertas.relatorio_mensal")
+    def enviar_relatorio_mensal(self, atas: Optional[List[Ata]] = None,
+                                contexto: Optional[Dict[str, Any]] = None) -> bool:
+        """Envia relatório mensal detalhado (das atas ou de um contexto já calculado)"""
         try:
-            print(f"\n{'='*60}")
-            print("RELATÓRIO MENSAL - ATAS DE REGISTRO DE PREÇOS")
-            print(f"{'='*60}")
-            print(f"Período: {date.today().strftime('%B/%Y')}")
-            print(f"Data de Geração: {date.today().strftime('%d/%m/%Y')}")
-            
-            # Estatísticas gerais
-            stats = self._calcular_estatisticas(atas)
-            total_atas = sum(stats.values())
-            total_valor = sum(ata.valor_total for ata in atas)
-            
-            print(f"\n📊 RESUMO EXECUTIVO:")
-            print(f"- Total de Atas: {total_atas}")
-            print(f"- Valor Total: R$ {total_valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-            print(f"- Vigentes: {stats['vigente']} ({(stats['vigente']/total_atas*100):.1f}%)" if total_atas > 0 else "- Vigentes: 0")
-            print(f"- A Vencer: {stats['a_vencer']} ({(stats['a_vencer']/total_atas*100):.1f}%)" if total_atas > 0 else "- A Vencer: 0")
-            print(f"- Vencidas: {stats['vencida']} ({(stats['vencida']/total_atas*100):.1f}%)" if total_atas > 0 else "- Vencidas: 0")
-            
-            # Atas por fornecedor
-            fornecedores = {}
-            for ata in atas:
-                if ata.fornecedor not in fornecedores:
-                    fornecedores[ata.fornecedor] = {"count": 0, "valor": 0}
-                fornecedores[ata.fornecedor]["count"] += 1
-                fornecedores[ata.fornecedor]["valor"] += ata.valor_total
-            
-            print(f"\n🏢 ATAS POR FORNECEDOR:")
-            for fornecedor, data in sorted(fornecedores.items(), key=lambda x: x[1]["valor"], reverse=True):
-                valor_formatado = f"R$ {data['valor']:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-                print(f"- {fornecedor}: {data['count']} ata(s) - {valor_formatado}")
-            
-            # Vencimentos próximos
-            atas_proximas = [ata for ata in atas if 0 <= ata.dias_restantes <= 90]
-            if atas_proximas:
-                print(f"\n⚠️ ATAS PRÓXIMAS DO VENCIMENTO:")
-                for ata in sorted(atas_proximas, key=lambda x: x.dias_restantes):
-                    print(f"- {ata.numero_ata}: {ata.objeto} (vence em {ata.dias_restantes} dias)")
-            
-            # Atas vencidas
-            atas_vencidas = [ata for ata in atas if ata.dias_restantes < 0]
-            if atas_vencidas:
-                print(f"\n❌ ATAS VENCIDAS:")
-                for ata in sorted(atas_vencidas, key=lambda x: x.dias_restantes):
-                    dias_vencida = abs(ata.dias_restantes)
-                    print(f"- {ata.numero_ata}: {ata.objeto} (vencida há {dias_vencida} dias)")
-            
-            print(f"\n📈 ANÁLISE DE TENDÊNCIAS:")
-            # Análise simples de tendências
-            atas_este_ano = [ata for ata in atas if ata.data_vigencia.year == date.today().year]
-            atas_proximo_ano = [ata for ata in atas if ata.data_vigencia.year == date.today().year + 1]
-            
-            print(f"- Atas vencendo este ano: {len(atas_este_ano)}")
-            print(f"- Atas vencendo próximo ano: {len(atas_proximo_ano)}")
-            
-            if len(atas_este_ano) > len(atas_proximo_ano):
-                print("- Tendência: Concentração de vencimentos este ano - atenção redobrada necessária")
-            elif len(atas_proximo_ano) > len(atas_este_ano):
-                print("- Tendência: Distribuição equilibrada de vencimentos")
-            
-            print(f"\n💡 RECOMENDAÇÕES:")
-            if stats["a_vencer"] > 0:
-                print("- Iniciar processos de renovação para atas próximas do vencimento")
-            if stats["vencida"] > 0:
-                print("- Regularizar situação das atas vencidas")
-            if total_atas < 5:
-                print("- Considerar ampliação do portfólio de atas")
-            
-            print(f"\nRelatório gerado automaticamente pelo Sistema de Atas de Registro de Preços")
-            print(f"{'='*60}\n")
-            
-            return True
+            texto = StringIO()
+            html = StringIO()
+            if contexto is None:
+                contexto = self._contexto_relatorio_mensal(atas or [])
+            self.renderizar_relatorio_mensal(atas, texto, contexto=contexto)
+            self.renderizar_relatorio_mensal(atas, html, formato="html", contexto=contexto)
+            return self.email_service.enviar_relatorio_mensal(texto.getvalue(), html.getvalue())
             
         except Exception as e:
             print(f"Erro ao gerar relatório mensal: {e}")
             return False
     
+    def renderizar_relatorio_mensal(self, atas: List[Ata], stream: TextIO, formato: str = "texto",
+                                    hoje: Optional[date] = None,
+                                    contexto: Optional[Dict[str, Any]] = None):
+        """Renderiza o relatório mensal (texto ou HTML) no stream informado"""
+        if contexto is None:
+            contexto = self._contexto_relatorio_mensal(atas, hoje)
+        renderizar_relatorio(contexto, stream, formato)
+    
+    def _contexto_relatorio_mensal(self, atas: List[Ata], hoje: Optional[date] = None) -> Dict[str, Any]:
+        """Calcula os dados do relatório mensal em uma única passada"""
+        acumulador = AcumuladorRelatorio(hoje)
+        acumulador.adicionar_lote(atas)
+        return acumulador.contexto()
+    
+    @instrumentado("alertas.atas_criticas", linhas=len)
     def verificar_atas_criticas(self, atas: List[Ata]) -> List[Dict[str, Any]]:
         """Identifica atas que requerem atenção imediata"""
+        if self.processador is not None:
+            return [
+                {
+                    "ata": atas[indice],
+                    "criticidade": {"nivel": nivel, "motivo": motivo, "dias_restantes": dias, "valor": valor},
+                }
+                for indice, nivel, motivo, dias, valor
+                in self.processador.avaliar_criticidade(atas, self.motor_regras)
+            ]
+        
         atas_criticas = []
         
         for ata in atas:
@@ -212,32 +221,8 @@ class AlertService:
         dias_restantes = ata.dias_restantes
         valor = ata.valor_total
         
-        # Critérios de criticidade
-        if dias_restantes < 0:
-            nivel = "CRÍTICA"
-            motivo = f"Ata vencida há {abs(dias_restantes)} dias"
-        elif dias_restantes <= 7:
-            nivel = "CRÍTICA"
-            motivo = f"Vencimento em {dias_restantes} dias"
-        elif dias_restantes <= 15:
-            nivel = "ALTA"
-            motivo = f"Vencimento em {dias_restantes} dias"
-        elif dias_restantes <= 30:
-            nivel = "MÉDIA"
-            motivo = f"Vencimento em {dias_restantes} dias"
-        elif dias_restantes <= 60:
-            nivel = "BAIXA"
-            motivo = f"Vencimento em {dias_restantes} dias"
-        else:
-            nivel = "NORMAL"
-            motivo = "Ata vigente"
-        
-        # Ajusta criticidade baseado no valor
-        if valor > 1000000:  # Atas acima de 1 milhão
-            if nivel == "MÉDIA":
-                nivel = "ALTA"
-            elif nivel == "BAIXA":
-                nivel = "MÉDIA"
+        # Critérios de criticidade (faixas de dias e ajuste por valor)
+        nivel, motivo = self.motor_regras.avaliar_criticidade(dias_restantes, valor)
         
         return {
             "nivel": nivel,
@@ -246,42 +231,84 @@ class AlertService:
             "valor": valor
         }
     
-    def _ja_alertado_hoje(self, numero_ata: str, tipo_alerta: str) -> bool:
+    def _ja_alertado_hoje(self, numero_ata: str, tipo_alerta: str, hoje: Optional[date] = None) -> bool:
         """Verifica se já foi enviado alerta para esta ata hoje"""
-        hoje = date.today()
-        for registro in self.alert_history:
-            if (registro["numero_ata"] == numero_ata and 
-                registro["tipo_alerta"] == tipo_alerta and 
-                registro["data"] == hoje):
-                return True
-        return False
+        if hoje is None:
+            hoje = date.today()
+        row = self.conn.execute(
+            "SELECT 1 FROM alertas_historico WHERE numero_ata=? AND tipo_alerta=? AND data=?",
+            (numero_ata, tipo_alerta, hoje.isoformat()),
+        ).fetchone()
+        return row is not None
     
-    def _registrar_alerta(self, numero_ata: str, tipo_alerta: str):
-        """Registra alerta no histórico"""
-        self.alert_history.append({
-            "numero_ata": numero_ata,
-            "tipo_alerta": tipo_alerta,
-            "data": date.today(),
-            "timestamp": datetime.now()
-        })
-        
-        # Limita histórico a 1000 registros
-        if len(self.alert_history) > 1000:
-            self.alert_history = self.alert_history[-1000:]
+    def _registrar_alerta(self, numero_ata: str, tipo_alerta: str, hoje: Optional[date] = None) -> bool:
+        """Registra alerta no histórico; False se já havia registro no dia"""
+        agora = datetime.now()
+        if hoje is None:
+            hoje = agora.date()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO alertas_historico (numero_ata, tipo_alerta, data, timestamp) "
+                "VALUES (?, ?, ?, ?)",
+                (numero_ata, tipo_alerta, hoje.isoformat(), agora.isoformat()),
+            )
+        return cur.rowcount == 1
+
+    def _reservar_alertas(self, disparados: List[Tuple[Ata, RegraAlerta, int]],
+                          hoje: date) -> List[Tuple[Ata, RegraAlerta, int]]:
+        """Registra os alertas numa transação e retorna só os que esta chamada reservou.
+
+        O índice único (ata, tipo, data) decide entre instâncias concorrentes:
+        quem insere a linha envia o alerta; as demais o ignoram.
+        """
+        agora = datetime.now().isoformat()
+        reservados = []
+        with self.conn:
+            for pendente in disparados:
+                ata, regra = pendente[0], pendente[1]
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO alertas_historico (numero_ata, tipo_alerta, data, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (ata.numero_ata, regra.tipo, hoje.isoformat(), agora),
+                )
+                if cur.rowcount == 1:
+                    reservados.append(pendente)
+        return reservados
+
+    def _liberar_alertas(self, atas: List[Ata], tipo_alerta: str, hoje: date):
+        """Desfaz a reserva de alertas não enviados para que a próxima verificação os tente"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM alertas_historico WHERE numero_ata=? AND tipo_alerta=? AND data=?",
+                [(ata.numero_ata, tipo_alerta, hoje.isoformat()) for ata in atas],
+            )
     
     def get_historico_alertas(self, dias: int = 30) -> List[Dict[str, Any]]:
         """Retorna histórico de alertas dos últimos N dias"""
         data_limite = date.today() - timedelta(days=dias)
+        rows = self.conn.execute(
+            "SELECT numero_ata, tipo_alerta, data, timestamp FROM alertas_historico "
+            "WHERE data >= ? ORDER BY data, id",
+            (data_limite.isoformat(),),
+        ).fetchall()
         return [
-            registro for registro in self.alert_history 
-            if registro["data"] >= data_limite
+            {
+                "numero_ata": r["numero_ata"],
+                "tipo_alerta": r["tipo_alerta"],
+                "data": date.fromisoformat(r["data"]),
+                "timestamp": datetime.fromisoformat(r["timestamp"]),
+            }
+            for r in rows
         ]
     
     def limpar_historico_antigo(self, dias: int = 90):
         """Remove registros de alerta mais antigos que N dias"""
         data_limite = date.today() - timedelta(days=dias)
-        self.alert_history = [
-            registro for registro in self.alert_history 
-            if registro["data"] >= data_limite
-        ]
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM alertas_historico WHERE data < ?", (data_limite.isoformat(),)
+            )
 
+    def close(self):
+        if self.conn:
+            self.conn.close()
@@ -1,37 +1,63 @@
 import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from datetime import date, datetime
 
 from models.ata import Ata, Item
+from services.events import EventBus, EventoDados, ATA_CRIADA, ATA_ATUALIZADA, ATA_EXCLUIDA
+from services.parallel import AtaCompacta, compactar
+from utils.json_codec import CodecAtas, obter_codec
+from utils.metrics import instrumentado
 
 class AtaService:
     """Serviço para gerenciar operações CRUD das atas"""
     
-    def __init__(self, data_file: str = "atas.json"):
+    def __init__(self, data_file: str = "atas.json", eventos: Optional[EventBus] = None,
+                 codec: Optional[CodecAtas] = None, dados_exemplo: bool = True):
         self.data_file = data_file
+        # Sem arquivo, começa com as atas de exemplo (ou vazio, ex.: destino de uma importação)
+        self.dados_exemplo = dados_exemplo
+        # Leitura/gravação do arquivo (msgspec/orjson quando instalados, senão json)
+        self.codec = codec or obter_codec()
+        # Barramento onde são publicadas as mudanças (criada/atualizada/excluída)
+        self.eventos = eventos or EventBus()
         self.atas: List[Ata] = []
+        self._indice_vigencia: Optional[Dict[date, List[Ata]]] = None
+        # Versão dos dados, incrementada a cada carga ou gravação
+        self.versao_dados = 0
         self.load_data()
     
+    @instrumentado("json.load_data")
     def load_data(self):
         """Carrega dados do arquivo JSON"""
+        self._indice_vigencia = None
+        self.versao_dados += 1
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.atas = [Ata.from_dict(ata_data) for ata_data in data]
+                with open(self.data_file, 'rb') as f:
+                    # Arquivo gravado por save_data: atas já validadas
+                    self.atas = self.codec.decodificar(f.read())
             except (json.JSONDecodeError, KeyError, ValueError) as e:
                 print(f"Erro ao carregar dados: {e}")
-                self.load_mock_data()
+                self._carregar_iniciais()
         else:
+            self._carregar_iniciais()
+
+    def _carregar_iniciais(self):
+        if self.dados_exemplo:
             self.load_mock_data()
+        else:
+            self.atas = []
     
+    @instrumentado("json.save_data")
     def save_data(self):
         """Salva dados no arquivo JSON"""
+        self._indice_vigencia = None
+        self.versao_dados += 1
         try:
-            data = [ata.to_dict() for ata in self.atas]
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            conteudo = self.codec.codificar(self.atas)
+            with open(self.data_file, 'wb') as f:
+                f.write(conteudo)
         except Exception as e:
             print(f"Erro ao salvar dados: {e}")
     
@@ -84,6 +110,7 @@ class AtaService:
             print(f"Erro ao carregar dados mockados: {e}")
             self.atas = []
     
+    @instrumentado("json.criar_ata")
     def criar_ata(self, ata_data: Dict[str, Any]) -> Ata:
         """Cria uma nova ata"""
         # Verifica se já existe ata com o mesmo número
@@ -93,8 +120,51 @@ class AtaService:
         ata = Ata.from_dict(ata_data)
         self.atas.append(ata)
         self.save_data()
+        self._notificar(ATA_CRIADA, ata.numero_ata)
         return ata
     
+    @instrumentado("json.importar_atas", linhas=lambda r: r["importadas"] + r["substituidas"])
+    def importar_atas(self, atas_data: Iterable[Dict[str, Any]], substituir: bool = False) -> Dict[str, Any]:
+        """Importa atas em lote com uma única gravação do arquivo.
+        
+        Mesmas regras de ``SQLiteAtaService.importar_atas``: existentes são
+        ignoradas (ou substituídas com ``substituir=True``) e registros inválidos
+        vão para ``erros``.
+        """
+        resultado: Dict[str, Any] = {"importadas": 0, "substituidas": 0, "ignoradas": 0, "erros": []}
+        posicoes = {ata.numero_ata: i for i, ata in enumerate(self.atas)}
+        existentes = set(posicoes)
+        eventos = []
+        for posicao, ata_data in enumerate(atas_data, 1):
+            try:
+                ata = Ata.from_dict(ata_data)
+            except KeyError as e:
+                resultado["erros"].append(f"Registro {posicao}: campo obrigatório ausente {e}")
+                continue
+            except (ValueError, TypeError) as e:
+                resultado["erros"].append(f"Registro {posicao}: {e}")
+                continue
+            numero = ata.numero_ata
+            if numero in posicoes and (numero not in existentes or not substituir):
+                resultado["ignoradas"] += 1
+                continue
+            if numero in posicoes:
+                self.atas[posicoes[numero]] = ata
+                existentes.discard(numero)
+                resultado["substituidas"] += 1
+                eventos.append((ATA_ATUALIZADA, numero))
+            else:
+                posicoes[numero] = len(self.atas)
+                self.atas.append(ata)
+                resultado["importadas"] += 1
+                eventos.append((ATA_CRIADA, numero))
+        if eventos:
+            self.save_data()
+        for tipo, numero in eventos:
+            self._notificar(tipo, numero)
+        return resultado
+    
+    @instrumentado("json.editar_ata")
     def editar_ata(self, numero_ata: str, ata_data: Dict[str, Any]) -> Optional[Ata]:
         """Edita uma ata existente"""
         ata = self.buscar_por_numero(numero_ata)
@@ -108,8 +178,14 @@ class AtaService:
         ata_atualizada = Ata.from_dict(ata_data)
         self.atas.append(ata_atualizada)
         self.save_data()
+        if ata_atualizada.numero_ata == numero_ata:
+            self._notificar(ATA_ATUALIZADA, numero_ata)
+        else:
+            self._notificar(ATA_EXCLUIDA, numero_ata)
+            self._notificar(ATA_CRIADA, ata_atualizada.numero_ata)
         return ata_atualizada
     
+    @instrumentado("json.excluir_ata")
     def excluir_ata(self, numero_ata: str) -> bool:
         """Exclui uma ata"""
         ata = self.buscar_por_numero(numero_ata)
@@ -118,8 +194,14 @@ class AtaService:
         
         self.atas.remove(ata)
         self.save_data()
+        self._notificar(ATA_EXCLUIDA, numero_ata)
         return True
     
+    def _notificar(self, tipo: str, numero_ata: str):
+        """Publica a mudança com a versão atual dos dados"""
+        self.eventos.publicar(EventoDados(tipo, numero_ata, self.versao_dados))
+    
+    @instrumentado("json.buscar_por_numero")
     def buscar_por_numero(self, numero_ata: str) -> Optional[Ata]:
         """Busca uma ata pelo número"""
         for ata in self.atas:
@@ -127,14 +209,31 @@ class AtaService:
                 return ata
         return None
     
+    @instrumentado("json.listar_todas", linhas=len)
     def listar_todas(self) -> List[Ata]:
         """Lista todas as atas"""
         return self.atas.copy()
     
+    @instrumentado("json.listar_resumos", linhas=len)
+    def listar_resumos(self) -> List[Ata]:
+        """Atas para listas (já estão em memória: a própria ata serve de resumo)"""
+        return self.listar_todas()
+    
+    def iterar_em_lotes(self, tamanho: int = 500) -> Iterator[List[Ata]]:
+        """Percorre todas as atas em lotes"""
+        for inicio in range(0, len(self.atas), tamanho):
+            yield self.atas[inicio:inicio + tamanho]
+    
+    def iterar_compactas(self, tamanho: int = 2000) -> Iterator[List[AtaCompacta]]:
+        """Percorre as atas em lotes compactos (serializáveis para outros processos)"""
+        for lote in self.iterar_em_lotes(tamanho):
+            yield compactar(lote)
+    
     def filtrar_por_status(self, status: str) -> List[Ata]:
         """Filtra atas por status"""
         return [ata for ata in self.atas if ata.status == status]
     
+    @instrumentado("json.buscar_por_texto", linhas=len)
     def buscar_por_texto(self, texto: str) -> List[Ata]:
         """Busca atas por texto (número, objeto, fornecedor)"""
         texto = texto.lower()
@@ -149,6 +248,24 @@ class AtaService:
         
         return resultado
     
+    def _get_indice_vigencia(self) -> Dict[date, List[Ata]]:
+        """Retorna índice data de vigência -> atas, reconstruído após alterações"""
+        if self._indice_vigencia is None:
+            indice: Dict[date, List[Ata]] = {}
+            for ata in self.atas:
+                indice.setdefault(ata.data_vigencia, []).append(ata)
+            self._indice_vigencia = indice
+        return self._indice_vigencia
+    
+    @instrumentado("json.buscar_por_datas_vigencia", linhas=len)
+    def buscar_por_datas_vigencia(self, datas: Iterable[date]) -> List[Ata]:
+        """Busca atas cuja data de vigência está entre as datas informadas"""
+        indice = self._get_indice_vigencia()
+        resultado = []
+        for data in set(datas):
+            resultado.extend(indice.get(data, []))
+        return resultado
+    
     def get_estatisticas(self) -> Dict[str, int]:
         """Retorna estatísticas das atas por status"""
         stats = {"vigente": 0, "a_vencer": 0, "vencida": 0}
@@ -156,6 +273,7 @@ class AtaService:
             stats[ata.status] += 1
         return stats
     
+    @instrumentado("json.get_atas_vencimento_proximo", linhas=len)
     def get_atas_vencimento_proximo(self, dias: int = 90) -> List[Ata]:
         """Retorna atas próximas do vencimento"""
         resultado = []
@@ -167,6 +285,21 @@ class AtaService:
         resultado.sort(key=lambda x: x.dias_restantes)
         return resultado
     
+    @instrumentado("json.get_resumo_painel")
+    def get_resumo_painel(self) -> Dict[str, Any]:
+        """Agregados do dashboard (estatísticas, valor total, vencimentos)"""
+        ano = date.today().year
+        vencimentos_mes = {mes: 0 for mes in range(1, 13)}
+        for ata in self.atas:
+            if ata.data_vigencia.year == ano:
+                vencimentos_mes[ata.data_vigencia.month] += 1
+        return {
+            "estatisticas": self.get_estatisticas(),
+            "valor_total": sum(ata.valor_total for ata in self.atas),
+            "vencendo": len(self.get_atas_vencimento_proximo()),
+            "vencimentos_mes": vencimentos_mes,
+        }
+    
     def validar_numero_ata_unico(self, numero_ata: str, excluir_numero: str = None) -> bool:
         """Valida se o número da ata é único"""
         for ata in self.atas:
@@ -0,0 +1,119 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Iterable, FrozenSet
+
+# Tipos de evento publicados pelos serviços de atas
+ATA_CRIADA = "criada"
+ATA_ATUALIZADA = "atualizada"
+ATA_EXCLUIDA = "excluida"
+
+@dataclass(frozen=True)
+class EventoDados:
+    """Mudança em uma ata, com a versão dos dados resultante"""
+    tipo: str
+    numero_ata: str
+    versao: int
+    timestamp: float = field(default_factory=time.time)
+
+Callback = Callable[[List[EventoDados]], None]
+
+class _Assinatura:
+    """Assinante do barramento; agrupa rajadas de eventos quando ``janela`` > 0"""
+
+    def __init__(self, callback: Callback, janela: float, tipos: Optional[FrozenSet[str]]):
+        self.callback = callback
+        self.janela = janela
+        self.tipos = tipos
+        self.ativa = True
+        self._lock = threading.Lock()
+        self._pendentes: List[EventoDados] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def receber(self, evento: EventoDados):
+        if self.tipos is not None and evento.tipo not in self.tipos:
+            return
+        if self.janela <= 0:
+            self._entregar([evento])
+            return
+        with self._lock:
+            self._pendentes.append(evento)
+            if self._timer is None:
+                self._timer = threading.Timer(self.janela, self.descarregar)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def descarregar(self):
+        """Entrega imediatamente os eventos acumulados"""
+        with self._lock:
+            eventos, self._pendentes = self._pendentes, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if eventos:
+            self._entregar(eventos)
+
+    def cancelar(self):
+        self.ativa = False
+        with self._lock:
+            self._pendentes = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _entregar(self, eventos: List[EventoDados]):
+        if not self.ativa:
+            return
+        try:
+            self.callback(eventos)
+        except Exception as e:
+            print(f"Erro ao processar eventos de dados: {e}")
+
+class EventBus:
+    """Barramento pub/sub em processo para mudanças de dados.
+
+    Os assinantes recebem listas de eventos: uma por evento, ou, com
+    ``janela`` > 0, um único lote com tudo o que chegou nesse intervalo
+    (ex.: uma importação em massa vira uma única atualização da interface).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._assinaturas: List[_Assinatura] = []
+        self.versao = 0
+
+    def assinar(self, callback: Callback, janela: float = 0.0,
+                tipos: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """Registra um assinante e retorna a função que cancela a assinatura"""
+        assinatura = _Assinatura(callback, janela, frozenset(tipos) if tipos is not None else None)
+        with self._lock:
+            self._assinaturas.append(assinatura)
+
+        def cancelar():
+            assinatura.cancelar()
+            with self._lock:
+                if assinatura in self._assinaturas:
+                    self._assinaturas.remove(assinatura)
+
+        return cancelar
+
+    def publicar(self, evento: EventoDados):
+        """Entrega o evento a todos os assinantes"""
+        with self._lock:
+            self.versao = max(self.versao, evento.versao)
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            assinatura.receber(evento)
+
+    def descarregar(self):
+        """Entrega já os lotes pendentes de todos os assinantes"""
+        with self._lock:
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            assinatura.descarregar()
+
+    def close(self):
+        with self._lock:
+            assinaturas, self._assinaturas = self._assinaturas, []
+        for assinatura in assinaturas:
+            assinatura.cancelar()
@@ -0,0 +1,145 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from datetime import date
+from typing import List, Optional, Iterable, Sequence, Tuple, NamedTuple, Deque
+
+from models.ata import Ata
+from services.alert_rules import MotorRegras
+from services.report_service import AcumuladorRelatorio
+
+class AtaCompacta(NamedTuple):
+    """Representação enxuta e serializável de uma ata para os workers.
+
+    Expõe os mesmos atributos lidos pelo ``AcumuladorRelatorio`` e pela
+    avaliação de criticidade, com o valor total já calculado.
+    """
+    numero_ata: str
+    data_vigencia: date
+    fornecedor: str
+    objeto: str
+    valor_total: float
+
+    @classmethod
+    def de_ata(cls, ata: Ata) -> 'AtaCompacta':
+        return cls(ata.numero_ata, ata.data_vigencia, ata.fornecedor, ata.objeto, ata.valor_total)
+
+def compactar(atas: Iterable[Ata]) -> List[AtaCompacta]:
+    """Converte atas para a representação compacta (mantém as já compactas)"""
+    return [ata if isinstance(ata, AtaCompacta) else AtaCompacta.de_ata(ata) for ata in atas]
+
+# Funções executadas nos processos filhos (precisam ser de nível de módulo)
+def _acumular_lote(atas: Sequence[AtaCompacta], hoje: date) -> AcumuladorRelatorio:
+    acumulador = AcumuladorRelatorio(hoje)
+    acumulador.adicionar_lote(atas)
+    return acumulador
+
+def _avaliar_lote(atas: Sequence[AtaCompacta], motor: MotorRegras, hoje: date, inicio: int,
+                  niveis: Tuple[str, ...]) -> List[Tuple[int, str, str, int, float]]:
+    criticas = []
+    avaliar = motor.avaliar_criticidade
+    for indice, ata in enumerate(atas, inicio):
+        dias = (ata.data_vigencia - hoje).days
+        nivel, motivo = avaliar(dias, ata.valor_total)
+        if nivel in niveis:
+            criticas.append((indice, nivel, motivo, dias, ata.valor_total))
+    return criticas
+
+class ProcessadorParalelo:
+    """Divide as atas em lotes e processa cada lote em um ``ProcessPoolExecutor``.
+
+    Abaixo de ``limiar`` atas o processamento é feito no próprio processo,
+    onde o custo de serialização superaria o ganho.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, tamanho_lote: int = 2000, limiar: int = 20000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tamanho_lote = tamanho_lote
+        self.limiar = limiar
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _usar_pool(self, quantidade: int) -> bool:
+        return self.max_workers > 1 and quantidade >= self.limiar
+
+    def _particionar(self, atas: Sequence) -> List[Tuple[int, List[AtaCompacta]]]:
+        return [
+            (inicio, compactar(atas[inicio:inicio + self.tamanho_lote]))
+            for inicio in range(0, len(atas), self.tamanho_lote)
+        ]
+
+    def acumular_relatorio(self, atas: Sequence, hoje: Optional[date] = None) -> AcumuladorRelatorio:
+        """Calcula as seções do relatório em paralelo e mescla os agregados"""
+        hoje = hoje or date.today()
+        if not self._usar_pool(len(atas)):
+            return _acumular_lote(atas, hoje)
+        return self.acumular_lotes((lote for _, lote in self._particionar(atas)), hoje)
+
+    def acumular_lotes(self, lotes: Iterable[Sequence], hoje: Optional[date] = None) -> AcumuladorRelatorio:
+        """Versão em fluxo: envia cada lote ao pool à medida que é lido.
+
+        Mantém no máximo dois lotes por worker em andamento para limitar a memória.
+        Se o fluxo terminar antes de ``limiar`` atas, tudo é processado localmente.
+        """
+        hoje = hoje or date.today()
+        resultado = AcumuladorRelatorio(hoje)
+        lotes = iter(lotes)
+        iniciais, quantidade = [], 0
+        for lote in lotes:
+            iniciais.append(lote)
+            quantidade += len(lote)
+            if self._usar_pool(quantidade):
+                break
+        else:
+            for lote in iniciais:
+                resultado.adicionar_lote(lote)
+            return resultado
+
+        pendentes: Deque[Future] = deque()
+        executor = self._executor()
+        for lote in itertools.chain(iniciais, lotes):
+            pendentes.append(executor.submit(_acumular_lote, compactar(lote), hoje))
+            if len(pendentes) >= 2 * self.max_workers:
+                resultado.mesclar(pendentes.popleft().result())
+        while pendentes:
+            resultado.mesclar(pendentes.popleft().result())
+        return resultado
+
+    def avaliar_criticidade(self, atas: Sequence, motor: MotorRegras, hoje: Optional[date] = None,
+                            niveis: Tuple[str, ...] = ("ALTA", "CRÍTICA")
+                            ) -> List[Tuple[int, str, str, int, float]]:
+        """Retorna (índice, nível, motivo, dias, valor) das atas nos níveis informados"""
+        hoje = hoje or date.today()
+        if not self._usar_pool(len(atas)):
+            return _avaliar_lote(compactar(atas), motor, hoje, 0, niveis)
+        executor = self._executor()
+        futuros = [
+            executor.submit(_avaliar_lote, lote, motor, hoje, inicio, niveis)
+            for inicio, lote in self._particionar(atas)
+        ]
+        criticas = []
+        for futuro in futuros:
+            criticas.extend(futuro.result())
+        return criticas
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def criar_processador(workers: Optional[int] = None) -> Optional[ProcessadorParalelo]:
+    """Processador para alertas e relatórios, ou None para processamento serial.
+
+    ``workers`` ausente usa ``ATA_REGIS_WORKERS``; 0 ou 1 mantém tudo no
+    próprio processo.
+    """
+    if workers is None:
+        workers = int(os.environ.get("ATA_REGIS_WORKERS", "0") or 0)
+    if workers <= 1:
+        return None
+    return ProcessadorParalelo(max_workers=workers)
@@ -0,0 +1,406 @@
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from io import StringIO
+from typing import List, Dict, Any, Optional, Iterable, TextIO, Tuple
+
+from models.ata import Ata
+from utils import templates
+from utils.db import conectar
+from utils.metrics import instrumentado
+from utils.validators import Formatters
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+FORMATOS_RELATORIO = ("html", "csv", "pdf", "texto")
+
+_EXTENSOES = {"html": "html", "csv": "csv", "pdf": "pdf", "texto": "txt"}
+
+_COLUNAS_CSV = [
+    "numero_ata", "documento_sei", "fornecedor", "objeto",
+    "data_vigencia", "dias_restantes", "status", "valor_total",
+]
+
+class AcumuladorRelatorio:
+    """Calcula todas as seções do relatório em uma única passada pelas atas.
+
+    Guarda apenas contadores e tuplas pequenas por ata listada, de modo que a
+    memória não depende do tamanho dos lotes já processados.
+    """
+
+    def __init__(self, hoje: Optional[date] = None, dias_proximas: int = 90, meses_tendencia: int = 12):
+        self.hoje = hoje or date.today()
+        self.dias_proximas = dias_proximas
+        self.meses_tendencia = meses_tendencia
+        self.stats = {"vigente": 0, "a_vencer": 0, "vencida": 0}
+        self.total_valor = 0.0
+        # fornecedor -> [quantidade, valor]
+        self.fornecedores: Dict[str, List[float]] = {}
+        # (data_vigencia, numero_ata, objeto)
+        self.proximas: List[Tuple[date, str, str]] = []
+        self.vencidas: List[Tuple[date, str, str]] = []
+        self.vencendo_este_ano = 0
+        self.vencendo_proximo_ano = 0
+        # (ano, mês) -> [quantidade, valor], apenas para os próximos meses
+        self.por_mes: Dict[Tuple[int, int], List[float]] = {}
+        self._mes_inicial = self.hoje.year * 12 + self.hoje.month - 1
+
+    def adicionar(self, ata: Ata) -> Tuple[str, int, float]:
+        """Contabiliza a ata em todas as seções; retorna (status, dias restantes, valor)"""
+        vigencia = ata.data_vigencia
+        dias = (vigencia - self.hoje).days
+        valor = ata.valor_total
+
+        if dias < 0:
+            status = "vencida"
+            self.vencidas.append((vigencia, ata.numero_ata, ata.objeto))
+        elif dias <= 90:
+            status = "a_vencer"
+        else:
+            status = "vigente"
+        if 0 <= dias <= self.dias_proximas:
+            self.proximas.append((vigencia, ata.numero_ata, ata.objeto))
+        self.stats[status] += 1
+        self.total_valor += valor
+
+        fornecedor = self.fornecedores.get(ata.fornecedor)
+        if fornecedor is None:
+            self.fornecedores[ata.fornecedor] = [1, valor]
+        else:
+            fornecedor[0] += 1
+            fornecedor[1] += valor
+
+        if vigencia.year == self.hoje.year:
+            self.vencendo_este_ano += 1
+        elif vigencia.year == self.hoje.year + 1:
+            self.vencendo_proximo_ano += 1
+
+        if dias >= 0 and vigencia.year * 12 + vigencia.month - 1 - self._mes_inicial < self.meses_tendencia:
+            mes = self.por_mes.setdefault((vigencia.year, vigencia.month), [0, 0.0])
+            mes[0] += 1
+            mes[1] += valor
+
+        return status, dias, valor
+
+    def adicionar_lote(self, atas: Iterable[Ata]):
+        """Contabiliza um lote de atas"""
+        for ata in atas:
+            self.adicionar(ata)
+
+    def mesclar(self, outro: 'AcumuladorRelatorio'):
+        """Incorpora os agregados de outro acumulador (mesma data de referência)"""
+        for status, quantidade in outro.stats.items():
+            self.stats[status] += quantidade
+        self.total_valor += outro.total_valor
+        for nome, (quantidade, valor) in outro.fornecedores.items():
+            fornecedor = self.fornecedores.get(nome)
+            if fornecedor is None:
+                self.fornecedores[nome] = [quantidade, valor]
+            else:
+                fornecedor[0] += quantidade
+                fornecedor[1] += valor
+        self.proximas.extend(outro.proximas)
+        self.vencidas.extend(outro.vencidas)
+        self.vencendo_este_ano += outro.vencendo_este_ano
+        self.vencendo_proximo_ano += outro.vencendo_proximo_ano
+        for chave, (quantidade, valor) in outro.por_mes.items():
+            mes = self.por_mes.setdefault(chave, [0, 0.0])
+            mes[0] += quantidade
+            mes[1] += valor
+
+    @property
+    def total(self) -> int:
+        return self.stats["vigente"] + self.stats["a_vencer"] + self.stats["vencida"]
+
+    def contexto(self) -> Dict[str, Any]:
+        """Dados prontos para os templates do relatório"""
+        brl = Formatters.formatar_valor_monetario
+        hoje = self.hoje
+
+        tendencia = []
+        if self.vencendo_este_ano > self.vencendo_proximo_ano:
+            tendencia.append("Tendência: Concentração de vencimentos este ano - atenção redobrada necessária")
+        elif self.vencendo_proximo_ano > self.vencendo_este_ano:
+            tendencia.append("Tendência: Distribuição equilibrada de vencimentos")
+
+        recomendacoes = []
+        if self.stats["a_vencer"] > 0:
+            recomendacoes.append("Iniciar processos de renovação para atas próximas do vencimento")
+        if self.stats["vencida"] > 0:
+            recomendacoes.append("Regularizar situação das atas vencidas")
+        if self.total < 5:
+            recomendacoes.append("Considerar ampliação do portfólio de atas")
+
+        contexto = templates.contexto_resumo(self.stats)
+        contexto.update({
+            "periodo": hoje.strftime('%B/%Y'),
+            "data_geracao": Formatters.formatar_data_brasileira(hoje),
+            "valor_total": brl(self.total_valor),
+            "fornecedores": [
+                {"fornecedor": nome, "quantidade": int(dados[0]), "valor": brl(dados[1])}
+                for nome, dados in sorted(self.fornecedores.items(), key=lambda x: x[1][1], reverse=True)
+            ],
+            "proximas": [
+                {"numero_ata": numero, "objeto": objeto, "dias": (vigencia - hoje).days}
+                for vigencia, numero, objeto in sorted(self.proximas)
+            ],
+            "vencidas_lista": [
+                {"numero_ata": numero, "objeto": objeto, "dias": (hoje - vigencia).days}
+                for vigencia, numero, objeto in sorted(self.vencidas)
+            ],
+            "vencendo_este_ano": self.vencendo_este_ano,
+            "vencendo_proximo_ano": self.vencendo_proximo_ano,
+            "tendencia": [{"texto": texto} for texto in tendencia],
+            "vencimentos_por_mes": [
+                {"mes": f"{mes:02d}/{ano}", "quantidade": int(dados[0]), "valor": brl(dados[1])}
+                for (ano, mes), dados in sorted(self.por_mes.items())
+            ],
+            "recomendacoes": [{"texto": texto} for texto in recomendacoes],
+        })
+        return contexto
+
+def renderizar_relatorio(contexto: Dict[str, Any], stream: TextIO, formato: str = "texto"):
+    """Renderiza o relatório (texto ou HTML) a partir do contexto do acumulador"""
+    html = formato == "html"
+    linha = templates.LINHA_HTML if html else templates.LINHA_TEXTO
+    vence_em = templates.LINHA_VENCE_EM_HTML if html else templates.LINHA_VENCE_EM_TEXTO
+    vencida = templates.LINHA_VENCIDA_HTML if html else templates.LINHA_VENCIDA_TEXTO
+    fornecedor = templates.LINHA_FORNECEDOR_HTML if html else templates.LINHA_FORNECEDOR_TEXTO
+    mes = templates.LINHA_MES_HTML if html else templates.LINHA_MES_TEXTO
+
+    secoes = {
+        "fornecedores": fornecedor.render_many(contexto["fornecedores"]),
+        "proximas": templates.secao(
+            "Atas Próximas do Vencimento" if html else "⚠️ ATAS PRÓXIMAS DO VENCIMENTO:",
+            vence_em.render_many(contexto["proximas"]),
+            html,
+        ),
+        "vencidas_lista": templates.secao(
+            "Atas Vencidas" if html else "❌ ATAS VENCIDAS:",
+            vencida.render_many(contexto["vencidas_lista"]),
+            html,
+        ),
+        "tendencia": linha.render_many(contexto["tendencia"]),
+        "vencimentos_por_mes": templates.secao(
+            "Vencimentos nos Próximos Meses" if html else "📅 VENCIMENTOS NOS PRÓXIMOS MESES:",
+            mes.render_many(contexto.get("vencimentos_por_mes", [])),
+            html,
+        ),
+        "recomendacoes": linha.render_many(contexto["recomendacoes"]),
+    }
+    template = templates.RELATORIO_MENSAL_HTML if html else templates.RELATORIO_MENSAL_TEXTO
+    template.render_to(stream, contexto, **secoes)
+
+def _rss_maximo_kb() -> float:
+    """Maior RSS do processo até agora (0 onde ``resource`` não existe)"""
+    if resource is None:
+        return 0.0
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return maximo / 1024 if sys.platform == "darwin" else float(maximo)
+
+@dataclass
+class RelatorioGerado:
+    """Artefato de relatório gerado e suas métricas"""
+    tipo: str
+    formato: str
+    caminho: str
+    total_atas: int
+    duracao_ms: float
+    # Pico do relatório (tracemalloc, com medir_memoria=True) ou RSS máximo do processo
+    pico_memoria_kb: float
+    gerado_em: datetime
+    contexto: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+class ReportService:
+    """Gera relatórios em arquivo (HTML, CSV, PDF ou texto) lendo as atas em lotes"""
+
+    def __init__(self, db_file: str = "atas.db", diretorio: str = "relatorios", processador=None):
+        self.db_file = db_file
+        self.diretorio = diretorio
+        # ProcessadorParalelo opcional para calcular as seções em vários processos
+        self.processador = processador
+        self.conn = conectar(self.db_file)
+        self.conn.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        """Cria a tabela de relatórios gerados se não existir."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS relatorios_gerados (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tipo TEXT NOT NULL,
+                    formato TEXT NOT NULL,
+                    caminho TEXT NOT NULL,
+                    total_atas INTEGER NOT NULL,
+                    duracao_ms REAL NOT NULL,
+                    pico_memoria_kb REAL NOT NULL,
+                    gerado_em TEXT NOT NULL
+                )
+                """
+            )
+
+    def gerar(self, ata_service, formato: str = "html", tipo: str = "mensal",
+              hoje: Optional[date] = None, tamanho_lote: int = 500,
+              caminho: Optional[str] = None, medir_memoria: bool = False) -> RelatorioGerado:
+        """Gera o relatório percorrendo ``ata_service.iterar_em_lotes``"""
+        if self.processador is not None and formato != "csv":
+            # Sem linhas por ata: lotes compactos bastam e seguem direto para o pool
+            lotes = ata_service.iterar_compactas(self.processador.tamanho_lote)
+        else:
+            lotes = ata_service.iterar_em_lotes(tamanho_lote)
+        return self.gerar_de_lotes(lotes, formato, tipo, hoje, caminho, medir_memoria)
+
+    @instrumentado("relatorios.gerar", linhas=lambda r: r.total_atas)
+    def gerar_de_lotes(self, lotes: Iterable[List[Ata]], formato: str = "html", tipo: str = "mensal",
+                       hoje: Optional[date] = None, caminho: Optional[str] = None,
+                       medir_memoria: bool = False) -> RelatorioGerado:
+        """Gera o relatório a partir de lotes de atas, medindo o tempo de geração.
+
+        ``medir_memoria=True`` mede o pico alocado pelo relatório com
+        ``tracemalloc`` (rastreia todas as threads e deixa a geração mais lenta;
+        para benchmarks). Sem ele, ou se outro rastreamento já estiver ativo,
+        o pico registrado é o RSS máximo do processo.
+        """
+        if formato not in FORMATOS_RELATORIO:
+            raise ValueError(f"Formato de relatório inválido: {formato}")
+        if hoje is None:
+            hoje = date.today()
+        if caminho is None:
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = os.path.join(
+                self.diretorio, f"relatorio_{tipo}_{hoje.isoformat()}.{_EXTENSOES[formato]}"
+            )
+
+        rastrear = medir_memoria and not tracemalloc.is_tracing()
+        if rastrear:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        # Temporário exclusivo: relatório manual (GUI) e agendado (daemon) podem gravar o mesmo caminho
+        descritor, temporario = tempfile.mkstemp(prefix=f".{os.path.basename(caminho)}-",
+                                                 dir=os.path.dirname(caminho) or ".")
+        os.close(descritor)
+        try:
+            # mkstemp cria o arquivo só para o dono; o relatório é um arquivo comum
+            os.chmod(temporario, 0o644)
+            acumulador = AcumuladorRelatorio(hoje)
+            if formato == "csv":
+                self._escrever_csv(lotes, acumulador, temporario)
+                contexto = acumulador.contexto()
+            else:
+                if self.processador is not None:
+                    acumulador = self.processador.acumular_lotes(lotes, hoje)
+                else:
+                    for lote in lotes:
+                        acumulador.adicionar_lote(lote)
+                contexto = acumulador.contexto()
+                if formato == "pdf":
+                    self._escrever_pdf(contexto, temporario)
+                else:
+                    with open(temporario, "w", encoding="utf-8") as f:
+                        renderizar_relatorio(contexto, f, formato)
+            os.replace(temporario, caminho)
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            pico_kb = tracemalloc.get_traced_memory()[1] / 1024 if rastrear else _rss_maximo_kb()
+        finally:
+            if rastrear:
+                tracemalloc.stop()
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+        relatorio = RelatorioGerado(
+            tipo=tipo,
+            formato=formato,
+            caminho=caminho,
+            total_atas=acumulador.total,
+            duracao_ms=duracao_ms,
+            pico_memoria_kb=pico_kb,
+            gerado_em=datetime.now(),
+            contexto=contexto,
+        )
+        self._registrar(relatorio)
+        return relatorio
+
+    def _escrever_csv(self, lotes: Iterable[List[Ata]], acumulador: AcumuladorRelatorio, caminho: str):
+        """Escreve uma linha por ata à medida que os lotes chegam"""
+        with open(caminho, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(_COLUNAS_CSV)
+            for lote in lotes:
+                linhas = []
+                for ata in lote:
+                    status, dias, valor = acumulador.adicionar(ata)
+                    linhas.append((
+                        ata.numero_ata, ata.documento_sei, ata.fornecedor, ata.objeto,
+                        ata.data_vigencia.isoformat(), dias, status, f"{valor:.2f}",
+                    ))
+                writer.writerows(linhas)
+
+    def _escrever_pdf(self, contexto: Dict[str, Any], caminho: str):
+        """Escreve a versão texto do relatório em PDF (requer reportlab)"""
+        try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.pdfgen import canvas
+        except ImportError:
+            raise RuntimeError("Geração de PDF requer o pacote reportlab (pip install reportlab)")
+
+        texto = StringIO()
+        renderizar_relatorio(contexto, texto, "texto")
+        pdf = canvas.Canvas(caminho, pagesize=A4)
+        largura, altura = A4
+        margem = 40
+        y = altura - margem
+        for linha in texto.getvalue().splitlines():
+            if y < margem:
+                pdf.showPage()
+                y = altura - margem
+            # Fontes padrão do PDF cobrem apenas Latin-1/cp1252 (sem emojis)
+            pdf.drawString(margem, y, linha.encode("cp1252", "ignore").decode("cp1252"))
+            y -= 14
+        pdf.save()
+
+    def _registrar(self, relatorio: RelatorioGerado):
+        """Registra o relatório gerado e suas métricas"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO relatorios_gerados (tipo, formato, caminho, total_atas, duracao_ms, "
+                "pico_memoria_kb, gerado_em) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    relatorio.tipo,
+                    relatorio.formato,
+                    relatorio.caminho,
+                    relatorio.total_atas,
+                    relatorio.duracao_ms,
+                    relatorio.pico_memoria_kb,
+                    relatorio.gerado_em.isoformat(),
+                ),
+            )
+
+    def get_historico(self, limite: int = 20) -> List[Dict[str, Any]]:
+        """Retorna os últimos relatórios gerados com tempo e pico de memória"""
+        rows = self.conn.execute(
+            "SELECT tipo, formato, caminho, total_atas, duracao_ms, pico_memoria_kb, gerado_em "
+            "FROM relatorios_gerados ORDER BY id DESC LIMIT ?",
+            (limite,),
+        ).fetchall()
+        historico = []
+        for row in rows:
+            item = dict(row)
+            item["gerado_em"] = datetime.fromisoformat(item["gerado_em"])
+            historico.append(item)
+        return historico
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
@@ -0,0 +1,185 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from models.ata import Ata
+
+# Intervalo (em atas) entre verificações de cancelamento durante a filtragem
+INTERVALO_CANCELAMENTO = 256
+
+ORDENACOES = {
+    "mais_recente": (lambda a: a.data_vigencia, True),
+    "mais_antiga": (lambda a: a.data_vigencia, False),
+    "valor_maior": (lambda a: a.valor_total, True),
+    "valor_menor": (lambda a: a.valor_total, False),
+}
+
+class BuscaCancelada(Exception):
+    """Uma consulta mais nova substituiu a consulta em execução"""
+
+@dataclass(frozen=True)
+class ConsultaAtas:
+    """Busca textual, filtros de status e ordenação da tela de atas"""
+    texto: str = ""
+    filtros: FrozenSet[str] = frozenset()
+    ordenacao: str = "mais_recente"
+
+    @property
+    def termo(self) -> str:
+        return self.texto.strip().lower()
+
+    @property
+    def status(self) -> FrozenSet[str]:
+        """Status aceitos (vazio = todos)"""
+        return frozenset() if "todos" in self.filtros else self.filtros
+
+def corresponde(ata: Ata, termo: str) -> bool:
+    return (
+        termo in ata.numero_ata.lower()
+        or termo in ata.objeto.lower()
+        or termo in ata.fornecedor.lower()
+        or termo in ata.documento_sei.lower()
+    )
+
+def filtrar_atas(atas: Iterable[Ata], consulta: ConsultaAtas,
+                 cancelado: Callable[[], bool] = lambda: False) -> List[Ata]:
+    """Aplica filtros de status e texto, verificando ``cancelado`` periodicamente"""
+    status, termo = consulta.status, consulta.termo
+    resultado = []
+    for posicao, ata in enumerate(atas):
+        if posicao % INTERVALO_CANCELAMENTO == 0 and cancelado():
+            raise BuscaCancelada()
+        if status and ata.status not in status:
+            continue
+        if termo and not corresponde(ata, termo):
+            continue
+        resultado.append(ata)
+    return resultado
+
+def ordenar_atas(atas: List[Ata], ordenacao: str) -> List[Ata]:
+    if ordenacao not in ORDENACOES:
+        return atas
+    chave, reverso = ORDENACOES[ordenacao]
+    return sorted(atas, key=chave, reverse=reverso)
+
+class MotorBusca:
+    """Busca incremental sobre a carteira, com cache LRU das consultas recentes.
+
+    Ao estender o texto ("pap" -> "pape" -> "papel") com os mesmos filtros,
+    filtra apenas o resultado da consulta anterior mais específica em cache;
+    ao apagar caracteres, reaproveita o resultado já calculado. Consultas sem
+    antecessora no cache percorrem a carteira inteira. O cache é descartado
+    sempre que ``versao()`` muda (dados alterados).
+    """
+
+    def __init__(self, fonte: Callable[[], List[Ata]], versao: Callable[[], object],
+                 capacidade: int = 32):
+        self.fonte = fonte
+        self.versao = versao
+        self.capacidade = capacidade
+        self._versao_cache: object = None
+        self._cache: "OrderedDict[Tuple[str, FrozenSet[str]], List[Ata]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.estatisticas: Dict[str, int] = {"cache": 0, "refinamentos": 0, "completas": 0}
+
+    def _base(self, termo: str, status: FrozenSet[str]) -> Optional[List[Ata]]:
+        """Menor resultado em cache cujo termo está contido no novo (mesmos filtros)"""
+        base = None
+        for (termo_cache, status_cache), atas in self._cache.items():
+            if status_cache == status and termo_cache in termo:
+                if base is None or len(atas) < len(base):
+                    base = atas
+        return base
+
+    def buscar(self, consulta: ConsultaAtas,
+               cancelado: Callable[[], bool] = lambda: False) -> List[Ata]:
+        """Atas que atendem à consulta (sem ordenação)"""
+        chave = (consulta.termo, consulta.status)
+        versao = self.versao()
+        with self._lock:
+            if versao != self._versao_cache:
+                self._cache.clear()
+                self._versao_cache = versao
+            atas = self._cache.get(chave)
+            if atas is not None:
+                self._cache.move_to_end(chave)
+                self.estatisticas["cache"] += 1
+                return atas
+            base = self._base(*chave)
+        if base is not None:
+            self.estatisticas["refinamentos"] += 1
+        else:
+            base = self.fonte()
+            self.estatisticas["completas"] += 1
+        atas = filtrar_atas(base, consulta, cancelado)
+        with self._lock:
+            if versao == self._versao_cache:
+                self._cache[chave] = atas
+                if len(self._cache) > self.capacidade:
+                    self._cache.popitem(last=False)
+        return atas
+
+    def limpar(self):
+        with self._lock:
+            self._cache.clear()
+
+class PipelineBusca:
+    """Executa consultas fora da thread da interface, descartando as obsoletas.
+
+    Cada ``submeter`` gera uma nova geração: a consulta anterior é cancelada
+    (se ainda na fila) ou interrompida na próxima verificação, e um resultado
+    só é entregue a ``on_resultado`` se ainda for da geração mais recente.
+    """
+
+    def __init__(self, executar: Callable[[ConsultaAtas, Callable[[], bool]], List[Ata]],
+                 on_resultado: Callable[[int, ConsultaAtas, List[Ata]], None]):
+        self.executar = executar
+        self.on_resultado = on_resultado
+        self.geracao = 0
+        self._lock = threading.Lock()
+        self._pendente: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="busca")
+
+    def atual(self, geracao: int) -> bool:
+        """Indica se ``geracao`` ainda é a consulta mais recente"""
+        return geracao == self.geracao
+
+    def _nova_geracao(self) -> int:
+        with self._lock:
+            self.geracao += 1
+            if self._pendente is not None:
+                self._pendente.cancel()
+                self._pendente = None
+            return self.geracao
+
+    def submeter(self, consulta: ConsultaAtas) -> int:
+        """Agenda a consulta em background e retorna sua geração"""
+        geracao = self._nova_geracao()
+        futuro = self._executor.submit(self._processar, geracao, consulta)
+        with self._lock:
+            if self.atual(geracao):
+                self._pendente = futuro
+        return geracao
+
+    def executar_agora(self, consulta: ConsultaAtas) -> List[Ata]:
+        """Executa na thread atual (ex.: montagem inicial), invalidando as pendentes"""
+        self._nova_geracao()
+        return self.executar(consulta, lambda: False)
+
+    def _processar(self, geracao: int, consulta: ConsultaAtas):
+        cancelado = lambda: not self.atual(geracao)
+        try:
+            atas = self.executar(consulta, cancelado)
+        except BuscaCancelada:
+            return
+        except Exception as e:
+            print(f"Erro na busca de atas: {e}")
+            return
+        if self.atual(geracao):
+            self.on_resultado(geracao, consulta, atas)
+
+    def close(self):
+        self._nova_geracao()
+        self._executor.shutdown(wait=False, cancel_futures=True)
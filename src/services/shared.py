@@ -0,0 +1,109 @@
+import atexit
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from services.sqlite_ata_service import SQLiteAtaService
+from services.alert_service import AlertService
+from services.events import EventoDados
+from services.parallel import criar_processador
+from services.report_service import ReportService
+from utils.email_service import EmailService
+from utils.email_queue import criar_fila_email
+from utils.metrics import METRICAS
+from utils.scheduler import TaskScheduler
+
+class ServicosCompartilhados:
+    """Serviços únicos por processo, compartilhados por todas as sessões.
+
+    No modo web o Flet cria um ``AtaApp`` por navegador conectado; todas as
+    sessões usam a mesma conexão, o mesmo histórico de alertas e um único
+    agendador. Entre processos (várias réplicas sobre o mesmo banco) quem
+    executa as verificações é o dono do lease ``agendador_lease``.
+    """
+
+    def __init__(self, db_file: str = "atas.db"):
+        self.db_file = db_file
+        self.ata_service = SQLiteAtaService(db_file)
+        self.email_outbox, self.email_worker = criar_fila_email(db_file)
+        self.email_service = EmailService(self.email_outbox)
+        # ATA_REGIS_WORKERS > 1 divide alertas e relatórios de carteiras grandes em processos
+        self.processador = criar_processador()
+        self.alert_service = AlertService(self.email_service, db_file, modo_digest=True,
+                                          processador=self.processador)
+        self.scheduler = TaskScheduler(self.ata_service, self.alert_service,
+                                       ReportService(db_file, processador=self.processador))
+        self._lock = threading.Lock()
+        self._sessoes: Dict[int, Callable[[], None]] = {}
+        self._proxima_sessao = 0
+        self._iniciado = False
+
+    @property
+    def sessoes_ativas(self) -> int:
+        return len(self._sessoes)
+
+    def iniciar_tarefas(self):
+        """Inicia agendador, fila de emails e exportação de métricas uma única vez por processo"""
+        with self._lock:
+            if self._iniciado:
+                return
+            self._iniciado = True
+        self.scheduler.start()
+        if self.email_worker:
+            self.email_worker.start()
+        METRICAS.iniciar_exportacao()
+
+    def conectar_sessao(self, on_dados_alterados: Callable[[List[EventoDados]], None],
+                        janela: float = 0.2) -> int:
+        """Registra uma sessão que recebe as mudanças de dados em lote"""
+        cancelar = self.ata_service.eventos.assinar(on_dados_alterados, janela=janela)
+        with self._lock:
+            self._proxima_sessao += 1
+            sessao = self._proxima_sessao
+            self._sessoes[sessao] = cancelar
+        return sessao
+
+    def desconectar_sessao(self, sessao: int):
+        """Remove a assinatura da sessão; os serviços continuam ativos"""
+        with self._lock:
+            cancelar = self._sessoes.pop(sessao, None)
+        if cancelar:
+            cancelar()
+
+    def close(self):
+        with self._lock:
+            sessoes, self._sessoes = list(self._sessoes.values()), {}
+            iniciado, self._iniciado = self._iniciado, False
+        for cancelar in sessoes:
+            cancelar()
+        if iniciado:
+            self.scheduler.stop()
+            if self.email_worker:
+                self.email_worker.stop()
+        self.alert_service.close()
+        if self.email_outbox:
+            self.email_outbox.close()
+        if self.processador:
+            self.processador.close()
+        self.ata_service.close()
+
+_servicos: Dict[str, ServicosCompartilhados] = {}
+_servicos_lock = threading.Lock()
+
+def obter_servicos(db_file: Optional[str] = None) -> ServicosCompartilhados:
+    """Retorna os serviços do processo para o banco, criando-os no primeiro uso"""
+    db_file = db_file or os.environ.get("ATA_REGIS_DB", "atas.db")
+    with _servicos_lock:
+        servicos = _servicos.get(db_file)
+        if servicos is None:
+            servicos = _servicos[db_file] = ServicosCompartilhados(db_file)
+        return servicos
+
+@atexit.register
+def encerrar_servicos():
+    """Para agendadores e fecha conexões de todos os bancos abertos"""
+    with _servicos_lock:
+        servicos = list(_servicos.values())
+        _servicos.clear()
+    for servico in servicos:
+        servico.close()
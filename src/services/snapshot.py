@@ -0,0 +1,240 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.ata import Ata, Item
+
+# Formato do snapshot (ordem de bytes da máquina que o gravou):
+#   cabeçalho   magic, versão do formato, little-endian?, quantidade, assinatura
+#   valores     float64 x n   valor total de cada ata
+#   offsets     uint64 x (n * len(CAMPOS_TEXTO) + 1) início de cada texto na tabela
+#   vigencias   int32 x n     data de vigência como ordinal (date.toordinal)
+#   textos      tabela de strings UTF-8 concatenadas
+CABECALHO = struct.Struct("=4sHHIQ4x")
+MAGIC = b"ATSN"
+VERSAO_FORMATO = 1
+# Textos de cada ata; "detalhe" guarda itens e contatos em JSON (lido só ao hidratar)
+CAMPOS_TEXTO = ("numero_ata", "documento_sei", "objeto", "fornecedor", "detalhe")
+_NATIVO_LITTLE = int(sys.byteorder == "little")
+
+# Linha codificada de uma ata: valor total, vigência (ordinal) e textos em UTF-8
+Linha = Tuple[float, int, Tuple[bytes, ...]]
+
+def codificar_linha(ata: Ata) -> Linha:
+    detalhe = json.dumps(
+        [
+            [[i.descricao, i.quantidade, i.valor] for i in ata.itens],
+            ata.telefones_fornecedor,
+            ata.emails_fornecedor,
+        ],
+        ensure_ascii=False,
+    )
+    textos = (ata.numero_ata, ata.documento_sei, ata.objeto, ata.fornecedor, detalhe)
+    return ata.valor_total, ata.data_vigencia.toordinal(), tuple(texto.encode("utf-8") for texto in textos)
+
+class _Colunas:
+    """Colunas de um snapshot em construção"""
+
+    def __init__(self):
+        self.valores, self.vigencias, self.offsets = array("d"), array("i"), array("Q", [0])
+        self.textos = bytearray()
+
+    def adicionar(self, linha: Linha):
+        valor, vigencia, textos = linha
+        self.valores.append(valor)
+        self.vigencias.append(vigencia)
+        for texto in textos:
+            self.textos += texto
+            self.offsets.append(len(self.textos))
+
+    def copiar(self, origem: 'SnapshotAtas', inicio: int, fim: int):
+        """Copia em bloco as linhas ``[inicio, fim)`` de outro snapshot"""
+        if inicio >= fim:
+            return
+        campos = len(CAMPOS_TEXTO)
+        self.valores.frombytes(origem.valores[inicio:fim].cast("B"))
+        self.vigencias.frombytes(origem.vigencias[inicio:fim].cast("B"))
+        primeiro, ultimo = origem._offsets[inicio * campos], origem._offsets[fim * campos]
+        deslocamento = len(self.textos) - primeiro
+        self.textos += origem._textos[primeiro:ultimo]
+        offsets = origem._offsets[inicio * campos + 1:fim * campos + 1]
+        if deslocamento == 0:
+            self.offsets.frombytes(offsets.cast("B"))
+        else:
+            self.offsets.extend(offset + deslocamento for offset in offsets)
+
+    def codificar(self, assinatura: int) -> bytes:
+        cabecalho = CABECALHO.pack(MAGIC, VERSAO_FORMATO, _NATIVO_LITTLE, len(self.valores), assinatura)
+        return b"".join((cabecalho, self.valores.tobytes(), self.offsets.tobytes(),
+                         self.vigencias.tobytes(), self.textos))
+
+def codificar_snapshot(atas: Iterable[Ata], assinatura: int) -> bytes:
+    """Serializa as atas no formato colunar; ``assinatura`` identifica a versão dos dados"""
+    colunas = _Colunas()
+    for ata in atas:
+        colunas.adicionar(codificar_linha(ata))
+    return colunas.codificar(assinatura)
+
+def atualizar_snapshot(anterior: 'SnapshotAtas', alteradas: Dict[str, Optional[Linha]], assinatura: int) -> bytes:
+    """Aplica criações e edições (``codificar_linha``) e exclusões (``None``) sem reler o banco.
+
+    As linhas seguem ordenadas por número, como na reconstrução completa; as
+    inalteradas são copiadas em blocos e só as atas alteradas são codificadas.
+    """
+    colunas = _Colunas()
+    proxima = 0
+    for numero in sorted(alteradas):
+        posicao, existe = anterior.localizar(numero)
+        colunas.copiar(anterior, proxima, posicao)
+        proxima = posicao + 1 if existe else posicao
+        if alteradas[numero] is not None:
+            colunas.adicionar(alteradas[numero])
+    colunas.copiar(anterior, proxima, len(anterior))
+    return colunas.codificar(assinatura)
+
+def gravar_snapshot(caminho: str, conteudo: bytes):
+    """Grava o snapshot de forma atômica (arquivo temporário exclusivo + rename)"""
+    # GUI e daemon podem reconstruir o mesmo snapshot ao mesmo tempo
+    descritor, temporario = tempfile.mkstemp(prefix=".snapshot-", dir=os.path.dirname(caminho) or ".")
+    try:
+        with os.fdopen(descritor, "wb") as f:
+            f.write(conteudo)
+        # mkstemp cria o arquivo só para o dono; o snapshot é lido pelos outros processos do banco
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+def abrir_snapshot(caminho: str) -> Optional['SnapshotAtas']:
+    """Mapeia o arquivo em memória; ``None`` se não existir ou for inválido"""
+    try:
+        with open(caminho, "rb") as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        return SnapshotAtas(mapa)
+    except ValueError as e:
+        print(f"Snapshot ignorado ({caminho}): {e}")
+        mapa.close()
+        return None
+
+class SnapshotAtas:
+    """Leitura preguiçosa de um snapshot colunar (``mmap`` ou ``bytes``).
+
+    As colunas de vigência e valor são lidas direto do buffer para os
+    agregados do painel; uma ``Ata`` só é montada em ``ata(indice)``.
+    """
+
+    def __init__(self, buffer):
+        if len(buffer) < CABECALHO.size:
+            raise ValueError("arquivo truncado")
+        magic, formato, little, quantidade, assinatura = CABECALHO.unpack_from(buffer, 0)
+        if magic != MAGIC or formato != VERSAO_FORMATO or little != _NATIVO_LITTLE:
+            raise ValueError("formato incompatível")
+        inicio_textos = CABECALHO.size + (8 + 8 * len(CAMPOS_TEXTO) + 4) * quantidade + 8
+        if len(buffer) < inicio_textos:
+            raise ValueError("arquivo truncado")
+        self._buffer = buffer
+        self.quantidade = quantidade
+        self.assinatura = assinatura
+        visao = memoryview(buffer)
+        inicio = CABECALHO.size
+        fim = inicio + 8 * quantidade
+        self.valores = visao[inicio:fim].cast("d")
+        inicio, fim = fim, fim + 8 * (quantidade * len(CAMPOS_TEXTO) + 1)
+        self._offsets = visao[inicio:fim].cast("Q")
+        inicio, fim = fim, fim + 4 * quantidade
+        self.vigencias = visao[inicio:fim].cast("i")
+        self._textos = visao[fim:]
+        if len(self._offsets) != quantidade * len(CAMPOS_TEXTO) + 1 or len(self._textos) != self._offsets[-1]:
+            raise ValueError("arquivo truncado")
+        self._posicoes: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def texto(self, indice: int, campo: str) -> str:
+        posicao = indice * len(CAMPOS_TEXTO) + CAMPOS_TEXTO.index(campo)
+        return str(self._textos[self._offsets[posicao]:self._offsets[posicao + 1]], "utf-8")
+
+    def posicao(self, numero_ata: str) -> Optional[int]:
+        """Índice da ata pelo número (o mapa é montado na primeira consulta)"""
+        if self._posicoes is None:
+            self._posicoes = {self.texto(i, "numero_ata"): i for i in range(self.quantidade)}
+        return self._posicoes.get(numero_ata)
+
+    def localizar(self, numero_ata: str) -> Tuple[int, bool]:
+        """Busca binária pelo número: posição de inserção e se a ata está nela"""
+        inicio, fim = 0, self.quantidade
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            if self.texto(meio, "numero_ata") < numero_ata:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return inicio, inicio < self.quantidade and self.texto(inicio, "numero_ata") == numero_ata
+
+    def ata(self, indice: int) -> Ata:
+        """Hidrata a ata da linha ``indice`` (dados já validados na gravação)"""
+        numero, sei, objeto, fornecedor, detalhe = (self.texto(indice, campo) for campo in CAMPOS_TEXTO)
+        itens, telefones, emails = json.loads(detalhe)
+        return Ata.from_trusted(
+            numero,
+            sei,
+            date.fromordinal(self.vigencias[indice]),
+            objeto,
+            [Item.from_trusted(d, q, v) for d, q, v in itens],
+            fornecedor,
+            telefones,
+            emails,
+        )
+
+    # --------- Agregados calculados sobre as colunas ---------
+    def estatisticas(self, hoje: Optional[date] = None) -> Dict[str, int]:
+        """Contagem por status (mesmas faixas de ``Ata.status``)"""
+        hoje = (hoje or date.today()).toordinal()
+        stats = {"vigente": 0, "a_vencer": 0, "vencida": 0}
+        for vigencia in self.vigencias:
+            dias = vigencia - hoje
+            if dias < 0:
+                stats["vencida"] += 1
+            elif dias <= 90:
+                stats["a_vencer"] += 1
+            else:
+                stats["vigente"] += 1
+        return stats
+
+    def valor_total(self) -> float:
+        return sum(self.valores)
+
+    def vencimentos_por_mes(self, ano: int) -> Dict[int, int]:
+        """Quantidade de atas que vencem em cada mês de ``ano``"""
+        limites = [date(ano, mes, 1).toordinal() for mes in range(1, 13)] + [date(ano + 1, 1, 1).toordinal()]
+        contagem = {mes: 0 for mes in range(1, 13)}
+        for vigencia in self.vigencias:
+            if limites[0] <= vigencia < limites[-1]:
+                contagem[bisect_right(limites, vigencia)] += 1
+        return contagem
+
+    def indices_vencimento_proximo(self, dias: int = 90, hoje: Optional[date] = None) -> List[int]:
+        """Índices das atas que vencem em até ``dias`` dias, da mais próxima à mais distante"""
+        hoje = (hoje or date.today()).toordinal()
+        indices = [i for i, vigencia in enumerate(self.vigencias) if 0 <= vigencia - hoje <= dias]
+        indices.sort(key=self.vigencias.__getitem__)
+        return indices
+
+    def fechar(self):
+        """Libera as visões e o mapeamento (só quando nenhuma consulta está em curso)"""
+        for visao in (self.valores, self._offsets, self.vigencias, self._textos):
+            visao.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
@@ -1,20 +1,42 @@
+import itertools
 import sqlite3
-from typing import List, Dict, Any, Optional
-from datetime import date, datetime
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+from datetime import date
 
-from models.ata import Ata, Item
+from models.ata import Ata, AtaSummary, Item
+from services.events import EventBus, EventoDados, ATA_CRIADA, ATA_ATUALIZADA, ATA_EXCLUIDA
+from services.parallel import AtaCompacta
+from services.snapshot import (
+    Linha, SnapshotAtas, abrir_snapshot, atualizar_snapshot, codificar_linha, codificar_snapshot, gravar_snapshot
+)
+from utils.db import conectar
+from utils.metrics import cronometrar, instrumentado
 
 class SQLiteAtaService:
     """Serviço de Atas usando SQLite como persistência."""
 
-    def __init__(self, db_file: str = "atas.db"):
+    def __init__(self, db_file: str = "atas.db", eventos: Optional[EventBus] = None,
+                 dados_exemplo: bool = True):
         self.db_file = db_file
-        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        # Barramento onde são publicadas as mudanças (criada/atualizada/excluída)
+        self.eventos = eventos or EventBus()
+        self.conn = conectar(self.db_file)
         self.conn.row_factory = sqlite3.Row
+        # Serializa as escritas: a mesma instância pode ser compartilhada por várias sessões
+        self._lock = threading.RLock()
         # Garante que chaves estrangeiras executem os comandos ON DELETE CASCADE
         self.conn.execute("PRAGMA foreign_keys = ON")
+        # Snapshot colunar mapeado em memória (ao lado do banco) para painel e vencimentos
+        self.snapshot_file = None if db_file == ":memory:" else f"{db_file}.snapshot"
+        self._snapshot: Optional[SnapshotAtas] = None
+        # Atas alteradas por esta instância desde o snapshot atual (None = reconstruir)
+        # e a geração a que elas levam o snapshot
+        self._alteracoes: Optional[Dict[str, Optional[Linha]]] = None
+        self._geracao_alteracoes = 0
         self._create_tables()
-        if not self._has_atas():
+        # Banco vazio recebe as atas de exemplo, salvo quando é destino de uma importação
+        if dados_exemplo and not self._has_atas():
             self.load_mock_data()
 
     def _create_tables(self):
@@ -63,6 +85,104 @@ class SQLiteAtaService:
                 )
                 """
             )
+            # Geração dos dados persistida: identifica o snapshot válido, inclusive
+            # após escritas de outros processos
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadados (chave TEXT PRIMARY KEY, valor INTEGER)"
+            )
+            self.conn.execute("INSERT OR IGNORE INTO metadados (chave, valor) VALUES ('geracao', 0)")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_atas_data_vigencia ON atas(data_vigencia)"
+            )
+            # Índice de cobertura: o valor total dos resumos é somado sem ler a tabela
+            # (substitui o antigo índice só por numero_ata)
+            self.conn.execute("DROP INDEX IF EXISTS idx_itens_numero_ata")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_itens_resumo ON itens(numero_ata, quantidade, valor)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_telefones_numero_ata ON telefones(numero_ata)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_emails_numero_ata ON emails(numero_ata)"
+            )
+
+    @property
+    def versao_dados(self) -> int:
+        """Versão monotônica das atas; muda após qualquer criação, edição ou exclusão.
+
+        É a geração persistida em ``metadados``, então acompanha as escritas de
+        outras conexões e processos, mas não muda com o que os outros serviços
+        gravam no mesmo banco (histórico de alertas, fila de emails, lease).
+        """
+        return self._geracao()
+
+    def _geracao(self) -> int:
+        return self.conn.execute("SELECT valor FROM metadados WHERE chave='geracao'").fetchone()[0]
+
+    def _marcar_alteracao(self, eventos: int = 1) -> int:
+        """Avança a geração persistida (dentro da transação da escrita).
+
+        Reserva uma versão por evento publicado e retorna a primeira delas.
+        """
+        self.conn.execute("UPDATE metadados SET valor = valor + ? WHERE chave='geracao'", (eventos,))
+        return self._geracao() - eventos + 1
+
+    def snapshot(self) -> SnapshotAtas:
+        """Snapshot da geração atual, reaproveitando o arquivo quando ainda válido.
+
+        Sem escritas, a abertura é só um ``mmap``. Após escritas desta instância
+        o snapshot é atualizado só com as atas alteradas; escritas de outras
+        conexões e importações em lote refazem o snapshot com uma leitura
+        completa do banco.
+        """
+        with self._lock:
+            geracao = self._geracao()
+            if self._snapshot is not None and self._snapshot.assinatura == geracao:
+                return self._snapshot
+            snapshot = abrir_snapshot(self.snapshot_file) if self.snapshot_file else None
+            if snapshot is None or snapshot.assinatura != geracao:
+                if self._snapshot is not None and self._alteracoes and self._geracao_alteracoes == geracao:
+                    with cronometrar("sqlite.snapshot.atualizar") as medicao:
+                        snapshot = self._publicar_snapshot(
+                            atualizar_snapshot(self._snapshot, self._alteracoes, geracao), medicao
+                        )
+                        medicao.linhas = len(self._alteracoes)
+                else:
+                    with cronometrar("sqlite.snapshot.reconstruir") as medicao:
+                        conteudo = codificar_snapshot(itertools.chain.from_iterable(self.iterar_em_lotes()), geracao)
+                        snapshot = self._publicar_snapshot(conteudo, medicao)
+                        medicao.linhas = len(snapshot)
+            # O snapshot anterior não é fechado: outra thread pode estar lendo dele
+            self._snapshot = snapshot
+            self._alteracoes, self._geracao_alteracoes = {}, geracao
+            return snapshot
+
+    def _publicar_snapshot(self, conteudo: bytes, medicao) -> SnapshotAtas:
+        """Grava o snapshot ao lado do banco (para os outros processos) e o mapeia"""
+        snapshot = None
+        if self.snapshot_file:
+            try:
+                gravar_snapshot(self.snapshot_file, conteudo)
+                snapshot = abrir_snapshot(self.snapshot_file)
+            except OSError as e:
+                medicao.erro = True
+                print(f"Erro ao gravar snapshot: {e}")
+        return snapshot or SnapshotAtas(conteudo)
+
+    def _acumular_alteracoes(self, primeira: int, ultima: int, alteradas: Dict[str, Optional[Ata]]):
+        """Guarda as atas da escrita (versões ``primeira``..``ultima``) para atualizar o snapshot"""
+        if self._alteracoes is None:
+            return
+        if primeira != self._geracao_alteracoes + 1:
+            # Outra conexão escreveu entre as escritas desta instância
+            self._alteracoes = None
+            return
+        # Codificadas já: a Ata devolvida ao chamador pode ser alterada depois
+        self._alteracoes.update(
+            (numero, codificar_linha(ata) if ata is not None else None) for numero, ata in alteradas.items()
+        )
+        self._geracao_alteracoes = ultima
 
     def _has_atas(self) -> bool:
         cur = self.conn.execute("SELECT COUNT(*) FROM atas")
@@ -75,85 +195,277 @@ class SQLiteAtaService:
             "SELECT descricao, quantidade, valor FROM itens WHERE numero_ata=?",
             (numero,),
         ).fetchall()
-        itens = [Item(descricao=r[0], quantidade=r[1], valor=r[2]) for r in itens_rows]
+        itens = [Item.from_trusted(r[0], r[1], r[2]) for r in itens_rows]
         telefones = [r[0] for r in self.conn.execute(
             "SELECT telefone FROM telefones WHERE numero_ata=?", (numero,)
         ).fetchall()]
         emails = [r[0] for r in self.conn.execute(
             "SELECT email FROM emails WHERE numero_ata=?", (numero,)
         ).fetchall()]
-        data_vigencia = datetime.strptime(row["data_vigencia"], "%Y-%m-%d").date()
-        return Ata(
-            numero_ata=numero,
-            documento_sei=row["documento_sei"],
-            data_vigencia=data_vigencia,
-            objeto=row["objeto"],
-            itens=itens,
-            fornecedor=row["fornecedor"],
-            telefones_fornecedor=telefones,
-            emails_fornecedor=emails,
+        # Linhas foram validadas na gravação: não repete as validações
+        return Ata.from_trusted(
+            numero,
+            row["documento_sei"],
+            date.fromisoformat(row["data_vigencia"]),
+            row["objeto"],
+            itens,
+            row["fornecedor"],
+            telefones,
+            emails,
         )
 
+    def _atas_from_rows(self, rows: List[sqlite3.Row]) -> List[Ata]:
+        """Converte um lote de linhas carregando itens, telefones e emails em 3 consultas"""
+        if not rows:
+            return []
+        numeros = [r["numero_ata"] for r in rows]
+        marcadores = ", ".join("?" for _ in numeros)
+        itens: Dict[str, List[Item]] = {}
+        for r in self.conn.execute(
+            f"SELECT numero_ata, descricao, quantidade, valor FROM itens "
+            f"WHERE numero_ata IN ({marcadores}) ORDER BY id",
+            numeros,
+        ):
+            itens.setdefault(r[0], []).append(Item.from_trusted(r[1], r[2], r[3]))
+        telefones: Dict[str, List[str]] = {}
+        for r in self.conn.execute(
+            f"SELECT numero_ata, telefone FROM telefones WHERE numero_ata IN ({marcadores}) ORDER BY id",
+            numeros,
+        ):
+            telefones.setdefault(r[0], []).append(r[1])
+        emails: Dict[str, List[str]] = {}
+        for r in self.conn.execute(
+            f"SELECT numero_ata, email FROM emails WHERE numero_ata IN ({marcadores}) ORDER BY id",
+            numeros,
+        ):
+            emails.setdefault(r[0], []).append(r[1])
+        return [
+            Ata.from_trusted(
+                row["numero_ata"],
+                row["documento_sei"],
+                date.fromisoformat(row["data_vigencia"]),
+                row["objeto"],
+                itens.get(row["numero_ata"], []),
+                row["fornecedor"],
+                telefones.get(row["numero_ata"], []),
+                emails.get(row["numero_ata"], []),
+            )
+            for row in rows
+        ]
+
+    def _hidratar(self, rows: List[sqlite3.Row], tamanho: int = 500) -> List[Ata]:
+        """Hidrata em lotes (3 consultas por lote em vez de 3 por ata)"""
+        atas: List[Ata] = []
+        for inicio in range(0, len(rows), tamanho):
+            atas.extend(self._atas_from_rows(rows[inicio:inicio + tamanho]))
+        return atas
+
     # --------- Operações CRUD ---------
-    def criar_ata(self, ata_data: Dict[str, Any]) -> Ata:
-        if self.buscar_por_numero(ata_data["numero_ata"]):
-            raise ValueError(f"Já existe uma ata com o número {ata_data['numero_ata']}")
-        ata = Ata.from_dict(ata_data)
-        with self.conn:
+    def _inserir(self, ata: Ata):
+        """Insere a ata e seus filhos (dentro da transação do chamador)"""
+        self.conn.execute(
+            "INSERT INTO atas (numero_ata, documento_sei, data_vigencia, objeto, fornecedor) VALUES (?, ?, ?, ?, ?)",
+            (
+                ata.numero_ata,
+                ata.documento_sei,
+                ata.data_vigencia.isoformat(),
+                ata.objeto,
+                ata.fornecedor,
+            ),
+        )
+        for item in ata.itens:
             self.conn.execute(
-                "INSERT INTO atas (numero_ata, documento_sei, data_vigencia, objeto, fornecedor) VALUES (?, ?, ?, ?, ?)",
+                "INSERT INTO itens (numero_ata, descricao, quantidade, valor) VALUES (?, ?, ?, ?)",
                 (
                     ata.numero_ata,
-                    ata.documento_sei,
-                    ata.data_vigencia.isoformat(),
-                    ata.objeto,
-                    ata.fornecedor,
+                    item.descricao,
+                    item.quantidade,
+                    item.valor,
                 ),
             )
-            for item in ata.itens:
-                self.conn.execute(
-                    "INSERT INTO itens (numero_ata, descricao, quantidade, valor) VALUES (?, ?, ?, ?)",
-                    (
-                        ata.numero_ata,
-                        item.descricao,
-                        item.quantidade,
-                        item.valor,
-                    ),
-                )
-            for telefone in ata.telefones_fornecedor:
-                self.conn.execute(
-                    "INSERT INTO telefones (numero_ata, telefone) VALUES (?, ?)",
-                    (ata.numero_ata, telefone),
+        for telefone in ata.telefones_fornecedor:
+            self.conn.execute(
+                "INSERT INTO telefones (numero_ata, telefone) VALUES (?, ?)",
+                (ata.numero_ata, telefone),
+            )
+        for email in ata.emails_fornecedor:
+            self.conn.execute(
+                "INSERT INTO emails (numero_ata, email) VALUES (?, ?)",
+                (ata.numero_ata, email),
+            )
+
+    def _notificar(self, tipo: str, numero_ata: str, versao: int):
+        """Publica o evento da mudança com a versão reservada na escrita"""
+        self.eventos.publicar(EventoDados(tipo, numero_ata, versao))
+
+    @instrumentado("sqlite.criar_ata")
+    def criar_ata(self, ata_data: Dict[str, Any]) -> Ata:
+        with self._lock:
+            if self.buscar_por_numero(ata_data["numero_ata"]):
+                raise ValueError(f"Já existe uma ata com o número {ata_data['numero_ata']}")
+            ata = Ata.from_dict(ata_data)
+            with self.conn:
+                self._inserir(ata)
+                versao = self._marcar_alteracao()
+            self._acumular_alteracoes(versao, versao, {ata.numero_ata: ata})
+            self._notificar(ATA_CRIADA, ata.numero_ata, versao)
+            return ata
+
+    @instrumentado("sqlite.importar_atas", linhas=lambda r: r["importadas"] + r["substituidas"])
+    def importar_atas(self, atas_data: Iterable[Dict[str, Any]], substituir: bool = False) -> Dict[str, Any]:
+        """Importa atas em lote numa única transação.
+        
+        Atas já existentes são ignoradas (ou substituídas com ``substituir=True``);
+        registros inválidos são reportados em ``erros`` sem interromper a importação.
+        """
+        with self._lock:
+            resultado: Dict[str, Any] = {"importadas": 0, "substituidas": 0, "ignoradas": 0, "erros": []}
+            existentes = {r[0] for r in self.conn.execute("SELECT numero_ata FROM atas")}
+            atas, itens, telefones, emails = [], [], [], []
+            vistos = set()
+            for posicao, ata_data in enumerate(atas_data, 1):
+                try:
+                    ata = Ata.from_dict(ata_data)
+                except KeyError as e:
+                    resultado["erros"].append(f"Registro {posicao}: campo obrigatório ausente {e}")
+                    continue
+                except (ValueError, TypeError) as e:
+                    resultado["erros"].append(f"Registro {posicao}: {e}")
+                    continue
+                numero = ata.numero_ata
+                if numero in vistos or (numero in existentes and not substituir):
+                    resultado["ignoradas"] += 1
+                    continue
+                vistos.add(numero)
+                if numero in existentes:
+                    resultado["substituidas"] += 1
+                else:
+                    resultado["importadas"] += 1
+                atas.append((numero, ata.documento_sei, ata.data_vigencia.isoformat(), ata.objeto, ata.fornecedor))
+                itens.extend((numero, i.descricao, i.quantidade, i.valor) for i in ata.itens)
+                telefones.extend((numero, t) for t in ata.telefones_fornecedor)
+                emails.extend((numero, e) for e in ata.emails_fornecedor)
+
+            with self.conn:
+                substituidas = [(a[0],) for a in atas if a[0] in existentes]
+                self.conn.executemany("DELETE FROM atas WHERE numero_ata=?", substituidas)
+                self.conn.executemany(
+                    "INSERT INTO atas (numero_ata, documento_sei, data_vigencia, objeto, fornecedor) VALUES (?, ?, ?, ?, ?)",
+                    atas,
                 )
-            for email in ata.emails_fornecedor:
-                self.conn.execute(
-                    "INSERT INTO emails (numero_ata, email) VALUES (?, ?)",
-                    (ata.numero_ata, email),
+                self.conn.executemany(
+                    "INSERT INTO itens (numero_ata, descricao, quantidade, valor) VALUES (?, ?, ?, ?)", itens
                 )
-        return ata
+                self.conn.executemany("INSERT INTO telefones (numero_ata, telefone) VALUES (?, ?)", telefones)
+                self.conn.executemany("INSERT INTO emails (numero_ata, email) VALUES (?, ?)", emails)
+                versao = self._marcar_alteracao(len(atas)) if atas else 0
+            if atas:
+                # Lote: o próximo snapshot é refeito por completo
+                self._alteracoes = None
+            for versao, ata in enumerate(atas, versao):
+                self._notificar(ATA_ATUALIZADA if ata[0] in existentes else ATA_CRIADA, ata[0], versao)
+            return resultado
 
+    @instrumentado("sqlite.editar_ata")
     def editar_ata(self, numero_ata: str, ata_data: Dict[str, Any]) -> Optional[Ata]:
-        if not self.buscar_por_numero(numero_ata):
-            return None
-        self.excluir_ata(numero_ata)
-        return self.criar_ata(ata_data)
+        with self._lock:
+            if not self.buscar_por_numero(numero_ata):
+                return None
+            ata = Ata.from_dict(ata_data)
+            if ata.numero_ata != numero_ata and self.buscar_por_numero(ata.numero_ata):
+                raise ValueError(f"Já existe uma ata com o número {ata.numero_ata}")
+            # Substitui a ata numa única transação
+            with self.conn:
+                self.conn.execute("DELETE FROM atas WHERE numero_ata=?", (numero_ata,))
+                self._inserir(ata)
+                eventos = 1 if ata.numero_ata == numero_ata else 2
+                versao = self._marcar_alteracao(eventos)
+            self._acumular_alteracoes(versao, versao + eventos - 1, {numero_ata: None, ata.numero_ata: ata})
+            if ata.numero_ata == numero_ata:
+                self._notificar(ATA_ATUALIZADA, numero_ata, versao)
+            else:
+                self._notificar(ATA_EXCLUIDA, numero_ata, versao)
+                self._notificar(ATA_CRIADA, ata.numero_ata, versao + 1)
+            return ata
 
+    @instrumentado("sqlite.excluir_ata")
     def excluir_ata(self, numero_ata: str) -> bool:
-        with self.conn:
-            cur = self.conn.execute("DELETE FROM atas WHERE numero_ata=?", (numero_ata,))
-            return cur.rowcount > 0
+        with self._lock:
+            with self.conn:
+                cur = self.conn.execute("DELETE FROM atas WHERE numero_ata=?", (numero_ata,))
+                if cur.rowcount > 0:
+                    versao = self._marcar_alteracao()
+            if cur.rowcount > 0:
+                self._acumular_alteracoes(versao, versao, {numero_ata: None})
+                self._notificar(ATA_EXCLUIDA, numero_ata, versao)
+                return True
+            return False
 
+    @instrumentado("sqlite.buscar_por_numero")
     def buscar_por_numero(self, numero_ata: str) -> Optional[Ata]:
         row = self.conn.execute("SELECT * FROM atas WHERE numero_ata=?", (numero_ata,)).fetchone()
         return self._ata_from_db(row) if row else None
 
+    @instrumentado("sqlite.listar_todas", linhas=len)
     def listar_todas(self) -> List[Ata]:
-        rows = self.conn.execute("SELECT * FROM atas").fetchall()
-        return [self._ata_from_db(r) for r in rows]
+        return self._hidratar(self.conn.execute("SELECT * FROM atas").fetchall())
+
+    @instrumentado("sqlite.listar_resumos", linhas=len)
+    def listar_resumos(self) -> List[AtaSummary]:
+        """Projeção para listas: uma consulta, sem itens e contatos (carregados ao abrir a ata)"""
+        rows = self.conn.execute(
+            """
+            SELECT a.numero_ata, a.documento_sei, a.data_vigencia, a.objeto, a.fornecedor,
+                   COALESCE((SELECT SUM(i.quantidade * i.valor) FROM itens i
+                             WHERE i.numero_ata = a.numero_ata), 0)
+            FROM atas a
+            """
+        ).fetchall()
+        carregar = self.buscar_por_numero
+        return [
+            AtaSummary(r[0], r[1], date.fromisoformat(r[2]), r[3], r[4], r[5], carregar)
+            for r in rows
+        ]
+
+    def iterar_em_lotes(self, tamanho: int = 500) -> Iterator[List[Ata]]:
+        """Percorre todas as atas em lotes (paginação por chave), sem carregar a base inteira"""
+        ultimo = ""
+        while True:
+            rows = self.conn.execute(
+                "SELECT * FROM atas WHERE numero_ata > ? ORDER BY numero_ata LIMIT ?",
+                (ultimo, tamanho),
+            ).fetchall()
+            if not rows:
+                return
+            ultimo = rows[-1]["numero_ata"]
+            yield self._atas_from_rows(rows)
+
+    def iterar_compactas(self, tamanho: int = 2000) -> Iterator[List[AtaCompacta]]:
+        """Percorre as atas em lotes compactos, com o valor total somado pelo SQLite"""
+        ultimo = ""
+        while True:
+            rows = self.conn.execute(
+                """
+                SELECT a.numero_ata, a.data_vigencia, a.fornecedor, a.objeto,
+                       COALESCE(SUM(i.quantidade * i.valor), 0)
+                FROM atas a LEFT JOIN itens i ON i.numero_ata = a.numero_ata
+                WHERE a.numero_ata > ?
+                GROUP BY a.numero_ata ORDER BY a.numero_ata LIMIT ?
+                """,
+                (ultimo, tamanho),
+            ).fetchall()
+            if not rows:
+                return
+            ultimo = rows[-1][0]
+            yield [
+                AtaCompacta(r[0], date.fromisoformat(r[1]), r[2], r[3], r[4])
+                for r in rows
+            ]
 
     def filtrar_por_status(self, status: str) -> List[Ata]:
         return [ata for ata in self.listar_todas() if ata.status == status]
 
+    @instrumentado("sqlite.buscar_por_texto", linhas=len)
     def buscar_por_texto(self, texto: str) -> List[Ata]:
         texto = f"%{texto.lower()}%"
         rows = self.conn.execute(
@@ -166,17 +478,39 @@ class SQLiteAtaService:
             """,
             (texto, texto, texto, texto),
         ).fetchall()
-        return [self._ata_from_db(r) for r in rows]
+        return self._hidratar(rows)
+
+    @instrumentado("sqlite.buscar_por_datas_vigencia", linhas=len)
+    def buscar_por_datas_vigencia(self, datas: Iterable[date]) -> List[Ata]:
+        """Busca atas cuja data de vigência está entre as datas informadas (usa índice)."""
+        valores = sorted({d.isoformat() for d in datas})
+        if not valores:
+            return []
+        marcadores = ", ".join("?" for _ in valores)
+        rows = self.conn.execute(
+            f"SELECT * FROM atas WHERE data_vigencia IN ({marcadores})", valores
+        ).fetchall()
+        return self._hidratar(rows)
 
     def get_estatisticas(self) -> Dict[str, int]:
-        stats = {"vigente": 0, "a_vencer": 0, "vencida": 0}
-        for ata in self.listar_todas():
-            stats[ata.status] += 1
-        return stats
+        return self.snapshot().estatisticas()
 
+    @instrumentado("sqlite.get_atas_vencimento_proximo", linhas=len)
     def get_atas_vencimento_proximo(self, dias: int = 90) -> List[Ata]:
-        atas = [ata for ata in self.listar_todas() if 0 <= ata.dias_restantes <= dias]
-        return sorted(atas, key=lambda x: x.dias_restantes)
+        # Só as atas do período são hidratadas
+        snapshot = self.snapshot()
+        return [snapshot.ata(i) for i in snapshot.indices_vencimento_proximo(dias)]
+
+    @instrumentado("sqlite.get_resumo_painel")
+    def get_resumo_painel(self) -> Dict[str, Any]:
+        """Agregados do dashboard calculados direto das colunas do snapshot"""
+        snapshot = self.snapshot()
+        return {
+            "estatisticas": snapshot.estatisticas(),
+            "valor_total": snapshot.valor_total(),
+            "vencendo": len(snapshot.indices_vencimento_proximo()),
+            "vencimentos_mes": snapshot.vencimentos_por_mes(date.today().year),
+        }
 
     def validar_numero_ata_unico(self, numero_ata: str, excluir_numero: str | None = None) -> bool:
         row = self.conn.execute(
@@ -248,5 +582,8 @@ class SQLiteAtaService:
             self.criar_ata(ata)
 
     def close(self):
+        if self._snapshot is not None:
+            self._snapshot.fechar()
+            self._snapshot = None
         if self.conn:
             self.conn.close()
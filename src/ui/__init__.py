@@ -1,2 +1,8 @@
-from .ata_detail_view import build_ata_detail_view
 from .responsive import get_breakpoint, get_padding, get_font_size
+
+def __getattr__(nome):
+    # Importação sob demanda: a tela de detalhe não é necessária no primeiro quadro
+    if nome == "build_ata_detail_view":
+        from .ata_detail_view import build_ata_detail_view
+        return build_ata_detail_view
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
@@ -389,11 +389,11 @@ def build_atas_vencimento(
 
 def build_stats_panel(ata_service) -> ft.Container:
     """Dashboard: banner, KPIs, donut e barras (como no mock)."""
-    stats = ata_service.get_estatisticas()
-    atas = ata_service.listar_todas()
-    atas_vencimento = ata_service.get_atas_vencimento_proximo()
+    # Agregados prontos do serviço: nenhuma ata precisa ser carregada
+    resumo = ata_service.get_resumo_painel()
+    stats = resumo["estatisticas"]
 
-    total_value = sum(ata.valor_total for ata in atas)
+    total_value = resumo["valor_total"]
     total_atas = sum(stats.values())
     vigentes = stats.get("vigente", 0)
     a_vencer = stats.get("a_vencer", 0)
@@ -405,7 +405,7 @@ def build_stats_panel(ata_service) -> ft.Container:
     banner = AlertBanner(
         icon=ft.icons.WARNING_AMBER_ROUNDED,
         title="Atenção",
-        subtitle=f"Você possui {len(atas_vencimento)} ata(s) vencendo em 90 dias ou menos.",
+        subtitle=f"Você possui {resumo['vencendo']} ata(s) vencendo em 90 dias ou menos.",
     )
 
     cards = [
@@ -413,7 +413,7 @@ def build_stats_panel(ata_service) -> ft.Container:
         MetricCard(
             ft.icons.MONETIZATION_ON_OUTLINED,
             "Valor Total",
-            f"R$ {total_value:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."),
+            Formatters.formatar_valor_monetario(total_value, 0),
             "em atas",
         ),
         MetricCard(ft.icons.CHECK_CIRCLE_OUTLINED, "Vigentes", str(vigentes), f"{pct_1(vigentes, total_atas)} do total"),
@@ -426,14 +426,7 @@ def build_stats_panel(ata_service) -> ft.Container:
     donut.col = {"xs": 12, "md": 6}
 
     # barras por mês (ano corrente)
-    from datetime import date
-    current_year = date.today().year
-    monthly_counts: Dict[int, int] = {i: 0 for i in range(1, 13)}
-    for ata in atas:
-        if ata.data_vigencia.year == current_year:
-            monthly_counts[ata.data_vigencia.month] += 1
-
-    bars = MonthlyBarChart(monthly_counts)
+    bars = MonthlyBarChart(resumo["vencimentos_mes"])
     bars.col = {"xs": 12, "md": 6}
 
     cards_row = ft.ResponsiveRow(cards, columns=12, spacing=T.spacing.SPACE_4, run_spacing=T.spacing.SPACE_4)
@@ -445,3 +438,55 @@ def build_stats_panel(ata_service) -> ft.Container:
         margin=ft.margin.only(bottom=T.spacing.SPACE_5),
         expand=True,
     )
+
+
+def build_desempenho_panel(
+    resumo: Dict[str, Dict],
+    ativo: bool,
+    atualizar_cb: Callable = None,
+    limite: int = 15,
+) -> ft.Container:
+    """Configurações: operações com maior tempo acumulado (``utils.metrics``)."""
+    if not ativo:
+        corpo = ft.Text(
+            "Métricas desativadas. Defina ATA_REGIS_METRICAS=1 (ou um arquivo .prom/.json) e reinicie.",
+            color=C.TEXT_SECONDARY,
+        )
+    elif not resumo:
+        corpo = ft.Text("Nenhuma operação medida ainda.", color=C.TEXT_SECONDARY)
+    else:
+        colunas = ["Operação", "Chamadas", "Erros", "Média (ms)", "p95 (ms)", "Máx (ms)", "Linhas"]
+        linhas = []
+        for nome, dados in list(resumo.items())[:limite]:
+            valores = [
+                nome,
+                str(dados["chamadas"]),
+                str(dados["erros"]),
+                f"{dados['media_ms']:.1f}",
+                f"≤ {dados['p95_ms']:.1f}",
+                f"{dados['max_ms']:.1f}",
+                str(dados["linhas"]),
+            ]
+            cor_erro = C.ERROR_TEXT if dados["erros"] else None
+            linhas.append(ft.DataRow(cells=[
+                ft.DataCell(ft.Text(valor, color=cor_erro if i == 2 else None)) for i, valor in enumerate(valores)
+            ]))
+        corpo = ft.DataTable(
+            columns=[ft.DataColumn(ft.Text(c), numeric=i > 0) for i, c in enumerate(colunas)],
+            rows=linhas,
+        )
+
+    titulo = ft.Row(
+        [
+            ft.Text("⏱️ Desempenho", size=T.typography.TEXT_BASE, weight=ft.FontWeight.BOLD),
+            IconAction(icon=ft.icons.REFRESH, tooltip="Atualizar", on_click=atualizar_cb,
+                       hover_color=C.PRIMARY_HOVER, size="sm") if atualizar_cb else ft.Container(),
+        ],
+        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+    )
+    return ft.Container(
+        content=ft.Column([titulo, ft.Row([corpo], scroll=ft.ScrollMode.AUTO)], spacing=T.spacing.SPACE_3),
+        padding=ft.padding.symmetric(horizontal=T.spacing.SPACE_5, vertical=T.spacing.SPACE_4),
+        border=ft.border.all(1, C.BORDER),
+        border_radius=T.radius.RADIUS_MD,
+    )
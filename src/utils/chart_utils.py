@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Tuple
 from datetime import date, datetime, timedelta
 
 from models.ata import Ata
+from utils.validators import Formatters
 from theme.tokens import TOKENS as T
 from theme import colors as C
 
@@ -190,7 +191,7 @@ class ChartUtils:
                 bar_width = (percentage / 100) * 200  # Largura máxima de 200px
                 
                 # Formata valor monetário
-                value_formatted = f"R$ {value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+                value_formatted = Formatters.formatar_valor_monetario(value)
                 
                 bar = ft.Container(
                     content=ft.Row([
@@ -211,7 +212,7 @@ class ChartUtils:
             content=ft.Column([
                 ft.Text("Valores por Status", size=14, weight=ft.FontWeight.BOLD),
                 ft.Text(
-                    f"Total: R$ {total_value:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+                    "Total: " + Formatters.formatar_valor_monetario(total_value),
                     size=12,
                     color=C.TEXT_SECONDARY,
                 ),
@@ -315,7 +316,7 @@ class ChartUtils:
         cards.append(card_total)
         
         # Card Valor Total
-        value_formatted = f"R$ {total_value:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        value_formatted = Formatters.formatar_valor_monetario(total_value, 0)
         card_value = ft.Container(
             content=ft.Column(
                 [
@@ -0,0 +1,109 @@
+import itertools
+import random
+import unicodedata
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Vocabulário dos dados gerados (combinado para dar variedade à busca textual)
+OBJETOS = [
+    "Material de Escritório", "Equipamentos de TI", "Micro Tipo I", "Mobiliário",
+    "Serviços de Limpeza", "Manutenção Predial", "Material de Copa", "Licenças de Software",
+    "Impressoras Multifuncionais", "Ar-Condicionado", "Vigilância Patrimonial", "Telefonia",
+]
+ITENS = [
+    "Papel A4", "Canetas", "Notebook com SSD", "Monitor 24 polegadas", "Cadeira Giratória",
+    "Mesa de Reunião", "Toner", "Switch 24 portas", "Nobreak", "Café", "Detergente",
+    "Licença Anual", "Teclado", "Mouse", "Armário de Aço", "Projetor",
+]
+PREFIXOS_FORNECEDOR = ["Papelaria", "Tech", "Comercial", "Distribuidora", "Serviços", "Soluções", "Infra"]
+SUFIXOS_FORNECEDOR = ["Brasil", "Central", "Planalto", "Cerrado", "Norte", "Capital", "Nacional"]
+DDDS = ["61", "62", "11", "21", "31", "71", "81"]
+CAIXAS_EMAIL = ("contato", "vendas", "comercial", "licitacoes")
+
+def _slug(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return "".join(c for c in texto.lower() if c.isalnum())
+
+def _fornecedor(indice: int) -> str:
+    prefixo = PREFIXOS_FORNECEDOR[indice % len(PREFIXOS_FORNECEDOR)]
+    sufixo = SUFIXOS_FORNECEDOR[(indice // len(PREFIXOS_FORNECEDOR)) % len(SUFIXOS_FORNECEDOR)]
+    return f"{prefixo} {sufixo} {indice:03d} Ltda"
+
+def _telefone(rng: random.Random) -> str:
+    return f"({rng.choice(DDDS)}) 9{rng.randint(1000, 9999)}-{rng.randint(0, 9999):04d}"
+
+@dataclass(frozen=True)
+class Distribuicao:
+    """Parâmetros da carteira gerada (intervalos inclusivos)"""
+    itens: Tuple[int, int] = (1, 8)
+    fornecedores: int = 500
+    # 0 = atas distribuídas igualmente; valores maiores concentram as atas nos
+    # primeiros fornecedores (peso 1 / posição ** concentracao, como uma lei de Zipf)
+    concentracao: float = 0.0
+    # Vigência em dias relativos a ``hoje`` (negativo = já vencida)
+    vigencia_dias: Tuple[int, int] = (-730, 1095)
+    telefones: Tuple[int, int] = (1, 2)
+    emails: Tuple[int, int] = (1, 2)
+
+    def __post_init__(self):
+        for nome in ("itens", "vigencia_dias", "telefones", "emails"):
+            minimo, maximo = getattr(self, nome)
+            if minimo > maximo:
+                raise ValueError(f"Intervalo inválido para {nome}: {minimo} > {maximo}")
+        if self.itens[0] < 1 or self.fornecedores < 1:
+            raise ValueError("Cada ata precisa de ao menos um item e um fornecedor")
+        if self.telefones[0] < 0 or self.emails[0] < 0 or self.emails[1] > len(CAIXAS_EMAIL):
+            raise ValueError(f"Telefones/e-mails fora do intervalo permitido (até {len(CAIXAS_EMAIL)} e-mails)")
+
+def iterar_atas(quantidade: int, semente: int = 0, hoje: Optional[date] = None,
+                distribuicao: Optional[Distribuicao] = None) -> Iterator[Dict[str, Any]]:
+    """Carteira sintética determinística (mesma semente, data e distribuição => mesmas atas).
+
+    Os dicionários seguem o formato de ``Ata.from_dict`` e são produzidos um a
+    um, permitindo importar carteiras grandes sem montá-las antes em memória.
+    """
+    distribuicao = distribuicao or Distribuicao()
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+    pesos = None
+    if distribuicao.concentracao > 0:
+        pesos = list(itertools.accumulate(
+            1 / (posicao + 1) ** distribuicao.concentracao for posicao in range(distribuicao.fornecedores)
+        ))
+    for indice in range(quantidade):
+        # Numeração sequencial única: 9999 atas por "ano" de numeração
+        ano = 2000 + indice // 9999
+        if pesos is None:
+            numero_fornecedor = rng.randrange(distribuicao.fornecedores)
+        else:
+            numero_fornecedor = rng.choices(range(distribuicao.fornecedores), cum_weights=pesos)[0]
+        fornecedor = _fornecedor(numero_fornecedor)
+        dominio = f"{_slug(fornecedor)}.com.br"
+        yield {
+            "numero_ata": f"{indice % 9999 + 1:04d}/{ano}",
+            "documento_sei": f"{rng.randint(10000, 99999)}.{rng.randint(0, 999999):06d}/{ano}-{rng.randint(0, 99):02d}",
+            "data_vigencia": (hoje + timedelta(days=rng.randint(*distribuicao.vigencia_dias))).isoformat(),
+            "objeto": f"{rng.choice(OBJETOS)} {indice}",
+            "itens": [
+                {
+                    "descricao": rng.choice(ITENS),
+                    "quantidade": rng.randint(1, 500),
+                    "valor": round(rng.uniform(5.0, 20000.0), 2),
+                }
+                for _ in range(rng.randint(*distribuicao.itens))
+            ],
+            "fornecedor": fornecedor,
+            "telefones_fornecedor": [_telefone(rng) for _ in range(rng.randint(*distribuicao.telefones))],
+            "emails_fornecedor": [f"{nome}@{dominio}" for nome in CAIXAS_EMAIL[:rng.randint(*distribuicao.emails)]],
+        }
+
+def gerar_atas(quantidade: int, semente: int = 0, hoje: Optional[date] = None,
+               distribuicao: Optional[Distribuicao] = None) -> List[Dict[str, Any]]:
+    """Lista com a carteira de ``iterar_atas``"""
+    return list(iterar_atas(quantidade, semente, hoje, distribuicao))
+
+def popular(ata_service, quantidade: int, semente: int = 0, hoje: Optional[date] = None,
+            distribuicao: Optional[Distribuicao] = None, substituir: bool = True) -> Dict[str, Any]:
+    """Grava a carteira no serviço (SQLite ou JSON) pela importação em lote"""
+    return ata_service.importar_atas(iterar_atas(quantidade, semente, hoje, distribuicao), substituir=substituir)
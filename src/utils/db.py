@@ -0,0 +1,20 @@
+import os
+import sqlite3
+
+# Espera máxima por um lock de escrita de outra conexão antes de "database is locked" (ms)
+BUSY_TIMEOUT_MS = int(os.environ.get("ATA_REGIS_BUSY_TIMEOUT_MS", "15000"))
+
+def conectar(db_file: str) -> sqlite3.Connection:
+    """Abre uma conexão ao banco compartilhado pelos serviços.
+
+    Cada processo abre várias conexões ao mesmo arquivo (atas, alertas,
+    relatórios, fila de emails, lease do agendador), e GUI e daemon podem
+    rodar juntos. Em modo WAL leituras não bloqueiam a escrita e vice-versa;
+    o ``busy_timeout`` faz escritas concorrentes esperarem a vez em vez de
+    falharem de imediato.
+    """
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    if db_file != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+    return conn
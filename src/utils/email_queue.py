@@ -0,0 +1,350 @@
+import itertools
+import os
+import smtplib
+import socket
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from utils.db import conectar
+from utils.metrics import cronometrar
+
+@dataclass
+class SMTPConfig:
+    """Configuração do servidor SMTP"""
+    host: str = "localhost"
+    port: int = 25
+    usuario: Optional[str] = None
+    senha: Optional[str] = None
+    remetente: str = "ata-regis@trf1.jus.br"
+    usar_tls: bool = False
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> Optional['SMTPConfig']:
+        """Lê a configuração das variáveis ATA_REGIS_SMTP_*; None se não configurado"""
+        host = os.environ.get("ATA_REGIS_SMTP_HOST")
+        if not host:
+            return None
+        return cls(
+            host=host,
+            port=int(os.environ.get("ATA_REGIS_SMTP_PORT", "25")),
+            usuario=os.environ.get("ATA_REGIS_SMTP_USER") or None,
+            senha=os.environ.get("ATA_REGIS_SMTP_PASSWORD") or None,
+            remetente=os.environ.get("ATA_REGIS_SMTP_FROM", cls.remetente),
+            usar_tls=os.environ.get("ATA_REGIS_SMTP_TLS", "0") == "1",
+        )
+
+class EmailOutbox:
+    """Caixa de saída durável de emails (tabela SQLite).
+
+    Vários processos (GUI, daemon, comandos da CLI) podem usar a mesma caixa:
+    cada lote é reservado por um único ``UPDATE`` condicional, com dono e
+    horário, e só reservas mais antigas que ``TEMPO_RESERVA`` voltam à fila.
+    """
+
+    # Reservas mais antigas que isso são de um processo interrompido (segundos)
+    TEMPO_RESERVA = 900
+
+    def __init__(self, db_file: str = "atas.db"):
+        self.db_file = db_file
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self._reservas = itertools.count(1)
+        self.conn = conectar(self.db_file)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        """Cria a tabela da caixa de saída se não existir."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS email_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    destinatario TEXT NOT NULL,
+                    assunto TEXT NOT NULL,
+                    corpo TEXT NOT NULL,
+                    corpo_html TEXT,
+                    status TEXT NOT NULL DEFAULT 'pendente',
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    proxima_tentativa REAL NOT NULL,
+                    criado_em TEXT NOT NULL,
+                    enviado_em TEXT,
+                    erro TEXT
+                )
+                """
+            )
+            colunas = {r["name"] for r in self.conn.execute("PRAGMA table_info(email_outbox)")}
+            # Bancos criados antes da reserva com dono
+            if "reservado_por" not in colunas:
+                self.conn.execute("ALTER TABLE email_outbox ADD COLUMN reservado_por TEXT")
+                self.conn.execute("ALTER TABLE email_outbox ADD COLUMN reservado_em REAL")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_email_outbox_status "
+                "ON email_outbox(status, proxima_tentativa)"
+            )
+
+    def enfileirar(self, destinatarios: List[str], assunto: str, corpo: str,
+                   corpo_html: Optional[str] = None) -> List[int]:
+        """Enfileira uma mensagem por destinatário e retorna os ids criados"""
+        agora = time.time()
+        criado_em = datetime.now().isoformat()
+        ids = []
+        with self._lock, self.conn:
+            for destinatario in destinatarios:
+                cur = self.conn.execute(
+                    "INSERT INTO email_outbox (destinatario, assunto, corpo, corpo_html, "
+                    "proxima_tentativa, criado_em) VALUES (?, ?, ?, ?, ?, ?)",
+                    (destinatario, assunto, corpo, corpo_html, agora, criado_em),
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    def reservar_lote(self, tamanho: int = 50) -> Tuple[Optional[str], List[sqlite3.Row]]:
+        """Reserva até ``tamanho`` mensagens prontas de um mesmo destinatário.
+
+        A seleção e a marcação são um único ``UPDATE``: dois processos nunca
+        reservam a mesma mensagem. Reservas expiradas contam como prontas.
+        """
+        agora = time.time()
+        reserva = f"{self.dono}:{next(self._reservas)}"
+        pronta = (
+            "((status='pendente' AND proxima_tentativa <= :agora) "
+            "OR (status='enviando' AND reservado_em < :expiracao))"
+        )
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"""
+                UPDATE email_outbox SET status='enviando', reservado_por=:reserva, reservado_em=:agora
+                WHERE id IN (
+                    SELECT id FROM email_outbox
+                    WHERE {pronta} AND destinatario = (
+                        SELECT destinatario FROM email_outbox WHERE {pronta} ORDER BY id LIMIT 1
+                    )
+                    ORDER BY id LIMIT :tamanho
+                )
+                """,
+                {"agora": agora, "expiracao": agora - self.TEMPO_RESERVA, "reserva": reserva, "tamanho": tamanho},
+            )
+            mensagens = self.conn.execute(
+                "SELECT * FROM email_outbox WHERE status='enviando' AND reservado_por=? ORDER BY id",
+                (reserva,),
+            ).fetchall()
+        if not mensagens:
+            return None, []
+        return mensagens[0]["destinatario"], mensagens
+
+    def marcar_enviada(self, id_mensagem: int):
+        """Marca a mensagem como enviada"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE email_outbox SET status='enviada', enviado_em=?, erro=NULL, "
+                "reservado_por=NULL, reservado_em=NULL WHERE id=?",
+                (datetime.now().isoformat(), id_mensagem),
+            )
+
+    def marcar_falha(self, ids: List[int], erro: str, max_tentativas: int, backoff_base: float):
+        """Reagenda as mensagens com backoff exponencial ou as marca como falhas"""
+        agora = time.time()
+        with self._lock, self.conn:
+            for id_mensagem in ids:
+                row = self.conn.execute(
+                    "SELECT tentativas FROM email_outbox WHERE id=?", (id_mensagem,)
+                ).fetchone()
+                if row is None:
+                    continue
+                tentativas = row["tentativas"] + 1
+                if tentativas >= max_tentativas:
+                    status, proxima = "falhou", agora
+                else:
+                    status, proxima = "pendente", agora + backoff_base * (2 ** (tentativas - 1))
+                self.conn.execute(
+                    "UPDATE email_outbox SET status=?, tentativas=?, proxima_tentativa=?, erro=?, "
+                    "reservado_por=NULL, reservado_em=NULL WHERE id=?",
+                    (status, tentativas, proxima, erro, id_mensagem),
+                )
+
+    def profundidade(self) -> int:
+        """Quantidade de mensagens aguardando envio"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM email_outbox WHERE status IN ('pendente', 'enviando')"
+            ).fetchone()
+        return row[0]
+
+    def contagem_por_status(self) -> Dict[str, int]:
+        """Quantidade de mensagens por status"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM email_outbox GROUP BY status"
+            ).fetchall()
+        return {r[0]: r[1] for r in rows}
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+
+class EmailQueueWorker:
+    """Pool de workers que esvazia a caixa de saída em lotes por destinatário"""
+
+    def __init__(self, outbox: EmailOutbox, config: SMTPConfig, num_workers: int = 2,
+                 tamanho_lote: int = 50, max_tentativas: int = 5, backoff_base: float = 30.0,
+                 intervalo_ocioso: float = 5.0,
+                 smtp_factory: Optional[Callable[[SMTPConfig], smtplib.SMTP]] = None):
+        self.outbox = outbox
+        self.config = config
+        self.num_workers = num_workers
+        self.tamanho_lote = tamanho_lote
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.intervalo_ocioso = intervalo_ocioso
+        self.smtp_factory = smtp_factory or self._conectar
+        self.running = False
+        self.threads: List[threading.Thread] = []
+        self._acordar = threading.Event()
+        self._lock = threading.Lock()
+        self._enviadas = 0
+        self._falhas = 0
+        self._envios_recentes: deque = deque()
+
+    def start(self):
+        """Inicia os workers"""
+        if self.running:
+            return
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._run_worker, daemon=True, name=f"email-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+        print(f"📧 Fila de emails iniciada ({self.num_workers} workers)")
+
+    def stop(self):
+        """Para os workers"""
+        self.running = False
+        self._acordar.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        print("📧 Fila de emails parada")
+
+    def notificar(self):
+        """Acorda os workers ociosos (nova mensagem enfileirada)"""
+        self._acordar.set()
+
+    def _run_worker(self):
+        """Loop de um worker"""
+        while self.running:
+            try:
+                if self.processar_lote() is None:
+                    self._acordar.wait(self.intervalo_ocioso)
+                    self._acordar.clear()
+            except Exception as e:
+                print(f"Erro na fila de emails: {e}")
+                time.sleep(1)
+
+    def processar_pendentes(self) -> int:
+        """Processa de forma síncrona todos os lotes prontos; retorna mensagens enviadas"""
+        total = 0
+        while True:
+            enviadas = self.processar_lote()
+            if enviadas is None:
+                return total
+            total += enviadas
+
+    def processar_lote(self) -> Optional[int]:
+        """Envia um lote de um destinatário usando uma única conexão SMTP.
+
+        Retorna a quantidade enviada ou None se não havia mensagens prontas.
+        """
+        destinatario, mensagens = self.outbox.reservar_lote(self.tamanho_lote)
+        if not mensagens:
+            return None
+
+        enviadas = 0
+        pendentes = [m["id"] for m in mensagens]
+        with cronometrar("email.smtp_lote") as medicao:
+            try:
+                smtp = self.smtp_factory(self.config)
+                try:
+                    for mensagem in mensagens:
+                        smtp.send_message(self._montar_mensagem(destinatario, mensagem))
+                        self.outbox.marcar_enviada(mensagem["id"])
+                        pendentes.remove(mensagem["id"])
+                        enviadas += 1
+                finally:
+                    try:
+                        smtp.quit()
+                    except smtplib.SMTPException:
+                        pass
+            except Exception as e:
+                medicao.erro = True
+                self.outbox.marcar_falha(pendentes, str(e), self.max_tentativas, self.backoff_base)
+                with self._lock:
+                    self._falhas += len(pendentes)
+                print(f"Erro ao enviar emails para {destinatario}: {e}")
+            medicao.linhas = enviadas
+
+        self._registrar_envios(enviadas)
+        return enviadas
+
+    def _conectar(self, config: SMTPConfig) -> smtplib.SMTP:
+        """Abre conexão SMTP conforme a configuração"""
+        smtp = smtplib.SMTP(config.host, config.port, timeout=config.timeout)
+        if config.usar_tls:
+            smtp.starttls()
+        if config.usuario:
+            smtp.login(config.usuario, config.senha or "")
+        return smtp
+
+    def _montar_mensagem(self, destinatario: str, mensagem: sqlite3.Row) -> EmailMessage:
+        """Converte a linha da caixa de saída em EmailMessage"""
+        msg = EmailMessage()
+        msg["From"] = self.config.remetente
+        msg["To"] = destinatario
+        msg["Subject"] = mensagem["assunto"]
+        msg["Date"] = formatdate(localtime=True)
+        msg["Message-ID"] = make_msgid(domain=self.config.remetente.split("@")[-1])
+        msg.set_content(mensagem["corpo"])
+        if mensagem["corpo_html"]:
+            msg.add_alternative(mensagem["corpo_html"], subtype="html")
+        return msg
+
+    def _registrar_envios(self, quantidade: int):
+        """Registra envios para o cálculo de vazão"""
+        agora = time.monotonic()
+        with self._lock:
+            self._enviadas += quantidade
+            if quantidade:
+                self._envios_recentes.append((agora, quantidade))
+            while self._envios_recentes and agora - self._envios_recentes[0][0] > 60:
+                self._envios_recentes.popleft()
+
+    def get_metricas(self) -> Dict[str, Any]:
+        """Retorna profundidade da fila e vazão de envio"""
+        self._registrar_envios(0)
+        with self._lock:
+            ultimo_minuto = sum(q for _, q in self._envios_recentes)
+            return {
+                "profundidade": self.outbox.profundidade(),
+                "enviadas": self._enviadas,
+                "falhas": self._falhas,
+                "mensagens_por_segundo": ultimo_minuto / 60.0,
+                "workers_ativos": sum(1 for t in self.threads if t.is_alive()),
+            }
+
+def criar_fila_email(db_file: str) -> Tuple[Optional[EmailOutbox], Optional[EmailQueueWorker]]:
+    """Cria caixa de saída e workers se houver SMTP configurado no ambiente"""
+    config = SMTPConfig.from_env()
+    if config is None:
+        return None, None
+    outbox = EmailOutbox(db_file)
+    return outbox, EmailQueueWorker(outbox, config)
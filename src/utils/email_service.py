@@ -1,101 +1,158 @@
+import sys
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 from models.ata import Ata
+from utils import templates
+from utils.email_queue import EmailOutbox
+from utils.metrics import instrumentado
+from utils.validators import Formatters
 
 class EmailService:
-    """Serviço para envio de emails (simulado com print)"""
+    """Serviço para envio de emails (simulado com print ou via caixa de saída SMTP)"""
     
-    def __init__(self):
+    def __init__(self, outbox: Optional[EmailOutbox] = None):
+        self.outbox = outbox
         self.destinatarios_padrao = [
             "diatu@trf1.jus.br",
             "seae1@trf1.jus.br"
         ]
     
-    def enviar_alerta_vencimento(self, ata: Ata, destinatarios: List[str] = None) -> bool:
-        """Envia alerta de vencimento de ata (simulado com print)"""
+    @instrumentado("email.entregar")
+    def _entregar(self, titulo: str, destinatarios: List[str], assunto: str, corpo: str,
+                  corpo_html: Optional[str] = None) -> bool:
+        """Enfileira a mensagem na caixa de saída ou simula o envio no console"""
+        if self.outbox is not None:
+            self.outbox.enfileirar(destinatarios, assunto, corpo, corpo_html)
+            return True
+        
+        separador = "=" * 50
+        sys.stdout.write(
+            f"\n{separador}\n{titulo}\n{separador}\n"
+            f"Para: {', '.join(destinatarios)}\n"
+            f"Assunto: {assunto}\n"
+            f"Data/Hora: {Formatters.formatar_data_brasileira(date.today())}\n"
+            f"{corpo}\n{separador}\n\n"
+        )
+        return True
+    
+    def enviar_alerta_vencimento(self, ata: Ata, destinatarios: List[str] = None,
+                                 hoje: Optional[date] = None) -> bool:
+        """Envia alerta de vencimento de ata (dias contados a partir de ``hoje``)"""
         if destinatarios is None:
             destinatarios = self.destinatarios_padrao
+        if hoje is None:
+            hoje = date.today()
         
         try:
-            print(f"\n{'='*50}")
-            print("SIMULAÇÃO DE ENVIO DE EMAIL")
-            print(f"{'='*50}")
-            print(f"Para: {', '.join(destinatarios)}")
-            print(f"Assunto: Ata {ata.numero_ata} próxima do vencimento")
-            print(f"Data/Hora: {date.today().strftime('%d/%m/%Y')}")
-            print(f"\nMensagem:")
-            print(f"A Ata de Registro de Preços {ata.numero_ata} está próxima do vencimento.")
-            print(f"\nDetalhes da Ata:")
-            print(f"- Número: {ata.numero_ata}")
-            print(f"- SEI: {ata.documento_sei}")
-            print(f"- Objeto: {ata.objeto}")
-            print(f"- Fornecedor: {ata.fornecedor}")
-            print(f"- Data de Vencimento: {ata.data_vigencia.strftime('%d/%m/%Y')}")
-            print(f"- Dias Restantes: {ata.dias_restantes}")
-            print(f"- Status: {ata.status.replace('_', ' ').title()}")
-            print(f"\nValor Total da Ata: R$ {ata.valor_total:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-            
-            print(f"\nItens da Ata:")
-            for i, item in enumerate(ata.itens, 1):
-                valor_formatado = f"R$ {item.valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-                valor_total_formatado = f"R$ {item.valor_total:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-                print(f"{i}. {item.descricao}")
-                print(f"   Quantidade: {item.quantidade}")
-                print(f"   Valor Unitário: {valor_formatado}")
-                print(f"   Valor Total: {valor_total_formatado}")
-            
-            print(f"\nContatos do Fornecedor:")
-            if ata.telefones_fornecedor:
-                print(f"Telefones: {', '.join(ata.telefones_fornecedor)}")
-            if ata.emails_fornecedor:
-                print(f"E-mails: {', '.join(ata.emails_fornecedor)}")
+            dias_restantes = (ata.data_vigencia - hoje).days
+            situacao = templates.situacao_alerta([dias_restantes])
+            brl = Formatters.formatar_valor_monetario
+            itens = [
+                {
+                    "indice": i,
+                    "descricao": item.descricao,
+                    "quantidade": item.quantidade,
+                    "valor": brl(item.valor),
+                    "valor_total": brl(item.valor_total),
+                }
+                for i, item in enumerate(ata.itens, 1)
+            ]
+            contatos_fornecedor = [
+                {"rotulo": rotulo, "valores": ", ".join(valores)}
+                for rotulo, valores in (("Telefones", ata.telefones_fornecedor), ("E-mails", ata.emails_fornecedor))
+                if valores
+            ]
+            contatos = "".join(f"{contato['rotulo']}: {contato['valores']}\n" for contato in contatos_fornecedor)
+            contexto = {
+                "numero_ata": ata.numero_ata,
+                "documento_sei": ata.documento_sei,
+                "objeto": ata.objeto,
+                "fornecedor": ata.fornecedor,
+                "data_vencimento": Formatters.formatar_data_brasileira(ata.data_vigencia),
+                "dias_restantes": dias_restantes,
+                "situacao": situacao,
+                "status": ata.status.replace('_', ' ').title(),
+                "valor_total": brl(ata.valor_total),
+            }
+            corpo = templates.ALERTA_VENCIMENTO_TEXTO.render(
+                contexto, itens=templates.ALERTA_ITEM_TEXTO.render_many(itens), contatos=contatos
+            )
+            corpo_html = templates.ALERTA_VENCIMENTO_HTML.render(
+                contexto,
+                itens=templates.ALERTA_ITEM_HTML.render_many(itens),
+                contatos=templates.ALERTA_CONTATO_HTML.render_many(contatos_fornecedor),
+            )
             
-            print(f"\nEste é um alerta automático do Sistema de Atas de Registro de Preços.")
-            print(f"Por favor, tome as providências necessárias.")
-            print(f"{'='*50}\n")
-            
-            return True
+            return self._entregar(
+                "SIMULAÇÃO DE ENVIO DE EMAIL",
+                destinatarios,
+                f"Ata {ata.numero_ata} {situacao}",
+                corpo,
+                corpo_html,
+            )
             
         except Exception as e:
             print(f"Erro ao enviar email: {e}")
             return False
     
-    def enviar_alerta_multiplas_atas(self, atas: List[Ata], destinatarios: List[str] = None) -> bool:
-        """Envia alerta para múltiplas atas próximas do vencimento"""
+    def enviar_alerta_multiplas_atas(self, atas: List[Ata], destinatarios: List[str] = None,
+                                     tipo_alerta: Optional[str] = None,
+                                     hoje: Optional[date] = None) -> bool:
+        """Envia alerta para múltiplas atas (dias contados a partir de ``hoje``)"""
         if destinatarios is None:
             destinatarios = self.destinatarios_padrao
+        if hoje is None:
+            hoje = date.today()
         
         if not atas:
             return False
         
         try:
-            print(f"\n{'='*50}")
-            print("SIMULAÇÃO DE ENVIO DE EMAIL - MÚLTIPLAS ATAS")
-            print(f"{'='*50}")
-            print(f"Para: {', '.join(destinatarios)}")
-            print(f"Assunto: {len(atas)} atas próximas do vencimento")
-            print(f"Data/Hora: {date.today().strftime('%d/%m/%Y')}")
-            print(f"\nMensagem:")
-            print(f"Existem {len(atas)} atas próximas do vencimento que requerem atenção:")
-            
+            linhas = []
             for i, ata in enumerate(atas, 1):
-                print(f"\n{i}. Ata {ata.numero_ata}")
-                print(f"   Objeto: {ata.objeto}")
-                print(f"   Fornecedor: {ata.fornecedor}")
-                print(f"   Vencimento: {ata.data_vigencia.strftime('%d/%m/%Y')}")
-                print(f"   Dias Restantes: {ata.dias_restantes}")
-                
-                if ata.dias_restantes <= 30:
-                    print(f"   ⚠️ ATENÇÃO: Vencimento em menos de 30 dias!")
-                elif ata.dias_restantes <= 7:
-                    print(f"   🚨 URGENTE: Vencimento em menos de 7 dias!")
+                dias_restantes = (ata.data_vigencia - hoje).days
+                if dias_restantes < 0:
+                    aviso = f"❌ VENCIDA há {-dias_restantes} dias"
+                elif dias_restantes <= 7:
+                    aviso = "🚨 URGENTE: Vencimento em menos de 7 dias!"
+                elif dias_restantes <= 30:
+                    aviso = "⚠️ ATENÇÃO: Vencimento em menos de 30 dias!"
+                else:
+                    aviso = ""
+                linhas.append({
+                    "indice": i,
+                    "numero_ata": ata.numero_ata,
+                    "objeto": ata.objeto,
+                    "fornecedor": ata.fornecedor,
+                    "data_vencimento": Formatters.formatar_data_brasileira(ata.data_vigencia),
+                    "dias_restantes": dias_restantes,
+                    "aviso": aviso,
+                })
+            situacao = templates.situacao_alerta((linha["dias_restantes"] for linha in linhas), plural=True)
+            corpo = templates.ALERTA_MULTIPLAS_TEXTO.render(
+                quantidade=len(atas),
+                situacao=situacao,
+                atas=templates.ALERTA_MULTIPLAS_ATA_TEXTO.render_many(
+                    {**linha, "aviso": f"   {linha['aviso']}\n" if linha["aviso"] else ""} for linha in linhas
+                ),
+            )
+            corpo_html = templates.ALERTA_MULTIPLAS_HTML.render(
+                quantidade=len(atas),
+                situacao=situacao,
+                atas=templates.ALERTA_MULTIPLAS_ATA_HTML.render_many(linhas),
+            )
             
-            print(f"\nEste é um alerta automático do Sistema de Atas de Registro de Preços.")
-            print(f"Por favor, tome as providências necessárias para cada ata listada.")
-            print(f"{'='*50}\n")
-            
-            return True
+            assunto = f"{len(atas)} atas {situacao}"
+            if tipo_alerta:
+                assunto = f"[{tipo_alerta}] {assunto}"
+            return self._entregar(
+                "SIMULAÇÃO DE ENVIO DE EMAIL - MÚLTIPLAS ATAS",
+                destinatarios,
+                assunto,
+                corpo,
+                corpo_html,
+            )
             
         except Exception as e:
             print(f"Erro ao enviar email: {e}")
@@ -108,46 +165,69 @@ class EmailService:
             destinatarios = self.destinatarios_padrao
         
         try:
-            print(f"\n{'='*50}")
-            print("SIMULAÇÃO DE ENVIO DE EMAIL - RELATÓRIO SEMANAL")
-            print(f"{'='*50}")
-            print(f"Para: {', '.join(destinatarios)}")
-            print(f"Assunto: Relatório Semanal - Atas de Registro de Preços")
-            print(f"Data/Hora: {date.today().strftime('%d/%m/%Y')}")
-            print(f"\nRelatório Semanal - Status das Atas:")
-            
-            total_atas = atas_vigentes + atas_a_vencer + atas_vencidas
-            print(f"\nResumo Geral:")
-            print(f"- Total de Atas: {total_atas}")
-            print(f"- Vigentes: {atas_vigentes} ({(atas_vigentes/total_atas*100):.1f}%)" if total_atas > 0 else "- Vigentes: 0")
-            print(f"- A Vencer (≤90 dias): {atas_a_vencer} ({(atas_a_vencer/total_atas*100):.1f}%)" if total_atas > 0 else "- A Vencer: 0")
-            print(f"- Vencidas: {atas_vencidas} ({(atas_vencidas/total_atas*100):.1f}%)" if total_atas > 0 else "- Vencidas: 0")
+            contexto = templates.contexto_resumo(
+                {"vigente": atas_vigentes, "a_vencer": atas_a_vencer, "vencida": atas_vencidas}
+            )
+            linhas = [
+                {"numero_ata": ata.numero_ata, "objeto": ata.objeto, "dias": ata.dias_restantes}
+                for ata in atas_proximas[:10]  # Limita a 10 atas
+            ]
+            proximas = templates.LINHA_VENCE_EM_TEXTO.render_many(linhas)
+            if len(atas_proximas) > 10:
+                proximas += f"... e mais {len(atas_proximas) - 10} atas\n"
             
-            if atas_proximas:
-                print(f"\nAtas que requerem atenção especial:")
-                for ata in atas_proximas[:10]:  # Limita a 10 atas
-                    print(f"- {ata.numero_ata}: {ata.objeto} (vence em {ata.dias_restantes} dias)")
-                
-                if len(atas_proximas) > 10:
-                    print(f"... e mais {len(atas_proximas) - 10} atas")
+            corpo = templates.RELATORIO_SEMANAL_TEXTO.render(
+                contexto, proximas=templates.secao("Atas que requerem atenção especial:", proximas)
+            )
+            corpo_html = templates.RELATORIO_SEMANAL_HTML.render(
+                contexto,
+                proximas=templates.secao(
+                    "Atas que requerem atenção especial",
+                    templates.LINHA_VENCE_EM_HTML.render_many(linhas),
+                    html=True,
+                ),
+            )
             
-            print(f"\nEste relatório é gerado automaticamente pelo Sistema de Atas de Registro de Preços.")
-            print(f"{'='*50}\n")
-            
-            return True
+            return self._entregar(
+                "SIMULAÇÃO DE ENVIO DE EMAIL - RELATÓRIO SEMANAL",
+                destinatarios,
+                "Relatório Semanal - Atas de Registro de Preços",
+                corpo,
+                corpo_html,
+            )
             
         except Exception as e:
             print(f"Erro ao enviar relatório: {e}")
             return False
     
+    def enviar_relatorio_mensal(self, corpo: str, corpo_html: Optional[str] = None,
+                                destinatarios: List[str] = None) -> bool:
+        """Envia o relatório mensal já renderizado"""
+        if destinatarios is None:
+            destinatarios = self.destinatarios_padrao
+        
+        try:
+            return self._entregar(
+                "SIMULAÇÃO DE ENVIO DE EMAIL - RELATÓRIO MENSAL",
+                destinatarios,
+                "Relatório Mensal - Atas de Registro de Preços",
+                corpo,
+                corpo_html,
+            )
+        except Exception as e:
+            print(f"Erro ao enviar relatório: {e}")
+            return False
+    
     def testar_configuracao(self) -> bool:
         """Testa a configuração do serviço de email"""
+        modo = "fila SMTP" if self.outbox is not None else "modo simulação"
         print(f"\n{'='*50}")
         print("TESTE DE CONFIGURAÇÃO DE EMAIL")
         print(f"{'='*50}")
         print(f"Destinatários padrão: {', '.join(self.destinatarios_padrao)}")
-        print(f"Status: Configuração OK (modo simulação)")
-        print(f"Data/Hora: {date.today().strftime('%d/%m/%Y')}")
+        print(f"Status: Configuração OK ({modo})")
+        if self.outbox is not None:
+            print(f"Mensagens na fila: {self.outbox.profundidade()}")
+        print(f"Data/Hora: {Formatters.formatar_data_brasileira(date.today())}")
         print(f"{'='*50}\n")
         return True
-
@@ -0,0 +1,138 @@
+import gc
+import json
+import os
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, List, Optional, Type
+
+from models.ata import Ata, Item
+
+# Dependências opcionais: o codec mais rápido disponível é escolhido por padrão
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depende do ambiente
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+@contextmanager
+def _sem_coleta_ciclica():
+    """Suspende o GC cíclico enquanto milhares de objetos (sem ciclos) são criados"""
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+class CodecAtas:
+    """Converte a lista de atas de/para o conteúdo do ``atas.json``.
+
+    Todos os codecs leem e gravam o mesmo formato (JSON UTF-8 indentado com
+    2 espaços); na leitura as atas são tratadas como confiáveis (gravadas
+    por ``save_data``) e não são revalidadas. Erros de formato levantam
+    ``ValueError``.
+    """
+
+    nome = "base"
+
+    def decodificar(self, conteudo: bytes) -> List[Ata]:
+        with _sem_coleta_ciclica():
+            return self._decodificar(conteudo)
+
+    def _decodificar(self, conteudo: bytes) -> List[Ata]:
+        raise NotImplementedError
+
+    def codificar(self, atas: List[Ata]) -> bytes:
+        raise NotImplementedError
+
+class CodecStdlib(CodecAtas):
+    """``json`` da biblioteca padrão (sempre disponível)"""
+
+    nome = "json"
+
+    def _decodificar(self, conteudo: bytes) -> List[Ata]:
+        return [Ata.from_dict(dados, validar=False) for dados in json.loads(conteudo)]
+
+    def codificar(self, atas: List[Ata]) -> bytes:
+        return json.dumps([ata.to_dict() for ata in atas], ensure_ascii=False, indent=2).encode("utf-8")
+
+class CodecOrjson(CodecAtas):
+    """``orjson``: parser/serializador em Rust, mesmo fluxo de dicionários"""
+
+    nome = "orjson"
+
+    def _decodificar(self, conteudo: bytes) -> List[Ata]:
+        return [Ata.from_dict(dados, validar=False) for dados in orjson.loads(conteudo)]
+
+    def codificar(self, atas: List[Ata]) -> bytes:
+        return orjson.dumps([ata.to_dict() for ata in atas], option=orjson.OPT_INDENT_2)
+
+if msgspec is not None:
+    # Structs intermediárias descartadas após a conversão: sem rastreio do GC
+    class _ItemJson(msgspec.Struct, gc=False):
+        descricao: str
+        quantidade: int
+        valor: float
+
+    class _AtaJson(msgspec.Struct, gc=False):
+        numero_ata: str
+        documento_sei: str
+        data_vigencia: date
+        objeto: str
+        itens: List[_ItemJson] = []
+        fornecedor: str = ""
+        telefones_fornecedor: List[str] = []
+        emails_fornecedor: List[str] = []
+
+class CodecMsgspec(CodecAtas):
+    """``msgspec``: decodificação tipada direto para structs (datas ISO incluídas)"""
+
+    nome = "msgspec"
+
+    def __init__(self):
+        self._decoder = msgspec.json.Decoder(List[_AtaJson])
+        self._encoder = msgspec.json.Encoder()
+
+    def _decodificar(self, conteudo: bytes) -> List[Ata]:
+        return [
+            Ata.from_trusted(
+                a.numero_ata,
+                a.documento_sei,
+                a.data_vigencia,
+                a.objeto,
+                [Item.from_trusted(i.descricao, i.quantidade, i.valor) for i in a.itens],
+                a.fornecedor,
+                a.telefones_fornecedor,
+                a.emails_fornecedor,
+            )
+            for a in self._decoder.decode(conteudo)
+        ]
+
+    def codificar(self, atas: List[Ata]) -> bytes:
+        return msgspec.json.format(self._encoder.encode([ata.to_dict() for ata in atas]), indent=2)
+
+CODECS: Dict[str, Type[CodecAtas]] = {"json": CodecStdlib}
+if orjson is not None:
+    CODECS["orjson"] = CodecOrjson
+if msgspec is not None:
+    CODECS["msgspec"] = CodecMsgspec
+
+# Ordem de preferência quando nenhum codec é pedido
+_PREFERENCIA = ("msgspec", "orjson", "json")
+
+def obter_codec(nome: Optional[str] = None) -> CodecAtas:
+    """Codec pedido (ou ``$ATA_REGIS_CODEC``), senão o mais rápido instalado"""
+    nome = nome or os.environ.get("ATA_REGIS_CODEC")
+    if nome:
+        if nome not in CODECS:
+            raise ValueError(f"Codec '{nome}' indisponível; instalados: {', '.join(CODECS)}")
+        return CODECS[nome]()
+    for preferido in _PREFERENCIA:
+        if preferido in CODECS:
+            return CODECS[preferido]()
+    return CodecStdlib()
@@ -0,0 +1,241 @@
+import atexit
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Optional
+
+# Limites superiores (segundos) das faixas do histograma de latência
+FAIXAS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Serie:
+    """Histograma de latência, chamadas, erros e linhas de uma operação"""
+
+    __slots__ = ("faixas", "contagem", "soma", "maximo", "erros", "linhas")
+
+    def __init__(self):
+        # Uma posição por faixa e a última para valores acima de FAIXAS[-1]
+        self.faixas = [0] * (len(FAIXAS) + 1)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+        self.erros = 0
+        self.linhas = 0
+
+    def quantil(self, fracao: float) -> float:
+        """Estimativa do quantil: limite superior da faixa que o contém"""
+        alvo = fracao * self.contagem
+        acumulado = 0
+        for limite, quantidade in zip(FAIXAS, self.faixas):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(limite, self.maximo)
+        return self.maximo
+
+class Medicao:
+    """Valor de ``with cronometrar(...)``: ``linhas`` e ``erro`` podem ser ajustados no bloco"""
+
+    __slots__ = ("metricas", "nome", "inicio", "linhas", "erro")
+
+    def __init__(self, metricas: 'Metricas', nome: str):
+        self.metricas = metricas
+        self.nome = nome
+        self.linhas: Optional[int] = None
+        self.erro = False
+
+    def __enter__(self) -> 'Medicao':
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, rastreio):
+        self.metricas.registrar(
+            self.nome, time.perf_counter() - self.inicio, self.linhas, self.erro or tipo is not None
+        )
+        return False
+
+class _MedicaoInativa:
+    """Usada quando as métricas estão desligadas: não mede nem registra nada"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreio):
+        return False
+
+    def __setattr__(self, nome, valor):
+        pass
+
+_INATIVA = _MedicaoInativa()
+
+class Metricas:
+    """Registro em memória das operações instrumentadas.
+
+    Ativado pela variável ``ATA_REGIS_METRICAS``: com ``1`` as métricas ficam
+    só em memória (painel Desempenho das Configurações); com um caminho são
+    também exportadas periodicamente nesse arquivo, em JSON se terminar em
+    ``.json`` e no formato texto do Prometheus nos demais casos (ex.:
+    ``ata_regis.prom`` para o textfile collector do node_exporter).
+    Desligado, ``instrumentado`` e ``cronometrar`` custam uma verificação
+    de atributo por chamada.
+    """
+
+    def __init__(self, destino: Optional[str] = None, intervalo: float = 15.0):
+        self.ativo = bool(destino) and destino != "0"
+        self.destino = destino if self.ativo and destino != "1" else None
+        self.intervalo = intervalo
+        self._series: Dict[str, Serie] = {}
+        self._lock = threading.Lock()
+        self._exportador: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+
+    def registrar(self, nome: str, duracao: float, linhas: Optional[int] = None, erro: bool = False):
+        with self._lock:
+            serie = self._series.get(nome)
+            if serie is None:
+                serie = self._series[nome] = Serie()
+            serie.faixas[bisect_left(FAIXAS, duracao)] += 1
+            serie.contagem += 1
+            serie.soma += duracao
+            if duracao > serie.maximo:
+                serie.maximo = duracao
+            if erro:
+                serie.erros += 1
+            if linhas:
+                serie.linhas += linhas
+
+    def cronometrar(self, nome: str):
+        """Context manager que mede o bloco: ``with cronometrar("x") as m: m.linhas = n``"""
+        if not self.ativo:
+            return _INATIVA
+        return Medicao(self, nome)
+
+    def instrumentado(self, nome: str, linhas: Optional[Callable[[Any], int]] = None):
+        """Decorador que mede cada chamada; ``linhas`` extrai a quantidade de linhas do retorno"""
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def envoltorio(*args, **kwargs):
+                if not self.ativo:
+                    return funcao(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    resultado = funcao(*args, **kwargs)
+                except BaseException:
+                    self.registrar(nome, time.perf_counter() - inicio, erro=True)
+                    raise
+                self.registrar(nome, time.perf_counter() - inicio,
+                               linhas(resultado) if linhas and resultado is not None else None)
+                return resultado
+            return envoltorio
+        return decorador
+
+    def limpar(self):
+        with self._lock:
+            self._series.clear()
+
+    def resumo(self) -> Dict[str, Dict[str, Any]]:
+        """Operações medidas, da maior para a menor latência acumulada"""
+        with self._lock:
+            series = [(nome, serie, list(serie.faixas)) for nome, serie in self._series.items()]
+        resumo = {}
+        for nome, serie, faixas in sorted(series, key=lambda item: -item[1].soma):
+            resumo[nome] = {
+                "chamadas": serie.contagem,
+                "erros": serie.erros,
+                "linhas": serie.linhas,
+                "total_s": serie.soma,
+                "media_ms": serie.soma / serie.contagem * 1000,
+                "p50_ms": serie.quantil(0.50) * 1000,
+                "p95_ms": serie.quantil(0.95) * 1000,
+                "max_ms": serie.maximo * 1000,
+                "faixas": dict(zip([str(limite) for limite in FAIXAS] + ["+Inf"], faixas)),
+            }
+        return resumo
+
+    def prometheus(self) -> str:
+        """Métricas no formato texto de exposição do Prometheus"""
+        linhas = [
+            "# HELP ata_regis_duracao_segundos Latência das operações instrumentadas",
+            "# TYPE ata_regis_duracao_segundos histogram",
+        ]
+        resumo = self.resumo()
+        for nome, dados in resumo.items():
+            rotulo = nome.replace("\\", "\\\\").replace('"', '\\"')
+            acumulado = 0
+            for limite, quantidade in dados["faixas"].items():
+                acumulado += quantidade
+                linhas.append(f'ata_regis_duracao_segundos_bucket{{operacao="{rotulo}",le="{limite}"}} {acumulado}')
+            linhas.append(f'ata_regis_duracao_segundos_sum{{operacao="{rotulo}"}} {dados["total_s"]:.6f}')
+            linhas.append(f'ata_regis_duracao_segundos_count{{operacao="{rotulo}"}} {dados["chamadas"]}')
+        for metrica, campo, descricao in (
+            ("ata_regis_erros_total", "erros", "Chamadas encerradas com erro"),
+            ("ata_regis_linhas_total", "linhas", "Linhas (atas, alertas, destinatários) processadas"),
+        ):
+            linhas += [f"# HELP {metrica} {descricao}", f"# TYPE {metrica} counter"]
+            for nome, dados in resumo.items():
+                rotulo = nome.replace("\\", "\\\\").replace('"', '\\"')
+                linhas.append(f'{metrica}{{operacao="{rotulo}"}} {dados[campo]}')
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, caminho: Optional[str] = None):
+        """Grava as métricas de forma atômica (JSON se ``.json``, senão Prometheus)"""
+        caminho = caminho or self.destino
+        if not caminho:
+            return
+        if caminho.endswith(".json"):
+            conteudo = json.dumps({"gerado_em": time.time(), "operacoes": self.resumo()},
+                                  ensure_ascii=False, indent=2)
+        else:
+            conteudo = self.prometheus()
+        # Temporário exclusivo no mesmo diretório: GUI e daemon podem exportar no mesmo caminho
+        descritor, temporario = tempfile.mkstemp(prefix=".metricas-", dir=os.path.dirname(caminho) or ".")
+        try:
+            with os.fdopen(descritor, "w", encoding="utf-8") as f:
+                f.write(conteudo)
+            # mkstemp cria o arquivo só para o dono; o coletor (node_exporter) pode ser outro usuário
+            os.chmod(temporario, 0o644)
+            os.replace(temporario, caminho)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+    def iniciar_exportacao(self):
+        """Exporta para ``destino`` a cada ``intervalo`` segundos (uma thread por processo)"""
+        with self._lock:
+            if not self.destino or self._exportador is not None:
+                return
+            self._exportador = threading.Thread(target=self._exportar_periodicamente, daemon=True)
+        self._exportador.start()
+
+    def _exportar_periodicamente(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.exportar()
+            except OSError as e:
+                print(f"Erro ao exportar métricas: {e}")
+
+    def parar_exportacao(self):
+        """Encerra a exportação periódica gravando o estado final"""
+        with self._lock:
+            exportador, self._exportador = self._exportador, None
+        if exportador is None:
+            return
+        self._parar.set()
+        exportador.join()
+        self._parar.clear()
+        try:
+            self.exportar()
+        except OSError as e:
+            print(f"Erro ao exportar métricas: {e}")
+
+METRICAS = Metricas(
+    os.environ.get("ATA_REGIS_METRICAS"),
+    float(os.environ.get("ATA_REGIS_METRICAS_INTERVALO", "15")),
+)
+instrumentado = METRICAS.instrumentado
+cronometrar = METRICAS.cronometrar
+atexit.register(METRICAS.parar_exportacao)
@@ -1,44 +1,127 @@
+import os
+import socket
+import sqlite3
 import threading
 import time
-from datetime import datetime, time as dt_time
-from typing import Callable, Dict, Any
+from datetime import date, datetime, time as dt_time
+from typing import Callable, Dict, Any, List, Optional
 
 from services.alert_service import AlertService
+from services.events import EventoDados, ATA_CRIADA, ATA_ATUALIZADA
 from services.ata_service import AtaService
+from services.report_service import ReportService
+from utils.db import conectar
+from utils.metrics import cronometrar
 
 class TaskScheduler:
     """Agendador de tarefas para verificações automáticas"""
     
-    def __init__(self, ata_service: AtaService, alert_service: AlertService):
+    # Duração da posse do agendador no banco; renovada a cada ciclo do loop
+    DURACAO_LEASE = 900
+    
+    def __init__(self, ata_service: AtaService, alert_service: AlertService,
+                 report_service: Optional[ReportService] = None, dono: Optional[str] = None):
         self.ata_service = ata_service
         self.alert_service = alert_service
+        self.report_service = report_service or ReportService(alert_service.db_file)
         self.running = False
         self.thread = None
         self.tasks = {}
+        self.dono = dono or f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self._parar = threading.Event()
+        self.ultima_verificacao_diaria: Optional[date] = None
+        self._cancelar_assinatura: Optional[Callable[[], None]] = None
+        self.conn = conectar(alert_service.db_file)
+        self._create_tables()
+    
+    def _create_tables(self):
+        """Cria a tabela de posse do agendador se não existir."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS agendador_lease (
+                    nome TEXT PRIMARY KEY,
+                    dono TEXT NOT NULL,
+                    expira_em REAL NOT NULL
+                )
+                """
+            )
+    
+    def adquirir_lease(self) -> bool:
+        """Assume (ou renova) a posse do agendador; só o dono executa as tarefas.
         
+        Evita que várias instâncias (daemon e clientes GUI) usando o mesmo banco
+        enviem alertas e relatórios duplicados.
+        """
+        agora = time.time()
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO agendador_lease (nome, dono, expira_em) VALUES ('agendador', ?, ?)
+                ON CONFLICT(nome) DO UPDATE SET dono=excluded.dono, expira_em=excluded.expira_em
+                WHERE agendador_lease.dono=excluded.dono OR agendador_lease.expira_em < ?
+                """,
+                (self.dono, agora + self.DURACAO_LEASE, agora),
+            )
+            row = self.conn.execute(
+                "SELECT dono FROM agendador_lease WHERE nome='agendador'"
+            ).fetchone()
+        return row is not None and row[0] == self.dono
+    
+    def liberar_lease(self):
+        """Libera a posse do agendador, se for o dono"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM agendador_lease WHERE nome='agendador' AND dono=?", (self.dono,)
+            )
+    
+    def _dono_atual(self) -> Optional[str]:
+        """Instância que detém a posse do agendador (se ainda válida)"""
+        row = self.conn.execute(
+            "SELECT dono FROM agendador_lease WHERE nome='agendador' AND expira_em >= ?",
+            (time.time(),),
+        ).fetchone()
+        return row[0] if row else None
+    
     def start(self):
         """Inicia o agendador"""
         if not self.running:
             self.running = True
+            self._parar.clear()
             self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
             self.thread.start()
+            eventos = getattr(self.ata_service, "eventos", None)
+            if eventos is not None:
+                self._cancelar_assinatura = eventos.assinar(
+                    self._on_atas_alteradas, janela=1.0, tipos=(ATA_CRIADA, ATA_ATUALIZADA)
+                )
             print("📅 Agendador de tarefas iniciado")
     
     def stop(self):
         """Para o agendador"""
         self.running = False
+        self._parar.set()
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
+            self._cancelar_assinatura = None
         if self.thread:
             self.thread.join()
+            self.thread = None
+        self.liberar_lease()
         print("📅 Agendador de tarefas parado")
     
     def _run_scheduler(self):
         """Loop principal do agendador"""
-        last_daily_check = None
         last_weekly_check = None
         last_monthly_check = None
         
         while self.running:
             try:
+                # Outra instância é dona do agendador: apenas aguarda
+                if not self.adquirir_lease():
+                    self._parar.wait(300)
+                    continue
+                
                 now = datetime.now()
                 current_date = now.date()
                 current_time = now.time()
@@ -46,10 +129,10 @@ class TaskScheduler:
                 # Verificação diária às 09:00
                 if (current_time >= dt_time(9, 0) and 
                     current_time <= dt_time(9, 5) and 
-                    last_daily_check != current_date):
+                    self.ultima_verificacao_diaria != current_date):
                     
                     self._executar_verificacao_diaria()
-                    last_daily_check = current_date
+                    self.ultima_verificacao_diaria = current_date
                 
                 # Verificação semanal (segunda-feira às 08:00)
                 if (now.weekday() == 0 and  # Segunda-feira
@@ -70,113 +153,157 @@ class TaskScheduler:
                     last_monthly_check = current_date
                 
                 # Aguarda 5 minutos antes da próxima verificação
-                time.sleep(300)  # 5 minutos
+                self._parar.wait(300)  # 5 minutos
                 
             except Exception as e:
                 print(f"Erro no agendador: {e}")
-                time.sleep(60)  # Aguarda 1 minuto em caso de erro
+                self._parar.wait(60)  # Aguarda 1 minuto em caso de erro
     
     def _executar_verificacao_diaria(self):
         """Executa verificação diária de alertas"""
-        try:
-            print(f"\n🔍 Executando verificação diária - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            
-            atas = self.ata_service.listar_todas()
-            resultado = self.alert_service.verificar_alertas_automaticos(atas)
-            
-            print(f"✅ Verificação diária concluída:")
-            print(f"   - Alertas enviados: {resultado['alertas_enviados']}")
-            print(f"   - Atas alertadas: {len(resultado['atas_alertadas'])}")
-            
-            if resultado['erros']:
-                print(f"   - Erros: {len(resultado['erros'])}")
-                for erro in resultado['erros']:
-                    print(f"     • {erro}")
-            
-            # Limpa histórico antigo
-            self.alert_service.limpar_historico_antigo()
-            
-        except Exception as e:
-            print(f"Erro na verificação diária: {e}")
+        with cronometrar("agendador.verificacao_diaria") as medicao:
+            try:
+                print(f"\n🔍 Executando verificação diária - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+                
+                resultado = self.alert_service.verificar_alertas_do_dia(self.ata_service)
+                
+                print(f"✅ Verificação diária concluída:")
+                print(f"   - Alertas enviados: {resultado['alertas_enviados']}")
+                print(f"   - Atas alertadas: {len(resultado['atas_alertadas'])}")
+                print(f"   - Mensagens enviadas: {resultado['mensagens_enviadas']}")
+                
+                if resultado['erros']:
+                    medicao.erro = True
+                    print(f"   - Erros: {len(resultado['erros'])}")
+                    for erro in resultado['erros']:
+                        print(f"     • {erro}")
+                
+                # Limpa histórico antigo
+                self.alert_service.limpar_historico_antigo()
+                
+            except Exception as e:
+                medicao.erro = True
+                print(f"Erro na verificação diária: {e}")
+    
+    def _on_atas_alteradas(self, eventos: List[EventoDados]):
+        """Avalia os alertas só das atas alteradas após a verificação diária.
+
+        Antes dela, a própria verificação diária já cobre as mudanças.
+        """
+        if (not self.running or self.ultima_verificacao_diaria != date.today()
+                or self._dono_atual() != self.dono):
+            return
+        with cronometrar("agendador.atas_alteradas") as medicao:
+            numeros = dict.fromkeys(evento.numero_ata for evento in eventos)
+            atas = [ata for ata in map(self.ata_service.buscar_por_numero, numeros) if ata]
+            if not atas:
+                return
+            medicao.linhas = len(atas)
+            try:
+                resultado = self.alert_service.verificar_alertas_automaticos(atas)
+                medicao.erro = bool(resultado['erros'])
+                if resultado['alertas_enviados']:
+                    print(f"🔔 {resultado['alertas_enviados']} alerta(s) para atas alteradas")
+            except Exception as e:
+                medicao.erro = True
+                print(f"Erro ao verificar atas alteradas: {e}")
     
     def _executar_verificacao_semanal(self):
         """Executa verificação semanal e envia relatório"""
-        try:
-            print(f"\n📊 Executando verificação semanal - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            
-            atas = self.ata_service.listar_todas()
-            
-            # Envia relatório semanal
-            if self.alert_service.enviar_relatorio_semanal(atas):
-                print("✅ Relatório semanal enviado com sucesso")
-            else:
-                print("❌ Erro ao enviar relatório semanal")
-            
-            # Verifica atas críticas
-            atas_criticas = self.alert_service.verificar_atas_criticas(atas)
-            if atas_criticas:
-                print(f"⚠️ Encontradas {len(atas_criticas)} atas críticas:")
-                for item in atas_criticas:
-                    ata = item["ata"]
-                    criticidade = item["criticidade"]
-                    print(f"   - {ata.numero_ata}: {criticidade['motivo']} (Nível: {criticidade['nivel']})")
-            
-        except Exception as e:
-            print(f"Erro na verificação semanal: {e}")
+        with cronometrar("agendador.verificacao_semanal") as medicao:
+            try:
+                print(f"\n📊 Executando verificação semanal - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+                
+                atas = self.ata_service.listar_todas()
+                
+                # Envia relatório semanal
+                if self.alert_service.enviar_relatorio_semanal(atas):
+                    print("✅ Relatório semanal enviado com sucesso")
+                else:
+                    medicao.erro = True
+                    print("❌ Erro ao enviar relatório semanal")
+                
+                # Verifica atas críticas
+                atas_criticas = self.alert_service.verificar_atas_criticas(atas)
+                if atas_criticas:
+                    print(f"⚠️ Encontradas {len(atas_criticas)} atas críticas:")
+                    for item in atas_criticas:
+                        ata = item["ata"]
+                        criticidade = item["criticidade"]
+                        print(f"   - {ata.numero_ata}: {criticidade['motivo']} (Nível: {criticidade['nivel']})")
+                
+            except Exception as e:
+                medicao.erro = True
+                print(f"Erro na verificação semanal: {e}")
     
     def _executar_verificacao_mensal(self):
         """Executa verificação mensal e gera relatório detalhado"""
-        try:
-            print(f"\n📈 Executando verificação mensal - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            
-            atas = self.ata_service.listar_todas()
-            
-            # Gera relatório mensal
-            if self.alert_service.enviar_relatorio_mensal(atas):
-                print("✅ Relatório mensal gerado com sucesso")
-            else:
-                print("❌ Erro ao gerar relatório mensal")
-            
-        except Exception as e:
-            print(f"Erro na verificação mensal: {e}")
+        with cronometrar("agendador.verificacao_mensal") as medicao:
+            try:
+                print(f"\n📈 Executando verificação mensal - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+                
+                # Gera relatório mensal (arquivo + email)
+                if self._gerar_relatorio_mensal():
+                    print("✅ Relatório mensal gerado com sucesso")
+                else:
+                    medicao.erro = True
+                    print("❌ Erro ao gerar relatório mensal")
+                
+            except Exception as e:
+                medicao.erro = True
+                print(f"Erro na verificação mensal: {e}")
     
     def executar_verificacao_manual(self) -> Dict[str, Any]:
         """Executa verificação manual de alertas"""
-        try:
-            print(f"\n🔍 Executando verificação manual - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            
-            atas = self.ata_service.listar_todas()
-            resultado = self.alert_service.verificar_alertas_automaticos(atas)
-            
-            print(f"✅ Verificação manual concluída:")
-            print(f"   - Alertas enviados: {resultado['alertas_enviados']}")
-            print(f"   - Atas alertadas: {len(resultado['atas_alertadas'])}")
-            
-            if resultado['erros']:
-                print(f"   - Erros: {len(resultado['erros'])}")
-            
-            return resultado
-            
-        except Exception as e:
-            print(f"Erro na verificação manual: {e}")
-            return {"alertas_enviados": 0, "atas_alertadas": [], "erros": [str(e)]}
+        with cronometrar("agendador.verificacao_manual") as medicao:
+            try:
+                print(f"\n🔍 Executando verificação manual - {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+                
+                resultado = self.alert_service.verificar_alertas_do_dia(self.ata_service)
+                
+                print(f"✅ Verificação manual concluída:")
+                print(f"   - Alertas enviados: {resultado['alertas_enviados']}")
+                print(f"   - Atas alertadas: {len(resultado['atas_alertadas'])}")
+                print(f"   - Mensagens enviadas: {resultado['mensagens_enviadas']}")
+                
+                if resultado['erros']:
+                    medicao.erro = True
+                    print(f"   - Erros: {len(resultado['erros'])}")
+                
+                return resultado
+                
+            except Exception as e:
+                medicao.erro = True
+                print(f"Erro na verificação manual: {e}")
+                return {"alertas_enviados": 0, "mensagens_enviadas": 0, "atas_alertadas": [], "erros": [str(e)]}
+    
+    def _gerar_relatorio_mensal(self) -> bool:
+        """Gera os arquivos do relatório mensal (HTML e CSV) e envia por email"""
+        relatorio = self.report_service.gerar(self.ata_service, "html")
+        csv = self.report_service.gerar(self.ata_service, "csv")
+        for gerado in (relatorio, csv):
+            print(f"   - {gerado.caminho}: {gerado.total_atas} atas em {gerado.duracao_ms:.0f} ms "
+                  f"(pico de memória {gerado.pico_memoria_kb:.0f} KB)")
+        return self.alert_service.enviar_relatorio_mensal(contexto=relatorio.contexto)
     
     def gerar_relatorio_manual(self, tipo: str = "semanal") -> bool:
         """Gera relatório manual"""
-        try:
-            atas = self.ata_service.listar_todas()
-            
-            if tipo == "semanal":
-                return self.alert_service.enviar_relatorio_semanal(atas)
-            elif tipo == "mensal":
-                return self.alert_service.enviar_relatorio_mensal(atas)
-            else:
-                print(f"Tipo de relatório inválido: {tipo}")
-                return False
-                
-        except Exception as e:
-            print(f"Erro ao gerar relatório manual: {e}")
-            return False
+        # As falhas viram retorno False: a medição as conta como erro
+        with cronometrar("agendador.relatorio_manual") as medicao:
+            try:
+                if tipo == "semanal":
+                    sucesso = self.alert_service.enviar_relatorio_semanal(self.ata_service.listar_todas())
+                elif tipo == "mensal":
+                    sucesso = self._gerar_relatorio_mensal()
+                else:
+                    print(f"Tipo de relatório inválido: {tipo}")
+                    sucesso = False
+                    
+            except Exception as e:
+                print(f"Erro ao gerar relatório manual: {e}")
+                sucesso = False
+            medicao.erro = not sucesso
+            return sucesso
     
     def get_status(self) -> Dict[str, Any]:
         """Retorna status do agendador"""
@@ -184,6 +311,7 @@ class TaskScheduler:
             "running": self.running,
             "thread_alive": self.thread.is_alive() if self.thread else False,
             "historico_alertas": len(self.alert_service.get_historico_alertas()),
+            "dono_agendador": self._dono_atual(),
             "ultima_verificacao": datetime.now().strftime('%d/%m/%Y %H:%M')
         }
 
@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+class PerfilInicializacao:
+    """Registra marcos de tempo da inicialização da GUI.
+
+    Ativado pela variável ``ATA_REGIS_PERFIL_INICIALIZACAO``: com ``1`` os marcos
+    são impressos no console; com um caminho ``.json`` são também gravados
+    nesse arquivo (usado por ``benchmarks/bench_startup.py``).
+    """
+
+    def __init__(self, destino: Optional[str] = None):
+        self.inicio = time.perf_counter()
+        self.destino = destino
+        self.marcas: List[Tuple[str, float]] = []
+
+    @property
+    def ativo(self) -> bool:
+        return bool(self.destino)
+
+    def marcar(self, nome: str) -> float:
+        """Registra um marco e retorna os ms desde o início da inicialização"""
+        decorrido = (time.perf_counter() - self.inicio) * 1000
+        self.marcas.append((nome, decorrido))
+        return decorrido
+
+    def relatorio(self) -> str:
+        linhas = ["⏱️ Perfil de inicialização:"]
+        anterior = 0.0
+        for nome, decorrido in self.marcas:
+            linhas.append(f"   {nome:<28}{decorrido:>9.1f} ms  (+{decorrido - anterior:.1f})")
+            anterior = decorrido
+        return "\n".join(linhas)
+
+    def concluir(self):
+        """Imprime e, se configurado, grava os marcos coletados"""
+        if not self.ativo:
+            return
+        print(self.relatorio())
+        if self.destino.endswith(".json"):
+            with open(self.destino, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "marcas": dict(self.marcas),
+                        "modulos_carregados": len(sys.modules),
+                    },
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+
+PERFIL = PerfilInicializacao(os.environ.get("ATA_REGIS_PERFIL_INICIALIZACAO"))
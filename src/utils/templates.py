@@ -0,0 +1,308 @@
+"""Templates pré-compilados (texto e HTML) para emails e relatórios."""
+
+from html import escape
+from string import Formatter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TextIO, Tuple
+
+
+class Seguro(str):
+    """Trecho já renderizado que não deve ser escapado novamente."""
+
+
+class Template:
+    """Template com sintaxe de ``str.format`` analisado uma única vez.
+
+    A fonte é dividida na criação em trechos literais e campos (só nomes
+    simples, com especificação de formato opcional; outros campos geram
+    ``ValueError``). A renderização apenas concatena os trechos com os
+    valores, escapando os textos no modo HTML.
+    """
+
+    def __init__(self, fonte: str, html: bool = False):
+        self.fonte = fonte
+        self.html = html
+        self._partes: List[Tuple[str, Optional[str], str]] = []
+        for literal, campo, especificacao, conversao in Formatter().parse(fonte):
+            if campo is not None and (not campo.isidentifier() or conversao):
+                raise ValueError(f"Campo não suportado no template: {{{campo}}}")
+            self._partes.append((literal, campo, especificacao or ""))
+
+    def _renderizar(self, valores: Mapping[str, Any]) -> str:
+        html = self.html
+        saida = []
+        for literal, campo, especificacao in self._partes:
+            saida.append(literal)
+            if campo is None:
+                continue
+            valor = valores[campo]
+            if html and isinstance(valor, str) and not isinstance(valor, Seguro):
+                valor = escape(valor)
+            saida.append(format(valor, especificacao) if especificacao else str(valor))
+        return "".join(saida)
+
+    def render(self, contexto: Optional[Mapping[str, Any]] = None, **valores: Any) -> str:
+        """Renderiza o template para uma string"""
+        if contexto is not None:
+            valores = {**contexto, **valores}
+        texto = self._renderizar(valores)
+        return Seguro(texto) if self.html else texto
+
+    def render_to(self, stream: TextIO, contexto: Optional[Mapping[str, Any]] = None, **valores: Any):
+        """Renderiza o template diretamente em um stream"""
+        stream.write(self.render(contexto, **valores))
+
+    def render_many(self, linhas: Iterable[Mapping[str, Any]], stream: Optional[TextIO] = None) -> str:
+        """Renderiza o template uma vez por linha (seções repetidas)"""
+        partes = map(self._renderizar, linhas)
+        if stream is not None:
+            stream.writelines(partes)
+            return ""
+        return Seguro("".join(partes)) if self.html else "".join(partes)
+
+
+def percentual(valor: int, total: int) -> str:
+    """Sufixo de percentual usado nos resumos: ' (12.5%)' ou vazio se total for zero"""
+    return f" ({valor / total * 100:.1f}%)" if total else ""
+
+
+def situacao_alerta(dias_restantes: Iterable[int], plural: bool = False) -> str:
+    """Situação do alerta: 'vencida(s)' nas regras pós-vencimento (todos os dias negativos)"""
+    if all(dias < 0 for dias in dias_restantes):
+        return "vencidas" if plural else "vencida"
+    return "próximas do vencimento" if plural else "próxima do vencimento"
+
+
+# ---------------------------------------------------------------------------
+# Alerta de vencimento (uma ata)
+# ---------------------------------------------------------------------------
+ALERTA_VENCIMENTO_TEXTO = Template(
+    "\n"
+    "Mensagem:\n"
+    "A Ata de Registro de Preços {numero_ata} está {situacao}.\n"
+    "\n"
+    "Detalhes da Ata:\n"
+    "- Número: {numero_ata}\n"
+    "- SEI: {documento_sei}\n"
+    "- Objeto: {objeto}\n"
+    "- Fornecedor: {fornecedor}\n"
+    "- Data de Vencimento: {data_vencimento}\n"
+    "- Dias Restantes: {dias_restantes}\n"
+    "- Status: {status}\n"
+    "\n"
+    "Valor Total da Ata: {valor_total}\n"
+    "\n"
+    "Itens da Ata:\n"
+    "{itens}"
+    "\n"
+    "Contatos do Fornecedor:\n"
+    "{contatos}"
+    "\n"
+    "Este é um alerta automático do Sistema de Atas de Registro de Preços.\n"
+    "Por favor, tome as providências necessárias."
+)
+
+ALERTA_ITEM_TEXTO = Template(
+    "{indice}. {descricao}\n"
+    "   Quantidade: {quantidade}\n"
+    "   Valor Unitário: {valor}\n"
+    "   Valor Total: {valor_total}\n"
+)
+
+ALERTA_VENCIMENTO_HTML = Template(
+    "<h2>Ata {numero_ata} {situacao}</h2>"
+    "<p>A Ata de Registro de Preços <strong>{numero_ata}</strong> está {situacao}.</p>"
+    "<table>"
+    "<tr><th align=\"left\">Número</th><td>{numero_ata}</td></tr>"
+    "<tr><th align=\"left\">SEI</th><td>{documento_sei}</td></tr>"
+    "<tr><th align=\"left\">Objeto</th><td>{objeto}</td></tr>"
+    "<tr><th align=\"left\">Fornecedor</th><td>{fornecedor}</td></tr>"
+    "<tr><th align=\"left\">Vencimento</th><td>{data_vencimento}</td></tr>"
+    "<tr><th align=\"left\">Dias Restantes</th><td>{dias_restantes}</td></tr>"
+    "<tr><th align=\"left\">Status</th><td>{status}</td></tr>"
+    "<tr><th align=\"left\">Valor Total</th><td>{valor_total}</td></tr>"
+    "</table>"
+    "<h3>Itens</h3>"
+    "<table><tr><th>#</th><th>Descrição</th><th>Qtd.</th><th>Valor Unitário</th><th>Valor Total</th></tr>"
+    "{itens}</table>"
+    "<h3>Contatos do Fornecedor</h3>"
+    "<ul>{contatos}</ul>"
+    "<p><em>Este é um alerta automático do Sistema de Atas de Registro de Preços.</em></p>",
+    html=True,
+)
+
+ALERTA_ITEM_HTML = Template(
+    "<tr><td>{indice}</td><td>{descricao}</td><td align=\"right\">{quantidade}</td>"
+    "<td align=\"right\">{valor}</td><td align=\"right\">{valor_total}</td></tr>",
+    html=True,
+)
+
+ALERTA_CONTATO_HTML = Template("<li><strong>{rotulo}:</strong> {valores}</li>", html=True)
+
+# ---------------------------------------------------------------------------
+# Alerta de múltiplas atas (digest)
+# ---------------------------------------------------------------------------
+ALERTA_MULTIPLAS_TEXTO = Template(
+    "\n"
+    "Mensagem:\n"
+    "Existem {quantidade} atas {situacao} que requerem atenção:\n"
+    "{atas}"
+    "\n"
+    "Este é um alerta automático do Sistema de Atas de Registro de Preços.\n"
+    "Por favor, tome as providências necessárias para cada ata listada."
+)
+
+ALERTA_MULTIPLAS_ATA_TEXTO = Template(
+    "\n"
+    "{indice}. Ata {numero_ata}\n"
+    "   Objeto: {objeto}\n"
+    "   Fornecedor: {fornecedor}\n"
+    "   Vencimento: {data_vencimento}\n"
+    "   Dias Restantes: {dias_restantes}\n"
+    "{aviso}"
+)
+
+ALERTA_MULTIPLAS_HTML = Template(
+    "<h2>{quantidade} atas {situacao}</h2>"
+    "<table><tr><th>#</th><th>Ata</th><th>Objeto</th><th>Fornecedor</th>"
+    "<th>Vencimento</th><th>Dias</th><th></th></tr>{atas}</table>"
+    "<p><em>Este é um alerta automático do Sistema de Atas de Registro de Preços.</em></p>",
+    html=True,
+)
+
+ALERTA_MULTIPLAS_ATA_HTML = Template(
+    "<tr><td>{indice}</td><td>{numero_ata}</td><td>{objeto}</td><td>{fornecedor}</td>"
+    "<td>{data_vencimento}</td><td align=\"right\">{dias_restantes}</td><td>{aviso}</td></tr>",
+    html=True,
+)
+
+# ---------------------------------------------------------------------------
+# Relatório semanal
+# ---------------------------------------------------------------------------
+RELATORIO_SEMANAL_TEXTO = Template(
+    "\n"
+    "Relatório Semanal - Status das Atas:\n"
+    "\n"
+    "Resumo Geral:\n"
+    "- Total de Atas: {total}\n"
+    "- Vigentes: {vigentes}{pct_vigentes}\n"
+    "- A Vencer (≤90 dias): {a_vencer}{pct_a_vencer}\n"
+    "- Vencidas: {vencidas}{pct_vencidas}\n"
+    "{proximas}"
+    "\n"
+    "Este relatório é gerado automaticamente pelo Sistema de Atas de Registro de Preços."
+)
+
+LINHA_VENCE_EM_TEXTO = Template("- {numero_ata}: {objeto} (vence em {dias} dias)\n")
+LINHA_VENCIDA_TEXTO = Template("- {numero_ata}: {objeto} (vencida há {dias} dias)\n")
+
+RELATORIO_SEMANAL_HTML = Template(
+    "<h2>Relatório Semanal - Status das Atas</h2>"
+    "<ul><li>Total de Atas: {total}</li>"
+    "<li>Vigentes: {vigentes}{pct_vigentes}</li>"
+    "<li>A Vencer (≤90 dias): {a_vencer}{pct_a_vencer}</li>"
+    "<li>Vencidas: {vencidas}{pct_vencidas}</li></ul>"
+    "{proximas}",
+    html=True,
+)
+
+LINHA_VENCE_EM_HTML = Template(
+    "<li>{numero_ata}: {objeto} (vence em {dias} dias)</li>", html=True
+)
+LINHA_VENCIDA_HTML = Template(
+    "<li>{numero_ata}: {objeto} (vencida há {dias} dias)</li>", html=True
+)
+
+# ---------------------------------------------------------------------------
+# Relatório mensal
+# ---------------------------------------------------------------------------
+RELATORIO_MENSAL_TEXTO = Template(
+    "\n"
+    "RELATÓRIO MENSAL - ATAS DE REGISTRO DE PREÇOS\n"
+    "Período: {periodo}\n"
+    "Data de Geração: {data_geracao}\n"
+    "\n"
+    "📊 RESUMO EXECUTIVO:\n"
+    "- Total de Atas: {total}\n"
+    "- Valor Total: {valor_total}\n"
+    "- Vigentes: {vigentes}{pct_vigentes}\n"
+    "- A Vencer: {a_vencer}{pct_a_vencer}\n"
+    "- Vencidas: {vencidas}{pct_vencidas}\n"
+    "\n"
+    "🏢 ATAS POR FORNECEDOR:\n"
+    "{fornecedores}"
+    "{proximas}"
+    "{vencidas_lista}"
+    "\n"
+    "📈 ANÁLISE DE TENDÊNCIAS:\n"
+    "- Atas vencendo este ano: {vencendo_este_ano}\n"
+    "- Atas vencendo próximo ano: {vencendo_proximo_ano}\n"
+    "{tendencia}"
+    "{vencimentos_por_mes}"
+    "\n"
+    "💡 RECOMENDAÇÕES:\n"
+    "{recomendacoes}"
+    "\n"
+    "Relatório gerado automaticamente pelo Sistema de Atas de Registro de Preços"
+)
+
+LINHA_FORNECEDOR_TEXTO = Template("- {fornecedor}: {quantidade} ata(s) - {valor}\n")
+
+RELATORIO_MENSAL_HTML = Template(
+    "<!DOCTYPE html><html lang=\"pt-BR\"><head><meta charset=\"utf-8\">"
+    "<title>Relatório Mensal - {periodo}</title>"
+    "<style>body{{font-family:Inter,Arial,sans-serif;color:#111827}}"
+    "table{{border-collapse:collapse}}td,th{{border:1px solid #E5E7EB;padding:4px 8px}}</style>"
+    "</head><body>"
+    "<h1>Relatório Mensal - Atas de Registro de Preços</h1>"
+    "<p>Período: {periodo}<br>Data de Geração: {data_geracao}</p>"
+    "<h2>Resumo Executivo</h2>"
+    "<ul><li>Total de Atas: {total}</li><li>Valor Total: {valor_total}</li>"
+    "<li>Vigentes: {vigentes}{pct_vigentes}</li><li>A Vencer: {a_vencer}{pct_a_vencer}</li>"
+    "<li>Vencidas: {vencidas}{pct_vencidas}</li></ul>"
+    "<h2>Atas por Fornecedor</h2>"
+    "<table><tr><th>Fornecedor</th><th>Atas</th><th>Valor</th></tr>{fornecedores}</table>"
+    "{proximas}{vencidas_lista}"
+    "<h2>Análise de Tendências</h2>"
+    "<ul><li>Atas vencendo este ano: {vencendo_este_ano}</li>"
+    "<li>Atas vencendo próximo ano: {vencendo_proximo_ano}</li>{tendencia}</ul>"
+    "{vencimentos_por_mes}"
+    "<h2>Recomendações</h2><ul>{recomendacoes}</ul>"
+    "</body></html>",
+    html=True,
+)
+
+LINHA_FORNECEDOR_HTML = Template(
+    "<tr><td>{fornecedor}</td><td align=\"right\">{quantidade}</td><td align=\"right\">{valor}</td></tr>",
+    html=True,
+)
+
+LINHA_MES_TEXTO = Template("- {mes}: {quantidade} ata(s) - {valor}\n")
+LINHA_MES_HTML = Template(
+    "<li>{mes}: {quantidade} ata(s) - {valor}</li>", html=True
+)
+
+LINHA_TEXTO = Template("- {texto}\n")
+LINHA_HTML = Template("<li>{texto}</li>", html=True)
+
+
+def secao(titulo: str, corpo: str, html: bool = False) -> str:
+    """Seção opcional com título; vazia se não houver conteúdo"""
+    if not corpo:
+        return Seguro("") if html else ""
+    if html:
+        return Seguro(f"<h2>{escape(titulo)}</h2><ul>{corpo}</ul>")
+    return f"\n{titulo}\n{corpo}"
+
+
+def contexto_resumo(stats: Dict[str, int]) -> Dict[str, Any]:
+    """Campos comuns de resumo por status (contagens e percentuais)"""
+    total = stats["vigente"] + stats["a_vencer"] + stats["vencida"]
+    return {
+        "total": total,
+        "vigentes": stats["vigente"],
+        "a_vencer": stats["a_vencer"],
+        "vencidas": stats["vencida"],
+        "pct_vigentes": percentual(stats["vigente"], total),
+        "pct_a_vencer": percentual(stats["a_vencer"], total),
+        "pct_vencidas": percentual(stats["vencida"], total),
+    }
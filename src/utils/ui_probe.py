@@ -0,0 +1,96 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+import flet as ft
+from flet_core.connection import Connection
+from flet_core.protocol import PageCommandResponsePayload, PageCommandsBatchResponsePayload
+
+class ConexaoMedida(Connection):
+    """Conexão Flet sem cliente que registra os comandos enviados"""
+
+    def __init__(self):
+        super().__init__()
+        self.comandos: List = []
+        self._ids = 0
+
+    def send_command(self, session_id: str, command):
+        self.comandos.append(command)
+        return PageCommandResponsePayload(result="", error="")
+
+    def send_commands(self, session_id: str, commands):
+        resultados = []
+        for comando in commands:
+            self.comandos.append(comando)
+            if comando.name == "add":
+                ids = []
+                for _ in comando.commands:
+                    self._ids += 1
+                    ids.append(f"_{self._ids}")
+                resultados.append(" ".join(ids))
+        return PageCommandsBatchResponsePayload(results=resultados, error="")
+
+def contar_controles(control: ft.Control) -> int:
+    """Tamanho da subárvore percorrida pelo diff ao atualizar ``control``"""
+    return 1 + sum(contar_controles(filho) for filho in control._get_children())
+
+@dataclass
+class Interacao:
+    """Custo de uma interação: diff no servidor e mensagens ao cliente"""
+    nome: str
+    atualizacoes: int = 0
+    atualizacoes_pagina: int = 0
+    controles_diff: int = 0
+    comandos: int = 0
+    duracao_ms: float = 0.0
+    alvos: List[str] = field(default_factory=list)
+
+class SondaPagina:
+    """Página Flet real, sem cliente, para medir o custo das interações.
+
+    Usada pelos testes (regressões de ``page.update()`` em formulários) e
+    pelos benchmarks de digitação; requer ``flet`` instalado.
+    """
+
+    def __init__(self):
+        self.conexao = ConexaoMedida()
+        self.page = ft.Page(self.conexao, "sonda", asyncio.new_event_loop())
+        self._atual: Interacao = Interacao("inicial")
+        self._update_original = self.page.update
+        self.page.update = self._update_medido
+
+    def _update_medido(self, *controls):
+        alvos = controls or (self.page,)
+        self._atual.atualizacoes += 1
+        if not controls:
+            self._atual.atualizacoes_pagina += 1
+        self._atual.controles_diff += sum(contar_controles(c) for c in alvos)
+        self._atual.alvos.extend(type(c).__name__ for c in alvos)
+        self._update_original(*controls)
+
+    def medir(self, nome: str, acao: Callable[[], None]) -> Interacao:
+        """Executa ``acao`` e retorna o custo de atualização que ela gerou"""
+        self._atual = Interacao(nome)
+        enviados = len(self.conexao.comandos)
+        inicio = time.perf_counter()
+        acao()
+        self._atual.duracao_ms = (time.perf_counter() - inicio) * 1000
+        self._atual.comandos = len(self.conexao.comandos) - enviados
+        return self._atual
+
+    def disparar(self, control: ft.Control, evento: str, data: str = ""):
+        """Entrega ``on_<evento>`` ao controle como faria o cliente Flet"""
+        handler = getattr(control, f"on_{evento}", None)
+        if handler:
+            handler(ft.ControlEvent(control.uid, evento, data, control, self.page))
+
+    def digitar(self, field: ft.TextField, texto: str) -> int:
+        """Digita ``texto`` tecla a tecla; retorna quantos eventos foram ao servidor"""
+        eventos = 0
+        for caractere in texto:
+            field.value = (field.value or "") + caractere
+            if field.on_change:
+                eventos += 1
+                self.disparar(field, "change", field.value)
+        return eventos
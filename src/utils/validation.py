@@ -0,0 +1,157 @@
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+# Padrões compilados uma única vez (usados por Ata, Validators e formulário)
+PADRAO_NUMERO_ATA = re.compile(r'\d{4}/\d{4}')
+PADRAO_DOCUMENTO_SEI = re.compile(r'\d{5}\.\d{6}/\d{4}-\d{2}')
+PADRAO_TELEFONE = re.compile(r'\(\d{2}\)\s?\d{4,5}-\d{4}')
+PADRAO_EMAIL = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+@dataclass(frozen=True)
+class Campo:
+    """Regra de validação de um campo da ata"""
+    nome: str
+    rotulo: str
+    mensagem: str
+    padrao: Optional[Pattern] = None
+    validador: Optional[Callable[[Any], bool]] = None
+    lista: bool = False
+
+    def __post_init__(self):
+        # Resolve a verificação uma vez: no caminho quente é uma única chamada
+        if self.padrao is not None:
+            fullmatch = rapido = self.padrao.fullmatch
+            valido = lambda v: isinstance(v, str) and fullmatch(v) is not None
+        else:
+            valido = rapido = self.validador or (lambda v: True)
+        object.__setattr__(self, "valido", valido)
+        # Sem checagem de tipo: valor não-texto gera TypeError (ver ``primeiro_erro``)
+        object.__setattr__(self, "rapido", rapido)
+
+    def erro(self, valor: Any) -> Optional[str]:
+        """Mensagem de erro para ``valor`` (ou ``None`` se válido)"""
+        valido = self.valido
+        if not self.lista:
+            return None if valido(valor) else self.mensagem.format(valor=valor)
+        for v in valor:
+            if not valido(v):
+                return self.mensagem.format(valor=v)
+        return None
+
+def _texto_preenchido(valor: Any) -> bool:
+    return isinstance(valor, str) and bool(valor.strip())
+
+# Esquema da ata, na ordem em que os erros são reportados
+ESQUEMA_ATA: Dict[str, Campo] = {
+    campo.nome: campo
+    for campo in (
+        Campo("numero_ata", "Número da ata", "Número da ata deve seguir o formato XXXX/AAAA",
+              padrao=PADRAO_NUMERO_ATA),
+        Campo("documento_sei", "Documento SEI",
+              "Documento SEI deve seguir o formato 00000.000000/0000-00", padrao=PADRAO_DOCUMENTO_SEI),
+        Campo("data_vigencia", "Data de vigência", "Data de vigência deve ser do tipo date",
+              validador=lambda v: isinstance(v, date)),
+        Campo("objeto", "Objeto", "Objeto não pode estar vazio", validador=_texto_preenchido),
+        Campo("fornecedor", "Fornecedor", "Fornecedor não pode estar vazio", validador=_texto_preenchido),
+        Campo("telefones_fornecedor", "Telefone",
+              "Telefone {valor} deve seguir o formato (XX) XXXXX-XXXX", padrao=PADRAO_TELEFONE, lista=True),
+        Campo("emails_fornecedor", "E-mail", "Email {valor} não é válido", padrao=PADRAO_EMAIL, lista=True),
+    )
+}
+
+def validar_campo(nome: str, valor: Any) -> Optional[str]:
+    """Valida um campo do esquema; usado pelo formulário para feedback imediato"""
+    return ESQUEMA_ATA[nome].erro(valor)
+
+def erros_ata(obj: Any) -> List[str]:
+    """Todos os erros de campo de uma ata (ou objeto com os mesmos atributos)"""
+    erros = []
+    for campo in ESQUEMA_ATA.values():
+        erro = campo.erro(getattr(obj, campo.nome))
+        if erro:
+            erros.append(erro)
+    return erros
+
+# (atributo, verificação, é lista, campo) pré-resolvidos para ``primeiro_erro``
+_REGRAS = [(campo.nome, campo.rapido, campo.lista, campo) for campo in ESQUEMA_ATA.values()]
+
+def primeiro_erro(obj: Any) -> Optional[str]:
+    """Primeiro erro de campo, sem avaliar os demais (caminho de ``Ata.validate``)"""
+    try:
+        for nome, valido, lista, campo in _REGRAS:
+            valor = getattr(obj, nome)
+            if lista:
+                for v in valor:
+                    if not valido(v):
+                        return campo.mensagem.format(valor=v)
+            elif not valido(valor):
+                return campo.mensagem.format(valor=valor)
+    except TypeError:
+        # Algum valor não é texto: refaz com checagem de tipo campo a campo
+        erros = erros_ata(obj)
+        return erros[0] if erros else None
+    return None
+
+class VerificadorUnicidade:
+    """Verifica se um número de ata está livre, com cache e consulta em background.
+
+    ``consulta(numero)`` deve usar o índice do serviço (ex.:
+    ``validar_numero_ata_unico``). Os resultados ficam em cache enquanto
+    ``versao()`` não mudar; ``verificar_async`` aguarda ``atraso`` segundos
+    sem nova chamada antes de consultar e só entrega a resposta mais recente.
+    """
+
+    def __init__(self, consulta: Callable[[str], bool], versao: Callable[[], object] = lambda: None,
+                 capacidade: int = 256):
+        self.consulta = consulta
+        self.versao = versao
+        self.capacidade = capacidade
+        self._cache: "OrderedDict[Tuple[object, str], bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._geracao = 0
+
+    def unico(self, numero_ata: str) -> bool:
+        chave = (self.versao(), numero_ata)
+        with self._lock:
+            if chave in self._cache:
+                self._cache.move_to_end(chave)
+                return self._cache[chave]
+        resultado = self.consulta(numero_ata)
+        with self._lock:
+            self._cache[chave] = resultado
+            if len(self._cache) > self.capacidade:
+                self._cache.popitem(last=False)
+        return resultado
+
+    def verificar_async(self, numero_ata: str, callback: Callable[[str, bool], None],
+                        atraso: float = 0.3):
+        """Agenda a verificação; chamadas seguidas dentro de ``atraso`` cancelam as anteriores"""
+        with self._lock:
+            self._geracao += 1
+            geracao = self._geracao
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(atraso, self._executar, (geracao, numero_ata, callback))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _executar(self, geracao: int, numero_ata: str, callback: Callable[[str, bool], None]):
+        try:
+            resultado = self.unico(numero_ata)
+        except Exception as e:
+            print(f"Erro ao verificar número da ata: {e}")
+            return
+        if geracao == self._geracao:
+            callback(numero_ata, resultado)
+
+    def cancelar(self):
+        with self._lock:
+            self._geracao += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
@@ -2,28 +2,30 @@ import re
 from datetime import date, datetime
 from typing import List, Optional
 
+from utils.validation import PADRAO_NUMERO_ATA, PADRAO_DOCUMENTO_SEI, PADRAO_TELEFONE, PADRAO_EMAIL
+
 class Validators:
     """Classe com métodos de validação"""
     
     @staticmethod
     def validar_numero_ata(numero: str) -> bool:
         """Valida o formato do número da ata (XXXX/AAAA)"""
-        return bool(re.match(r'^\d{4}/\d{4}$', numero))
+        return PADRAO_NUMERO_ATA.fullmatch(numero) is not None
     
     @staticmethod
     def validar_documento_sei(documento: str) -> bool:
         """Valida o formato do documento SEI (00000.000000/0000-00)"""
-        return bool(re.match(r'^\d{5}\.\d{6}/\d{4}-\d{2}$', documento))
+        return PADRAO_DOCUMENTO_SEI.fullmatch(documento) is not None
     
     @staticmethod
     def validar_telefone(telefone: str) -> bool:
         """Valida o formato do telefone (XX) XXXXX-XXXX"""
-        return bool(re.match(r'^\(\d{2}\)\s?\d{4,5}-\d{4}$', telefone))
+        return PADRAO_TELEFONE.fullmatch(telefone) is not None
     
     @staticmethod
     def validar_email(email: str) -> bool:
         """Valida o formato do email"""
-        return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email))
+        return PADRAO_EMAIL.fullmatch(email) is not None
     
     @staticmethod
     def validar_data_vigencia(data_str: str) -> Optional[date]:
@@ -89,18 +91,21 @@ class Validators:
         except ValueError:
             return None
 
+# Troca separadores en-US (1,234.56) por pt-BR (1.234,56) em uma única passada
+_SEPARADORES_BRL = str.maketrans(",.", ".,")
+
 class Formatters:
     """Classe com métodos de formatação"""
     
     @staticmethod
     def formatar_data_brasileira(data: date) -> str:
         """Formata data para padrão brasileiro (DD/MM/AAAA)"""
-        return data.strftime("%d/%m/%Y")
+        return f"{data.day:02d}/{data.month:02d}/{data.year:04d}"
     
     @staticmethod
-    def formatar_valor_monetario(valor: float) -> str:
+    def formatar_valor_monetario(valor: float, casas: int = 2) -> str:
         """Formata valor para padrão monetário brasileiro"""
-        return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return "R$ " + f"{valor:,.{casas}f}".translate(_SEPARADORES_BRL)
     
     @staticmethod
     def formatar_status(status: str) -> str:
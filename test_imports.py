@@ -73,7 +73,7 @@ def test_basic_functionality():
         
         # Testa formatadores
         from utils.validators import Formatters
-        from datetime import date
+        from datetime import date, timedelta
         data_formatada = Formatters.formatar_data_brasileira(date(2024, 12, 31))
         assert data_formatada == "31/12/2024"
         print("✓ Formatadores OK")
@@ -90,7 +90,685 @@ def test_basic_functionality():
         stats_db = sqlite_service.get_estatisticas()
         assert isinstance(stats_db, dict)
         print("✓ Serviço SQLite OK")
-        
+
+        # Testa histórico de alertas persistente
+        from services.alert_service import AlertService
+        from utils.email_service import EmailService
+        alert_service = AlertService(EmailService(), ":memory:")
+        alert_service._registrar_alerta("0001/2024", "D-30")
+        alert_service._registrar_alerta("0001/2024", "D-30")
+        assert alert_service._ja_alertado_hoje("0001/2024", "D-30")
+        assert not alert_service._ja_alertado_hoje("0001/2024", "D-7")
+        assert len(alert_service.get_historico_alertas()) == 1
+        # GUI e daemon no mesmo banco: o alerta reservado por um não é reenviado pelo outro
+        import contextlib
+        import io
+        import tempfile
+        hoje_alerta = date(2024, 11, 1)
+        with tempfile.TemporaryDirectory() as diretorio, contextlib.redirect_stdout(io.StringIO()):
+            banco = os.path.join(diretorio, "alertas.db")
+            daemon_alertas, gui_alertas = AlertService(EmailService(), banco), AlertService(EmailService(), banco)
+            assert daemon_alertas.verificar_alertas_do_dia(sqlite_service, hoje_alerta)["alertas_enviados"] == 1
+            assert gui_alertas.verificar_alertas_do_dia(sqlite_service, hoje_alerta)["alertas_enviados"] == 0
+            # Envio com falha desfaz a reserva para a próxima verificação
+            falha_alertas = AlertService(EmailService(), os.path.join(diretorio, "falha.db"))
+            falha_alertas.email_service.enviar_alerta_vencimento = lambda *args, **kwargs: False
+            assert falha_alertas.verificar_alertas_do_dia(sqlite_service, hoje_alerta)["erros"]
+            assert falha_alertas.conn.execute("SELECT COUNT(*) FROM alertas_historico").fetchone()[0] == 0
+            for servico in (daemon_alertas, gui_alertas, falha_alertas):
+                servico.close()
+        print("✓ Histórico de Alertas OK")
+
+        # Testa busca das atas nas datas-alvo de alerta
+        alvo = sqlite_service.buscar_por_datas_vigencia(alert_service.datas_alvo(date(2024, 11, 1)))
+        assert [ata.numero_ata for ata in alvo] == ["0016/2024"]
+        # Hidratação em lote: itens e contatos iguais aos da busca ata a ata
+        assert alvo == [sqlite_service.buscar_por_numero("0016/2024")] and alvo[0].itens
+        alvo_json = ata_service.buscar_por_datas_vigencia(alert_service.datas_alvo(date(2024, 11, 1)))
+        assert [ata.numero_ata for ata in alvo_json] == ["0016/2024"]
+        print("✓ Datas-alvo de Alertas OK")
+
+        # Testa motor de regras de alerta
+        from services.alert_rules import MotorRegras
+        motor = MotorRegras()
+        assert motor.avaliar_criticidade(20, 500000.0)[0] == "MÉDIA"
+        assert motor.avaliar_criticidade(20, 2000000.0)[0] == "ALTA"
+        assert motor.avaliar_criticidade(-3, 0.0) == ("CRÍTICA", "Ata vencida há 3 dias")
+        print("✓ Motor de Regras OK")
+
+        # Testa caixa de saída de emails (falha de SMTP reagenda com backoff)
+        import smtplib
+        from utils.email_queue import EmailOutbox, EmailQueueWorker, SMTPConfig
+        outbox = EmailOutbox(":memory:")
+        ata_contatos = sqlite_service.listar_todas()[0]
+        EmailService(outbox).enviar_alerta_vencimento(ata_contatos)
+        assert outbox.profundidade() == 2
+        # Versão HTML traz os mesmos contatos do fornecedor da versão texto
+        corpo, corpo_html = outbox.conn.execute("SELECT corpo, corpo_html FROM email_outbox LIMIT 1").fetchone()
+        for contato in ata_contatos.telefones_fornecedor + ata_contatos.emails_fornecedor:
+            assert contato in corpo and contato in corpo_html
+        assert "<h3>Contatos do Fornecedor</h3>" in corpo_html
+
+        def smtp_indisponivel(config):
+            raise smtplib.SMTPConnectError(421, "indisponível")
+
+        worker = EmailQueueWorker(outbox, SMTPConfig(), smtp_factory=smtp_indisponivel)
+        assert worker.processar_pendentes() == 0
+        assert outbox.contagem_por_status() == {"pendente": 2}
+        assert worker.get_metricas()["falhas"] == 2
+
+        # Dois processos na mesma caixa: reserva atômica e sem recuperar reservas ativas
+        import tempfile
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = os.path.join(diretorio, "fila.db")
+            caixa_a = EmailOutbox(banco)
+            caixa_a.enfileirar(["a@x.br", "b@x.br"], "Assunto", "Corpo")
+            destinatario_a, lote_a = caixa_a.reservar_lote()
+            caixa_b = EmailOutbox(banco)
+            destinatario_b, lote_b = caixa_b.reservar_lote()
+            assert {destinatario_a, destinatario_b} == {"a@x.br", "b@x.br"}
+            assert len(lote_a) == len(lote_b) == 1
+            assert caixa_b.reservar_lote() == (None, [])
+            caixa_nova = EmailOutbox(banco)
+            assert caixa_nova.contagem_por_status() == {"enviando": 2}
+            caixa_nova.close()
+            caixa_b.TEMPO_RESERVA = -1
+            assert len(caixa_b.reservar_lote()[1]) == 1
+            caixa_a.close()
+            caixa_b.close()
+        print("✓ Fila de Emails OK")
+
+        # Testa modo digest: uma mensagem para várias atas do mesmo tipo
+        digest_service = AlertService(EmailService(outbox), ":memory:", modo_digest=True)
+        atas_digest = [ata for ata in sqlite_service.listar_todas() if ata.numero_ata != "0014/2024"]
+        hoje_digest = atas_digest[0].data_vigencia - timedelta(days=90)
+        for ata in atas_digest:
+            ata.data_vigencia = hoje_digest + timedelta(days=90)
+        resultado = digest_service.verificar_alertas_automaticos(atas_digest, hoje_digest)
+        assert resultado["alertas_enviados"] == 2 and resultado["mensagens_enviadas"] == 1
+        resultado = digest_service.verificar_alertas_automaticos(atas_digest, hoje_digest)
+        assert resultado["alertas_enviados"] == 0
+        # Pós-vencimento: dias contados a partir do hoje da verificação e texto de atas vencidas
+        resultado = digest_service.verificar_alertas_automaticos(atas_digest, hoje_digest + timedelta(days=95))
+        assert resultado["mensagens_enviadas"] == 1
+        assunto, corpo, corpo_html = outbox.conn.execute(
+            "SELECT assunto, corpo, corpo_html FROM email_outbox ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        assert assunto == "[POS-VENCIMENTO] 2 atas vencidas"
+        assert "Dias Restantes: -5" in corpo and "VENCIDA há 5 dias" in corpo
+        assert "<h2>2 atas vencidas</h2>" in corpo_html and "próximas" not in corpo + corpo_html
+        print("✓ Alertas em Digest OK")
+
+        # Testa templates pré-compilados e formatação monetária
+        from io import StringIO
+        from utils.templates import Template
+        assert Formatters.formatar_valor_monetario(1234567.891) == "R$ 1.234.567,89"
+        assert Template("<b>{x}</b>", html=True).render(x="<i>") == "<b>&lt;i&gt;</b>"
+        assert Template("{{{n:>3}}} {t}").render(n=7, t="<i>") == "{  7} <i>"
+        try:
+            Template("{ata.numero_ata}")
+            assert False, "Campo com atributo aceito"
+        except ValueError:
+            pass
+        buffer = StringIO()
+        digest_service.renderizar_relatorio_mensal(atas_digest, buffer, "html", hoje_digest)
+        assert "<h2>" in buffer.getvalue() and atas_digest[0].numero_ata in buffer.getvalue()
+        print("✓ Templates OK")
+
+        # Testa relatório em arquivo gerado em lotes
+        import tempfile
+        from services.report_service import ReportService
+        with tempfile.TemporaryDirectory() as diretorio:
+            report_service = ReportService(":memory:", diretorio)
+            relatorio = report_service.gerar(sqlite_service, "csv", tamanho_lote=2, medir_memoria=True)
+            with open(relatorio.caminho, encoding="utf-8-sig") as f:
+                assert len(f.readlines()) == relatorio.total_atas + 1
+            assert relatorio.total_atas == len(sqlite_service.listar_todas())
+            assert relatorio.pico_memoria_kb > 0
+            import tracemalloc as tracemalloc_externo
+            tracemalloc_externo.start()
+            try:
+                bloco = bytearray(1 << 20)
+                report_service.gerar(sqlite_service, "csv", medir_memoria=True)
+                # O rastreamento externo segue ativo e com o próprio pico
+                assert tracemalloc_externo.get_traced_memory()[1] >= len(bloco)
+            finally:
+                tracemalloc_externo.stop()
+            assert report_service.gerar(sqlite_service, "texto").pico_memoria_kb > 0
+            assert len(report_service.get_historico()) == 3
+            # Duas instâncias gravando o mesmo relatório ao mesmo tempo não misturam os arquivos
+            import threading
+            gerados = []
+            concorrentes = [
+                threading.Thread(target=lambda: gerados.append(report_service.gerar(sqlite_service, "csv")))
+                for _ in range(4)
+            ]
+            for t in concorrentes:
+                t.start()
+            for t in concorrentes:
+                t.join()
+            assert len(gerados) == 4 and len({g.caminho for g in gerados}) == 1
+            with open(gerados[0].caminho, encoding="utf-8-sig") as f:
+                assert len(f.readlines()) == relatorio.total_atas + 1
+            assert all(not nome.startswith(".") for nome in os.listdir(diretorio))
+            report_service.close()
+        print("✓ Relatórios em Arquivo OK")
+
+        # Testa processamento paralelo (mesmo resultado que o serial)
+        from services.parallel import ProcessadorParalelo
+        from services.report_service import AcumuladorRelatorio
+        atas_todas = sqlite_service.listar_todas()
+        serial = AcumuladorRelatorio(hoje_digest)
+        serial.adicionar_lote(atas_todas)
+        processador = ProcessadorParalelo(max_workers=2, tamanho_lote=1, limiar=0)
+        try:
+            paralelo = processador.acumular_lotes(sqlite_service.iterar_compactas(1), hoje_digest)
+            assert paralelo.contexto() == serial.contexto()
+            criticas = processador.avaliar_criticidade(atas_todas, digest_service.motor_regras, hoje_digest)
+            esperadas = [
+                i for i, ata in enumerate(atas_todas)
+                if digest_service.motor_regras.avaliar_criticidade(
+                    (ata.data_vigencia - hoje_digest).days, ata.valor_total
+                )[0] in ("ALTA", "CRÍTICA")
+            ]
+            assert [c[0] for c in criticas] == esperadas
+        finally:
+            processador.close()
+        print("✓ Processamento Paralelo OK")
+
+        # Testa CLI sem interface gráfica (importa num banco novo e reexporta)
+        import contextlib
+        import io
+        import json
+        from ata_regis.cli import main as cli_main
+        with tempfile.TemporaryDirectory() as diretorio, contextlib.redirect_stdout(io.StringIO()):
+            origem = os.path.join(diretorio, "carteira.json")
+            base = sqlite_service.listar_todas()[0].to_dict()
+            with open(origem, "w", encoding="utf-8") as f:
+                json.dump([dict(base, numero_ata=f"{i:04d}/2040") for i in range(1, 3)], f)
+            destino = os.path.join(diretorio, "b.db")
+            assert cli_main(["--db", destino, "import", origem]) == 0
+            assert cli_main(["--db", destino, "check-alerts"]) == 0
+            # Só as atas importadas: o banco novo não recebe as atas de exemplo
+            exportado = os.path.join(diretorio, "atas.json")
+            assert cli_main(["--db", destino, "export", exportado]) == 0
+            with open(exportado, encoding="utf-8") as f:
+                assert sorted(a["numero_ata"] for a in json.load(f)) == ["0001/2040", "0002/2040"]
+            # Data inválida é erro de uso (código 2), sem traceback nem abrir o banco
+            with contextlib.redirect_stderr(io.StringIO()) as erro_uso:
+                try:
+                    cli_main(["--db", os.path.join(diretorio, "nunca.db"), "check-alerts", "--data", "2024-13-01"])
+                    assert False, "Data inválida aceita"
+                except SystemExit as e:
+                    assert e.code == 2
+            assert "data inválida" in erro_uso.getvalue()
+            assert not os.path.exists(os.path.join(diretorio, "nunca.db"))
+            assert cli_main(["--db", destino, "check-alerts", "--data", "2024-06-01"]) == 0
+            vazio = os.path.join(diretorio, "vazio.db")
+            assert cli_main(["--db", vazio, "check-alerts"]) == 0
+            assert cli_main(["--db", vazio, "export", exportado]) == 0
+            with open(exportado, encoding="utf-8") as f:
+                assert json.load(f) == []
+            # --workers liga o processamento paralelo em alertas e relatórios
+            from ata_regis.cli import Contexto
+            from services.parallel import criar_processador
+            assert criar_processador(1) is None and criar_processador(0) is None
+            paralelo_ctx = Contexto(destino, workers=2)
+            assert paralelo_ctx.alert_service.processador is paralelo_ctx.processador is not None
+            relatorios_ctx = paralelo_ctx.report_service(diretorio)
+            assert relatorios_ctx.processador is paralelo_ctx.processador
+            relatorios_ctx.close()
+            paralelo_ctx.close()
+            assert cli_main(["--db", destino, "--workers", "2", "report", "--monthly",
+                             "--saida", diretorio]) == 0
+        print("✓ CLI OK")
+
+        # Testa versão dos dados (invalidação das views em cache)
+        from utils.scheduler import TaskScheduler
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = os.path.join(diretorio, "v.db")
+            local, outra = SQLiteAtaService(banco), SQLiteAtaService(banco)
+            versao = local.versao_dados
+            assert local.versao_dados == versao
+            dados = local.listar_todas()[0].to_dict()
+            dados["numero_ata"] = "0099/2024"
+            local.criar_ata(dados)
+            assert local.versao_dados > versao
+            versao = local.versao_dados
+            outra.excluir_ata("0099/2024")
+            assert local.versao_dados > versao
+            # Escritas dos outros serviços no mesmo banco não invalidam as views
+            versao = local.versao_dados
+            alertas = AlertService(EmailService(), banco)
+            alertas._registrar_alerta("0016/2024", "D-30")
+            caixa = EmailOutbox(banco)
+            caixa.enfileirar(["a@exemplo.com"], "Assunto", "Corpo")
+            agendador = TaskScheduler(local, alertas)
+            assert agendador.adquirir_lease()
+            assert local.versao_dados == versao
+            publicados = []
+            local.eventos.assinar(publicados.extend)
+            local.editar_ata("0016/2024", dict(local.buscar_por_numero("0016/2024").to_dict(), numero_ata="0017/2024"))
+            assert [e.versao for e in publicados] == [versao + 1, versao + 2] == [versao + 1, local.versao_dados]
+            agendador.conn.close()
+            agendador.report_service.close()
+            caixa.close()
+            alertas.close()
+            local.close()
+            outra.close()
+        print("✓ Versão dos Dados OK")
+
+        # Testa barramento de eventos (lote único por janela e versões crescentes)
+        from services.events import EventBus, ATA_CRIADA, ATA_ATUALIZADA
+        barramento = EventBus()
+        eventos_service = SQLiteAtaService(":memory:", barramento)
+        lotes = []
+        barramento.assinar(lotes.append, janela=60)
+        base = eventos_service.listar_todas()[0].to_dict()
+        novas = [dict(base, numero_ata=f"{i:04d}/2030") for i in range(5)]
+        eventos_service.importar_atas(novas)
+        eventos_service.editar_ata("0000/2030", dict(novas[0], objeto="Alterado"))
+        barramento.descarregar()
+        assert len(lotes) == 1 and len(lotes[0]) == 6
+        assert [e.tipo for e in lotes[0]] == [ATA_CRIADA] * 5 + [ATA_ATUALIZADA]
+        versoes = [e.versao for e in lotes[0]]
+        assert versoes == sorted(set(versoes))
+        barramento.close()
+        eventos_service.close()
+        print("✓ Barramento de Eventos OK")
+
+        # Testa serviços compartilhados entre sessões (modo web)
+        import threading
+        from services.shared import obter_servicos
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = os.path.join(diretorio, "web.db")
+            servicos = obter_servicos(banco)
+            assert obter_servicos(banco) is servicos
+            recebidos = {1: [], 2: []}
+            sessao_1 = servicos.conectar_sessao(recebidos[1].extend, janela=0)
+            sessao_2 = servicos.conectar_sessao(recebidos[2].extend, janela=0)
+            base = servicos.ata_service.listar_todas()[0].to_dict()
+            escritas = [
+                threading.Thread(target=servicos.ata_service.criar_ata,
+                                 args=(dict(base, numero_ata=f"{i:04d}/2031"),))
+                for i in range(4)
+            ]
+            for t in escritas:
+                t.start()
+            for t in escritas:
+                t.join()
+            assert len(recebidos[1]) == len(recebidos[2]) == 4
+            servicos.desconectar_sessao(sessao_1)
+            servicos.ata_service.excluir_ata("0000/2031")
+            assert len(recebidos[1]) == 4 and len(recebidos[2]) == 5
+            assert servicos.sessoes_ativas == 1
+            # Todas as conexões ao banco em WAL e esperando locks em vez de falhar
+            outbox = EmailOutbox(banco)
+            conexoes = [servicos.ata_service.conn, servicos.alert_service.conn, outbox.conn,
+                        servicos.scheduler.conn, servicos.scheduler.report_service.conn]
+            for conexao in conexoes:
+                assert conexao.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert conexao.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+            outbox.close()
+            from services.shared import encerrar_servicos
+            encerrar_servicos()
+        print("✓ Serviços Compartilhados OK")
+
+        # Testa pipeline de busca (consulta lenta e obsoleta não sobrescreve a nova)
+        from services.search import ConsultaAtas, PipelineBusca, BuscaCancelada, filtrar_atas
+        atas_busca = ata_service.listar_todas()
+        liberar_lenta, entregues, concluida = threading.Event(), [], threading.Event()
+        def executar_busca(consulta, cancelado):
+            if consulta.texto == "a":
+                liberar_lenta.wait(5)
+            return filtrar_atas(atas_busca, consulta, cancelado)
+        def entregar(geracao, consulta, atas):
+            entregues.append(consulta.texto)
+            concluida.set()
+        pipeline = PipelineBusca(executar_busca, entregar)
+        pipeline.submeter(ConsultaAtas("a"))
+        pipeline.submeter(ConsultaAtas("ab"))
+        pipeline.submeter(ConsultaAtas("abc"))
+        liberar_lenta.set()
+        assert concluida.wait(5)
+        pipeline.close()
+        assert entregues == ["abc"]
+        try:
+            filtrar_atas(atas_busca, ConsultaAtas("x"), lambda: True)
+            assert False, "busca cancelada deveria ser interrompida"
+        except BuscaCancelada:
+            pass
+        print("✓ Pipeline de Busca OK")
+
+        # Testa busca incremental (refinamento sobre o resultado anterior e LRU)
+        from services.search import MotorBusca
+        versao_busca = [0]
+        motor_busca = MotorBusca(ata_service.listar_todas, lambda: versao_busca[0], capacidade=2)
+        sequencia = ["m", "ma", "mat", "ma", "m"]
+        resultados = [motor_busca.buscar(ConsultaAtas(t)) for t in sequencia]
+        for termo, resultado in zip(sequencia, resultados):
+            assert resultado == filtrar_atas(atas_busca, ConsultaAtas(termo))
+        # "m" saiu do LRU (capacidade 2) e volta a percorrer a carteira
+        assert motor_busca.estatisticas == {"cache": 1, "refinamentos": 2, "completas": 2}
+        versao_busca[0] += 1
+        motor_busca.buscar(ConsultaAtas("mat"))
+        assert motor_busca.estatisticas["completas"] == 3
+        print("✓ Busca Incremental OK")
+
+        # Testa máscaras locais do formulário (nenhum evento por tecla, formata ao sair)
+        from forms.ata_form import AtaForm
+        from utils.ui_probe import SondaPagina
+        sonda = SondaPagina()
+        formulario = AtaForm(sonda.page, on_save=lambda d: None, on_cancel=lambda: None)
+        campo = formulario.documento_sei_field
+        assert sonda.digitar(campo, "12345123456202412") == 0
+        custo = sonda.medir("blur", lambda: sonda.disparar(campo, "blur"))
+        assert campo.value == "12345.123456/2024-12"
+        assert custo.atualizacoes_pagina == 0 and custo.controles_diff == 1
+        formulario.numero_ata_field.value = "00012024"
+        formulario.aplicar_mascaras()
+        assert formulario.numero_ata_field.value == "0001/2024"
+        assert formulario.telefones[0][0].value == ""
+        # Fonte Inter: cópia local em assets/fonts quando existe, senão a remota
+        import main_gui
+        app_fonte = main_gui.AtaApp.__new__(main_gui.AtaApp)
+        app_fonte.page = SondaPagina().page
+        app_fonte.setup_page()
+        local = os.path.exists(os.path.join(main_gui.ASSETS_DIR, "fonts", "Inter-Regular.ttf"))
+        assert list(app_fonte.page.fonts.values()) == ["/fonts/Inter-Regular.ttf" if local else main_gui.FONTE_INTER_URL]
+        print("✓ Máscaras no Cliente OK")
+
+        # Testa atualizações com escopo no formulário (lint + controles enviados por interação)
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(
+            "check_page_updates", os.path.join(os.path.dirname(__file__), "scripts", "check_page_updates.py")
+        )
+        check_page_updates = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(check_page_updates)
+        assert check_page_updates.main([]) == 0
+        from ui.main_view import build_grouped_data_tables
+        sonda = SondaPagina()
+        nada = lambda *_: None
+        sonda.page.add(build_grouped_data_tables(ata_service.listar_todas(), nada, nada, nada))
+        formulario = AtaForm(sonda.page, on_save=lambda d: None, on_cancel=lambda: None)
+        interacoes = [
+            sonda.medir("add_item", formulario.add_item),
+            sonda.medir("remove_item", lambda: formulario.remove_item(*formulario.itens[-1][::3])),
+            sonda.medir("add_telefone", formulario.add_telefone),
+            sonda.medir("add_email", formulario.add_email),
+        ]
+        for interacao in interacoes:
+            assert interacao.atualizacoes_pagina == 0, interacao
+            assert interacao.controles_diff <= 40, interacao
+        print("✓ Atualizações com Escopo OK")
+
+        # Testa validação declarativa e verificação de unicidade em background
+        from models.ata import Ata
+        from utils.validation import VerificadorUnicidade, validar_campo
+        assert validar_campo("numero_ata", "0001/2024") is None
+        assert validar_campo("telefones_fornecedor", ["(61) 9999-0000", "123"]).startswith("Telefone 123")
+        invalida = dict(ata_service.listar_todas()[0].to_dict(), documento_sei="x", emails_fornecedor=["y"])
+        try:
+            Ata.from_dict(invalida)
+            assert False, "ata inválida deveria falhar"
+        except ValueError as e:
+            assert "Documento SEI" in str(e)
+        consultas = []
+        verificador = VerificadorUnicidade(
+            lambda n: consultas.append(n) or ata_service.validar_numero_ata_unico(n)
+        )
+        respostas, respondido = [], threading.Event()
+        for parcial in ("0016/202", "0016/2024"):
+            verificador.verificar_async(parcial, lambda n, u: (respostas.append((n, u)), respondido.set()), 0.05)
+        assert respondido.wait(2)
+        assert respostas == [("0016/2024", False)] and consultas == ["0016/2024"]
+        assert verificador.unico("0016/2024") is False and consultas == ["0016/2024"]
+        sonda = SondaPagina()
+        formulario = AtaForm(sonda.page, on_save=lambda d: None, on_cancel=lambda: None, verificador=verificador)
+        formulario.documento_sei_field.value = "123"
+        sonda.disparar(formulario.documento_sei_field, "blur")
+        assert formulario.documento_sei_field.error_text.startswith("Documento SEI")
+        formulario.numero_ata_field.value = "0016/2024"
+        assert "Já existe uma ata com o número 0016/2024" in formulario.validate_form()
+        print("✓ Validação OK")
+
+        # Testa hidratação confiável (sem revalidar) equivalente ao construtor validado
+        from models.ata import Item
+        carregadas = SQLiteAtaService(":memory:").listar_todas()
+        assert [Ata.from_dict(a.to_dict()) for a in carregadas] == carregadas
+        assert [Ata.from_dict(a.to_dict(), validar=False) for a in carregadas] == carregadas
+        confiavel = Ata.from_trusted("x", "y", date.today(), "", [Item.from_trusted("i", 1, 1.0)], "", [], [])
+        assert confiavel.numero_ata == "x" and confiavel.valor_total == 1.0
+        print("✓ Carregamento Confiável OK")
+
+        # Testa os codecs do atas.json: mesmo formato e mesmas atas em todos
+        import json
+        from utils.json_codec import CODECS, obter_codec
+        conteudos = {nome: classe().codificar(carregadas) for nome, classe in CODECS.items()}
+        for nome, conteudo in conteudos.items():
+            assert CODECS[nome]().decodificar(conteudo) == carregadas, nome
+            assert json.loads(conteudo) == json.loads(conteudos["json"]), nome
+        try:
+            obter_codec("inexistente")
+            assert False, "codec inexistente deveria falhar"
+        except ValueError:
+            pass
+        print("✓ Codecs OK")
+
+        # Testa snapshot colunar: agregados das colunas iguais aos das atas hidratadas
+        import mmap
+        from datetime import timedelta
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = os.path.join(diretorio, "atas.db")
+            servico = SQLiteAtaService(banco)
+            servico.criar_ata(dict(servico.listar_todas()[0].to_dict(), numero_ata="0099/2030",
+                                   data_vigencia=(date.today() + timedelta(days=10)).isoformat()))
+            todas = servico.listar_todas()
+            esperado = {"vigente": 0, "a_vencer": 0, "vencida": 0}
+            for ata in todas:
+                esperado[ata.status] += 1
+            assert servico.get_estatisticas() == esperado
+            vencendo = sorted((a for a in todas if 0 <= a.dias_restantes <= 90), key=lambda a: a.dias_restantes)
+            assert servico.get_atas_vencimento_proximo() == vencendo
+            resumo = servico.get_resumo_painel()
+            assert abs(resumo["valor_total"] - sum(a.valor_total for a in todas)) < 1e-6
+            assert resumo["vencendo"] == len(vencendo)
+            snapshot = servico.snapshot()
+            assert [snapshot.ata(snapshot.posicao(a.numero_ata)) for a in todas] == todas
+            # Outro processo abre o mesmo arquivo sem reconstruir; escritas invalidam
+            outro = SQLiteAtaService(banco)
+            assert isinstance(outro.snapshot()._buffer, mmap.mmap)
+            assert outro.snapshot().assinatura == snapshot.assinatura
+            servico.excluir_ata("0099/2030")
+            assert outro.snapshot().posicao("0099/2030") is None
+            # Escritas da própria instância atualizam o snapshot sem reler o banco,
+            # com o mesmo conteúdo da reconstrução completa
+            import itertools
+            from services.snapshot import codificar_snapshot
+            servico.snapshot()
+            base = servico.listar_todas()[0].to_dict()
+            servico.criar_ata(dict(base, numero_ata="0001/2000"))
+            servico.criar_ata(dict(base, numero_ata="9999/2099", objeto="Última ação"))
+            servico.editar_ata("0015/2024", dict(servico.buscar_por_numero("0015/2024").to_dict(), objeto="Editado"))
+            servico.editar_ata("0001/2000", dict(base, numero_ata="0500/2025"))
+            servico.excluir_ata("0014/2024")
+            iterar_em_lotes = servico.iterar_em_lotes
+            servico.iterar_em_lotes = lambda *args: 1 / 0
+            atualizado = bytes(servico.snapshot()._buffer)
+            del servico.iterar_em_lotes
+            assert atualizado == codificar_snapshot(itertools.chain.from_iterable(iterar_em_lotes()),
+                                                    servico.versao_dados)
+            # Escrita de outra conexão no meio: volta à reconstrução completa
+            servico.criar_ata(dict(base, numero_ata="0600/2025"))
+            outro.excluir_ata("0500/2025")
+            servico.criar_ata(dict(base, numero_ata="0700/2025"))
+            assert [a.numero_ata for a in servico.get_atas_vencimento_proximo(100000)] == \
+                [a.numero_ata for a in sorted((a for a in servico.listar_todas() if a.dias_restantes >= 0),
+                                              key=lambda a: a.dias_restantes)]
+            assert servico.snapshot().posicao("0500/2025") is None and servico.snapshot().posicao("0700/2025") is not None
+            todas = servico.listar_todas()
+            outro.close()
+            servico.close()
+            with open(banco + ".snapshot", "r+b") as f:
+                f.truncate(30)
+            reaberto = SQLiteAtaService(banco)
+            assert len(reaberto.snapshot()) == len(todas)
+            reaberto.close()
+        print("✓ Snapshot OK")
+
+        # Testa resumos das listas: itens e contatos só são carregados ao abrir a ata
+        from models.ata import AtaSummary
+        from services.search import ordenar_atas
+        from ui.ata_detail_view import build_ata_detail_view
+        resumos_service = SQLiteAtaService(":memory:")
+        completas = {a.numero_ata: a for a in resumos_service.listar_todas()}
+        carregamentos = []
+        carregar = resumos_service.buscar_por_numero
+        resumos_service.buscar_por_numero = lambda n: carregamentos.append(n) or carregar(n)
+        resumos = resumos_service.listar_resumos()
+        assert all(isinstance(r, AtaSummary) for r in resumos) and len(resumos) == len(completas)
+        for resumo in resumos:
+            ata = completas[resumo.numero_ata]
+            assert (resumo.status, resumo.objeto, resumo.fornecedor) == (ata.status, ata.objeto, ata.fornecedor)
+            assert abs(resumo.valor_total - ata.valor_total) < 1e-6
+        sonda = SondaPagina()
+        sonda.page.add(build_grouped_data_tables(ordenar_atas(resumos, "valor_maior"), nada, nada, nada))
+        assert carregamentos == []
+        resumo = resumos[0]
+        sonda.page.add(build_ata_detail_view(resumo, on_back=nada, on_edit=nada))
+        AtaForm(sonda.page, on_save=lambda d: None, on_cancel=lambda: None, ata=resumo)
+        assert carregamentos == [resumo.numero_ata]
+        assert resumo.to_dict() == completas[resumo.numero_ata].to_dict()
+        print("✓ Resumos OK")
+
+        # Testa a suíte de benchmarks em escala mínima e a detecção de regressões
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+        import bench_suite
+        from utils.dados_sinteticos import gerar_atas
+        assert gerar_atas(50, semente=7) == gerar_atas(50, semente=7)
+        assert all(Ata.from_dict(dados) for dados in gerar_atas(200))
+        resultados = bench_suite.executar([100], repeticoes=1, saida=io.StringIO())
+        assert set(resultados) == set(bench_suite.CASOS)
+        assert all("100" in por_tamanho for por_tamanho in resultados.values())
+        assert bench_suite.comparar(resultados, resultados, 1.25) == []
+        base = {"sqlite.crud": {"100": {"min": 0.001}}}
+        assert bench_suite.comparar({"sqlite.crud": {"100": {"min": 0.5}}}, base, 1.25)
+        print("✓ Suíte de Benchmarks OK")
+
+        # Testa o gerador configurável, a importação em lote do JSON e o teste de carga
+        import bench_sessions
+        from collections import Counter
+        from utils.dados_sinteticos import Distribuicao, iterar_atas, popular
+        for invalida in ({"itens": (5, 2)}, {"itens": (0, 3)}, {"emails": (1, 9)}, {"fornecedores": 0}):
+            try:
+                Distribuicao(**invalida)
+                assert False, f"Distribuição aceita: {invalida}"
+            except ValueError:
+                pass
+        referencia = date(2026, 1, 1)
+        concentrada = Distribuicao(itens=(2, 3), fornecedores=50, concentracao=1.5, vigencia_dias=(0, 30))
+        atas_geradas = list(iterar_atas(500, 5, referencia, concentrada))
+        assert atas_geradas == gerar_atas(500, 5, referencia, concentrada) != gerar_atas(500, 6, referencia, concentrada)
+        assert all(2 <= len(a["itens"]) <= 3 for a in atas_geradas)
+        assert all(0 <= (date.fromisoformat(a["data_vigencia"]) - referencia).days <= 30 for a in atas_geradas)
+        por_fornecedor = Counter(a["fornecedor"] for a in atas_geradas).most_common()
+        assert por_fornecedor[0][1] > 10 * por_fornecedor[-1][1]
+        assert popular(SQLiteAtaService(":memory:"), 300)["importadas"] == 300
+        with tempfile.TemporaryDirectory() as diretorio, contextlib.redirect_stdout(io.StringIO()):
+            json_service = AtaService(os.path.join(diretorio, "atas.json"), dados_exemplo=False)
+            assert json_service.atas == []
+            assert popular(json_service, 40)["importadas"] == 40
+            repetida = popular(json_service, 40, substituir=False)
+            assert (repetida["importadas"], repetida["ignoradas"]) == (0, 40)
+            assert popular(json_service, 40, semente=1)["substituidas"] == 40
+            assert json_service.importar_atas([{"numero_ata": "1/2024"}])["erros"]
+            assert len(AtaService(json_service.data_file).atas) == 40
+            # generate grava só a carteira gerada, sem semear o destino nem o banco do --db
+            gerado_db, gerado_json = os.path.join(diretorio, "g.db"), os.path.join(diretorio, "g.json")
+            assert cli_main(["--db", gerado_db, "generate", "25"]) == 0
+            gerado_service = SQLiteAtaService(gerado_db)
+            assert len(gerado_service.listar_resumos()) == 25
+            gerado_service.close()
+            os.remove(gerado_db)
+            assert cli_main(["--db", gerado_db, "generate", "25", "--json", gerado_json]) == 0
+            assert len(AtaService(gerado_json).atas) == 25 and not os.path.exists(gerado_db)
+
+            banco = os.path.join(diretorio, "carga.db")
+            carga_service = SQLiteAtaService(banco, dados_exemplo=False)
+            popular(carga_service, 200)
+            antes = len(carga_service.listar_resumos())
+            carga_service.close()
+            medicoes = bench_sessions.executar_processo(banco, 0, 2, 0.5, 0.01, 0.2, 0)
+            resumo_carga = bench_sessions.resumir([medicoes, medicoes], 0.5)
+            assert resumo_carga["operacoes"]["buscar"]["execucoes"] >= 4
+            assert "agendador.alertas_do_dia" in resumo_carga["operacoes"]
+            # As atas criadas pelas sessões são removidas ao final
+            carga_service = SQLiteAtaService(banco)
+            assert len(carga_service.listar_resumos()) == antes
+            carga_service.close()
+        print("✓ Gerador e Carga OK")
+
+        # Testa a instrumentação: desligada não registra; ligada mede serviços, erros e exporta
+        from utils.metrics import METRICAS, Metricas
+        from ui.main_view import build_desempenho_panel
+        desligadas = Metricas()
+        with desligadas.cronometrar("bloco") as medicao:
+            medicao.linhas = 3
+        assert desligadas.instrumentado("f")(lambda: 7)() == 7 and desligadas.resumo() == {}
+        metricas = Metricas("1")
+        falha = metricas.instrumentado("falha")(lambda: 1 / 0)
+        try:
+            falha()
+            assert False, "Erro engolido pela instrumentação"
+        except ZeroDivisionError:
+            pass
+        with metricas.cronometrar("bloco") as medicao:
+            medicao.linhas = 3
+        resumo_metricas = metricas.resumo()
+        assert resumo_metricas["falha"]["erros"] == 1 and resumo_metricas["bloco"]["linhas"] == 3
+        texto_prometheus = metricas.prometheus()
+        assert 'ata_regis_duracao_segundos_bucket{operacao="bloco",le="+Inf"} 1' in texto_prometheus
+        assert 'ata_regis_erros_total{operacao="falha"} 1' in texto_prometheus
+        METRICAS.ativo = True
+        try:
+            instrumentado_service = SQLiteAtaService(":memory:")
+            total_resumos = len(instrumentado_service.listar_resumos())
+            instrumentado_service.get_resumo_painel()
+            try:
+                instrumentado_service.criar_ata(instrumentado_service.listar_todas()[0].to_dict())
+            except ValueError:
+                pass
+            instrumentado_service.close()
+            with contextlib.redirect_stdout(io.StringIO()):
+                AlertService(EmailService(), ":memory:").verificar_alertas_automaticos([])
+                # Tarefas do agendador engolem a exceção, mas a medição conta o erro
+                agendador = TaskScheduler(SQLiteAtaService(":memory:"), AlertService(EmailService(), ":memory:"))
+                agendador.alert_service.verificar_alertas_do_dia = lambda *args: 1 / 0
+                agendador._executar_verificacao_diaria()
+                assert agendador.gerar_relatorio_manual("invalido") is False
+            resumo_metricas = METRICAS.resumo()
+            assert resumo_metricas["agendador.verificacao_diaria"]["erros"] == 1
+            assert resumo_metricas["agendador.relatorio_manual"]["erros"] == 1
+            assert resumo_metricas["sqlite.listar_resumos"]["linhas"] == total_resumos
+            assert resumo_metricas["sqlite.criar_ata"]["erros"] == 1
+            assert "sqlite.snapshot.reconstruir" in resumo_metricas and "alertas.verificar_atas" in resumo_metricas
+            with tempfile.TemporaryDirectory() as diretorio:
+                for nome in ("metricas.json", "metricas.prom"):
+                    METRICAS.exportar(os.path.join(diretorio, nome))
+                assert sorted(os.listdir(diretorio)) == ["metricas.json", "metricas.prom"]
+                assert os.stat(os.path.join(diretorio, "metricas.prom")).st_mode & 0o044 == 0o044
+                with open(os.path.join(diretorio, "metricas.json"), encoding="utf-8") as f:
+                    assert "sqlite.listar_resumos" in json.load(f)["operacoes"]
+                with open(os.path.join(diretorio, "metricas.prom"), encoding="utf-8") as f:
+                    assert "# TYPE ata_regis_duracao_segundos histogram" in f.read()
+            sonda = SondaPagina()
+            sonda.page.add(build_desempenho_panel(resumo_metricas, True, nada))
+            sonda.page.add(build_desempenho_panel({}, False))
+        finally:
+            METRICAS.ativo = False
+            METRICAS.limpar()
+        print("✓ Métricas OK")
+
         print("\n✅ Todos os testes de funcionalidade passaram!")
         return True
         